@@ -3,37 +3,513 @@ Tamil Story Generator - Backend API
 """
 
 import os
-from flask import Flask, request, jsonify, send_from_directory
+import hmac
+import time
+from typing import Dict, List, NamedTuple, Optional
+from flask import Flask, g, request, jsonify, send_from_directory, stream_with_context
 from flask_cors import CORS
-import urllib.request
-import urllib.parse
-import json
 
-from story_generator import TamilStoryGenerator
+from story_generator import TamilStoryGenerator, find_template_key, story_segment_groups, template_variant
+from translator import (
+    TranslationResult, get_provider_chain, get_translation_cache, get_translation_client, translate_groups,
+    translate_jobs, translate_many
+)
+from artifact_store import ArtifactStore
+from response_cache import (
+    RESPONSE_MAX_AGE, ResponseCache, page_request_key, story_request_key, translation_request_key
+)
+from story_registry import RegisteredStory, StoryRegistry, story_content_id
+from single_flight import SingleFlight
+from metrics import (
+    CONTENT_TYPE as METRICS_CONTENT_TYPE, finish_request, registry as metrics_registry, request_duration, span,
+    start_request
+)
+from profiler import ProfilerBusy, install_signal_handler, stack_profiler
+from warmup import Warmup, popular_requests
+
+BATCH_MAX_STORIES = int(os.environ.get('BATCH_MAX_STORIES', '100'))
+ADMIN_TOKEN = os.environ.get('ADMIN_TOKEN', '')  # empty disables the admin endpoints
 
 app = Flask(__name__)
 CORS(app)
 
-story_generator = TamilStoryGenerator()
-print("✅ Tamil Story Generator initialized")
+_story_generator: Optional[TamilStoryGenerator] = None
+
+artifact_store = ArtifactStore()
+response_cache = ResponseCache()
+story_registry = StoryRegistry()
+single_flight = SingleFlight()
+warmup = Warmup()
+
+
+def cache_lookups():
+    translation = get_translation_cache().stats()
+    responses = response_cache.stats()
+    return {
+        ('translation', 'memory_hit'): translation['memory_hits'],
+        ('translation', 'snapshot_hit'): translation['snapshot_hits'],
+        ('translation', 'disk_hit'): translation['disk_hits'],
+        ('translation', 'miss'): translation['misses'],
+        ('response', 'hit'): responses['hits'],
+        ('response', 'miss'): responses['misses'],
+        ('response', 'not_modified'): responses['not_modified'],
+        ('artifact', 'hit'): artifact_store.hits,
+        ('artifact', 'miss'): artifact_store.misses,
+    }
+
+
+def cache_hit_ratios():
+    ratios = {}
+    for (cache, result), count in cache_lookups().items():
+        hits, total = ratios.get((cache,), (0, 0))
+        ratios[(cache,)] = (hits + (count if result != 'miss' else 0), total + count)
+    return {cache: round(hits / total, 4) if total else 0.0 for cache, (hits, total) in ratios.items()}
+
+
+metrics_registry.counter_callback(
+    'story_cache_lookups_total', 'Lookups in the translation, response and artifact caches', ('cache', 'result'),
+    cache_lookups)
+metrics_registry.gauge('story_cache_hit_ratio', 'Share of cache lookups answered since start', ('cache',),
+                       cache_hit_ratios)
+metrics_registry.counter_callback(
+    'story_single_flight_requests_total', 'Story renders led, or joined while identical ones were in flight',
+    ('role',), lambda: {(role,): single_flight.stats()[stat]
+                        for role, stat in (('leader', 'leaders'), ('coalesced', 'coalesced'),
+                                           ('process_wait', 'process_waits'))})
+metrics_registry.gauge('story_single_flight_in_flight', 'Story renders in flight in this worker', (),
+                       lambda: {(): single_flight.stats()['in_flight']})
+metrics_registry.gauge('story_translation_breaker_open', '1 while the translation circuit breaker is open', (),
+                       lambda: {(): int(get_translation_client().stats()['breaker_state'] == 'open')})
+
+
+@app.before_request
+def start_timing():
+    g.request_started = time.perf_counter()
+    g.timing_token = start_request()
+
+
+@app.after_request
+def finish_timing(response):
+    """Record the request duration and, for sampled requests, add a Server-Timing header.
+
+    A streamed body is produced after this runs, so its duration is recorded
+    when the response is closed, and its Server-Timing header (sent before
+    the body) reports the time to the first byte as "headers".
+    """
+    token = g.pop('timing_token', None)
+    if token is None:
+        return response
+    timing = finish_request(token)
+    started = g.request_started
+    labels = (request.endpoint or 'unmatched', str(response.status_code))
+    if response.is_streamed:
+        response.call_on_close(lambda: request_duration.observe(time.perf_counter() - started, *labels))
+    else:
+        request_duration.observe(time.perf_counter() - started, *labels)
+    if timing is not None:
+        response.headers['Server-Timing'] = timing.header('headers' if response.is_streamed else 'total')
+    return response
+
+
+@app.teardown_request
+def end_profiled_request(exc):
+    # Runs after a streamed body has been sent, so streams stay tagged while they render
+    stack_profiler.end_request()
+
+
+def prebuilt_translations(groups, language, template_key, age_group):
+    """Per-group results from the artifact store, or None unless it covers every segment"""
+    prebuilt = artifact_store.lookup(template_key, template_variant(age_group), language)
+    if prebuilt is None or not all(segment in prebuilt for group in groups for segment in group):
+        return None
+    return [TranslationResult([prebuilt[segment] for segment in group], True) for group in groups]
+
+
+def page_dict(page, texts):
+    title, content = texts
+    return {
+        'page_number': page.page_number,
+        'title': title,
+        'content': content,
+        'characters': page.characters,
+        'location': page.location,
+        'action': page.action
+    }
+
+
+def pending_page_dict(page):
+    """Placeholder for a page that is translated on request via /api/stories/<id>/pages/<n>"""
+    return {
+        'page_number': page.page_number,
+        'title': None,
+        'content': None,
+        'characters': page.characters,
+        'location': page.location,
+        'action': page.action,
+        'pending': True
+    }
+
+
+def story_pages(story_data, results):
+    """Page dicts for the translated page results, placeholders for the rest"""
+    return [
+        page_dict(page, results[i].texts) if i < len(results) else pending_page_dict(page)
+        for i, page in enumerate(story_data.pages)
+    ]
+
+
+def eager_groups(story_data, language, eager_pages):
+    """Segment groups to translate up front: the header and the first eager_pages pages"""
+    groups = story_segment_groups(story_data)
+    if eager_pages is None or language == 'en':
+        return groups
+    return groups[:1 + eager_pages]
+
+
+def story_dict_from(story_data, story_id, language, header, pages):
+    """API story payload from the translated header (title, moral, facts) and page dicts"""
+    title, moral, *facts = header
+    return {
+        'story_id': story_id,
+        'title': title,
+        'keywords': story_data.keywords,
+        'pages': pages,
+        'moral': moral,
+        'age_group': story_data.age_group,
+        'festival_connection': story_data.festival_connection,
+        'region': story_data.region,
+        'era': story_data.era,
+        'story_type': story_data.story_type,
+        'historical_context': story_data.historical_context,
+        'cultural_elements': story_data.cultural_elements,
+        'educational_facts': facts if story_data.educational_facts else story_data.educational_facts,
+        'total_pages': story_data.total_pages,
+        'language': language
+    }
+
+
+def translate_story(story_data, language, template_key=None, groups=None):
+    """Per-group translations of a story (or of the given groups), translated in one fan-out.
+
+    Template stories are served from the pre-translated artifact store when
+    it has them.
+    """
+    groups = story_segment_groups(story_data) if groups is None else groups
+    with span('translate'):
+        results = prebuilt_translations(groups, language, template_key, story_data.age_group)
+        if results is None:
+            result = translate_many([segment for group in groups for segment in group], language)
+            translated = iter(result.texts)
+            results = [TranslationResult([next(translated) for _ in group], result.complete) for group in groups]
+    return results
+
+
+def build_story_dict(story_data, language, template_key=None, eager_pages=None):
+    """Assemble the API story payload and register the story for later language switches.
+
+    With eager_pages set, only that many pages are translated and the rest
+    are placeholders. Returns the story dict and whether every translated
+    segment was actually translated.
+    """
+    story_id = story_registry.register(story_data, template_key)
+    results = translate_story(story_data, language, template_key, eager_groups(story_data, language, eager_pages))
+    pages = story_pages(story_data, results[1:])
+    story_dict = story_dict_from(story_data, story_id, language, results[0].texts, pages)
+    return story_dict, all(result.complete for result in results)
+
+
+def story_translation_dict(story_data, story_id, language, results):
+    """Only the translated text fields of a story; untranslated pages are left out"""
+    title, moral, *facts = results[0].texts
+    return {
+        'story_id': story_id,
+        'language': language,
+        'title': title,
+        'moral': moral,
+        'educational_facts': facts,
+        'pages': [
+            {'page_number': page.page_number, 'title': result.texts[0], 'content': result.texts[1]}
+            for page, result in zip(story_data.pages, results[1:])
+        ],
+        'complete': all(result.complete for result in results)
+    }
+
+
+def get_story_generator() -> TamilStoryGenerator:
+    """The story generator, built on first use so importing the app (health checks, tools) stays cheap"""
+    global _story_generator
+    if _story_generator is None:
+        _story_generator = TamilStoryGenerator()
+        print("✅ Tamil Story Generator initialized")
+    return _story_generator
+
+
+def generate_story_data(keywords, age_group):
+    with span('generate'):
+        return get_story_generator().generate_tamil_story(keywords, age_group)
 
 
-def translate_text(text, target_lang):
-    """Translate text using Google Translate (free)"""
-    if target_lang == 'en' or not text:
-        return text
+def render_story(cache_key, keywords, age_group, language, eager_pages=None):
+    """Generate, translate and serialize a story -> (story dict, body, complete); caches complete bodies"""
+    story_data = generate_story_data(keywords, age_group)
+    template_key = find_template_key(keywords[0]) if keywords else None
+    story_dict, complete = build_story_dict(story_data, language, template_key, eager_pages)
+    body = encode_story_response(story_dict)
+    
+    # Partially translated stories are served once but never cached
+    if complete:
+        response_cache.put(cache_key, body)
+    return story_dict, body, complete
+
+
+def recover_story(story_id):
+    """Regenerate a story this worker doesn't hold from the keywords the client sent"""
+    args = story_request_args()
+    keywords = [k.strip() for k in args['keywords'] if k.strip()]
+    if not keywords:
+        return None
+    story_data = generate_story_data(keywords, args['age_group'])
+    if story_content_id(story_data) != story_id:
+        return None
+    template_key = find_template_key(keywords[0])
+    story_registry.register(story_data, template_key)
+    return RegisteredStory(story_data, template_key)
+
+
+def stream_story_events(story_data, language, template_key, cache_key, eager_pages=None):
+    """Story metadata, then each page as soon as its translation is ready, then a done marker.
+
+    A story that streamed fully translated is stored in the response cache
+    for the regular endpoint.
+    """
+    story_id = story_registry.register(story_data, template_key)
+    groups = eager_groups(story_data, language, eager_pages)
+    results = prebuilt_translations(groups, language, template_key, story_data.age_group)
+    results = iter(results) if results is not None else translate_groups(groups, language)
+
+    header = next(results)
+    pages = []
+    story_dict = story_dict_from(story_data, story_id, language, header.texts, pages)
+    yield {'type': 'meta', 'story': {k: v for k, v in story_dict.items() if k != 'pages'}}
+
+    complete = header.complete
+    for page, result in zip(story_data.pages, results):
+        pages.append(page_dict(page, result.texts))
+        complete = complete and result.complete
+        yield {'type': 'page', 'page': pages[-1]}
+    for page in story_data.pages[len(pages):]:
+        pages.append(pending_page_dict(page))
+        yield {'type': 'page', 'page': pages[-1]}
+
+    if complete:
+        response_cache.put(cache_key, encode_story_response(story_dict))
+    yield {'type': 'done', 'complete': complete}
+
+
+def cached_story_events(body):
+    """Replay a cached story response as stream events"""
+    story = app.json.loads(body)['story']
+    yield {'type': 'meta', 'story': {k: v for k, v in story.items() if k != 'pages'}}
+    for page in story['pages']:
+        yield {'type': 'page', 'page': page}
+    yield {'type': 'done', 'complete': True}
+
+
+class BatchStory(NamedTuple):
+    cache_key: str
+    story: object
+    story_id: str
+    language: str
+    groups: List[List[str]]
+
+
+def finish_batch_story(item, results):
+    """Story dict for a translated batch item, cached when fully translated"""
+    pages = story_pages(item.story, results[1:])
+    story_dict = story_dict_from(item.story, item.story_id, item.language, results[0].texts, pages)
+    if all(result.complete for result in results):
+        response_cache.put(item.cache_key, encode_story_response(story_dict))
+    return story_dict
+
+
+def batch_story_events(specs):
+    """Events for a batch of story specs, each story sent as soon as it is ready.
+
+    Identical specs are generated once and answered for every index that
+    asked for them. Stories in the same language are translated together.
+    """
+    indices: Dict[str, List[int]] = {}
+    story_requests: Dict[str, StoryRequest] = {}
+    errors = 0
+    for index, spec in enumerate(specs):
+        try:
+            story_request = parse_story_spec(spec)
+            cache_key = story_request_key(*story_request)
+        except Exception as e:
+            errors += 1
+            yield {'type': 'error', 'index': index, 'error': str(e)}
+            continue
+        indices.setdefault(cache_key, []).append(index)
+        story_requests[cache_key] = story_request
+
+    pending: List[BatchStory] = []
+    for cache_key, (keywords, age_group, language, eager_pages) in story_requests.items():
+        try:
+            body = response_cache.get(cache_key)
+            if body is not None:
+                story_dict = app.json.loads(body)['story']
+            else:
+                story_data = generate_story_data(keywords, age_group)
+                template_key = find_template_key(keywords[0]) if keywords else None
+                story_id = story_registry.register(story_data, template_key)
+                item = BatchStory(cache_key, story_data, story_id, language,
+                                  eager_groups(story_data, language, eager_pages))
+                results = prebuilt_translations(item.groups, language, template_key, age_group)
+                if results is None:
+                    pending.append(item)
+                    continue
+                story_dict = finish_batch_story(item, results)
+        except Exception as e:
+            print(f"❌ Batch item error: {e}")
+            errors += len(indices[cache_key])
+            for index in indices[cache_key]:
+                yield {'type': 'error', 'index': index, 'error': str(e)}
+            continue
+        for index in indices[cache_key]:
+            yield {'type': 'story', 'index': index, 'story': story_dict}
+
+    jobs = [([segment for group in item.groups for segment in group], item.language) for item in pending]
+    unfinished = dict(enumerate(pending))
     try:
-        base_url = "https://translate.googleapis.com/translate_a/single"
-        params = {'client': 'gtx', 'sl': 'en', 'tl': target_lang, 'dt': 't', 'q': text}
-        url = base_url + '?' + urllib.parse.urlencode(params)
-        req = urllib.request.Request(url, headers={'User-Agent': 'Mozilla/5.0'})
-        response = urllib.request.urlopen(req, timeout=10)
-        result = json.loads(response.read().decode('utf-8'))
-        translated = ''.join([s[0] for s in result[0] if s[0]])
-        return translated if translated else text
+        for job, result in translate_jobs(jobs):
+            item = unfinished.pop(job)
+            try:
+                translated = iter(result.texts)
+                results = [TranslationResult([next(translated) for _ in group], result.complete)
+                           for group in item.groups]
+                story_dict = finish_batch_story(item, results)
+            except Exception as e:
+                print(f"❌ Batch item error: {e}")
+                errors += len(indices[item.cache_key])
+                for index in indices[item.cache_key]:
+                    yield {'type': 'error', 'index': index, 'error': str(e)}
+                continue
+            for index in indices[item.cache_key]:
+                yield {'type': 'story', 'index': index, 'story': story_dict}
     except Exception as e:
-        print(f"Translation error: {e}")
-        return text
+        # Translation itself failed: every story still waiting on it gets its own error
+        print(f"❌ Batch translation error: {e}")
+        for item in unfinished.values():
+            errors += len(indices[item.cache_key])
+            for index in indices[item.cache_key]:
+                yield {'type': 'error', 'index': index, 'error': str(e)}
+
+    yield {'type': 'done', 'stories': len(specs), 'unique': len(story_requests), 'errors': errors}
+
+
+def render_once(cache_key, render):
+    """Run render() -> (body, complete) once for every concurrent request with this key.
+
+    Identical in-flight requests wait for the leader instead of each
+    translating; one arriving just after it finished finds the cached body.
+    """
+    def lead():
+        body = response_cache.get(cache_key)
+        return (body, True) if body is not None else render()
+    return single_flight.do(cache_key, lead)[0]
+
+
+def encode_json(data):
+    """Serialize a response body exactly as jsonify would"""
+    with span('serialize'):
+        return (app.json.dumps(data) + '\n').encode('utf-8')
+
+
+def encode_story_response(story_dict):
+    return encode_json({'success': True, 'story': story_dict})
+
+
+def story_response(body, etag=None, status=200):
+    """Wrap serialized story bytes; cacheable responses carry a strong ETag"""
+    response = app.response_class(body, status=status, mimetype=app.json.mimetype)
+    if etag:
+        response.set_etag(etag)
+        response.headers['Cache-Control'] = f'public, max-age={RESPONSE_MAX_AGE}'
+    else:
+        response.headers['Cache-Control'] = 'no-store'
+    return response
+
+
+def ndjson_response(events):
+    """Stream events as newline-delimited JSON, ending with an error event if one is raised"""
+    def generate():
+        try:
+            for event in events:
+                yield app.json.dumps(event) + '\n'
+        except Exception as e:
+            print(f"❌ Stream error: {e}")
+            yield app.json.dumps({'type': 'error', 'error': str(e)}) + '\n'
+    
+    response = app.response_class(stream_with_context(generate()), mimetype='application/x-ndjson')
+    response.headers['Cache-Control'] = 'no-store'
+    response.headers['X-Accel-Buffering'] = 'no'  # let proxies pass each event through immediately
+    return response
+
+
+def story_request_args():
+    """Read a GET story request (?keywords=a,b&age_group=kids&language=ta&eager_pages=2)"""
+    keywords = []
+    for value in request.args.getlist('keywords'):
+        keywords.extend(value.split(','))
+    return {
+        'keywords': keywords,
+        'age_group': request.args.get('age_group', 'all'),
+        'language': request.args.get('language', 'en'),
+        'eager_pages': request.args.get('eager_pages')
+    }
+
+
+def parse_eager_pages(value):
+    """Number of pages to translate up front; None means all of them"""
+    if value is None or value == '':
+        return None
+    try:
+        eager_pages = int(value)
+    except (TypeError, ValueError):
+        raise ValueError('eager_pages must be a whole number')
+    if eager_pages < 0:
+        raise ValueError('eager_pages must be a whole number')
+    return eager_pages
+
+
+class StoryRequest(NamedTuple):
+    keywords: List[str]
+    age_group: str
+    language: str
+    eager_pages: Optional[int]
+
+
+def read_story_request():
+    """The StoryRequest of a GET or POST story request; ValueError if unusable"""
+    return parse_story_spec(story_request_args() if request.method == 'GET' else request.get_json())
+
+
+def parse_story_spec(data):
+    """StoryRequest from a request body or batch entry; ValueError if unusable"""
+    if not data:
+        raise ValueError('No data provided')
+    if not isinstance(data, dict):
+        raise ValueError('Story request must be a JSON object')
+    keywords = data.get('keywords', [])
+    if not keywords:
+        raise ValueError('No keywords provided')
+    if not isinstance(keywords, list) or not all(isinstance(k, str) for k in keywords):
+        raise ValueError('keywords must be a list of strings')
+    age_group, language = data.get('age_group', 'all'), data.get('language', 'en')
+    if not isinstance(age_group, str) or not isinstance(language, str):
+        raise ValueError('age_group and language must be strings')
+    keywords = [k.strip() for k in keywords if k.strip()]
+    return StoryRequest(keywords, age_group, language, parse_eager_pages(data.get('eager_pages')))
 
 
 @app.route('/')
@@ -48,70 +524,180 @@ def serve_static(filename):
     return send_from_directory(frontend_path, filename)
 
 
-@app.route('/api/generate-story', methods=['POST'])
+@app.route('/api/generate-story', methods=['GET', 'POST'])
 def generate_story():
     """Generate Tamil story"""
     try:
-        data = request.get_json()
-        if not data:
-            return jsonify({'success': False, 'error': 'No data provided'}), 400
+        try:
+            with span('parse'):
+                keywords, age_group, language, eager_pages = read_story_request()
+        except ValueError as e:
+            return jsonify({'success': False, 'error': str(e)}), 400
+        stack_profiler.tag_request(keywords)
+        
+        cache_key = story_request_key(keywords, age_group, language, eager_pages)
+        etag = response_cache.etag(cache_key)
+        if request.if_none_match.contains(etag):
+            response_cache.record_not_modified()
+            return story_response(b'', etag, status=304)
+        
+        def render():
+            print(f"🎯 Generating: {keywords}, {age_group}, lang={language}")
+            story_dict, body, complete = render_story(cache_key, keywords, age_group, language, eager_pages)
+            print(f"✅ Generated: {story_dict['title']} with {len(story_dict['pages'])} pages")
+            return body, complete
+        
+        body = response_cache.get(cache_key)
+        if body is None:
+            body, complete = render_once(cache_key, render)
+            if not complete:
+                etag = None
+        
+        return story_response(body, etag)
+        
+    except Exception as e:
+        print(f"❌ Error: {e}")
+        import traceback
+        traceback.print_exc()
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
+@app.route('/api/generate-story/stream', methods=['GET', 'POST'])
+def generate_story_stream():
+    """Generate a story and stream it as newline-delimited JSON events"""
+    try:
+        try:
+            with span('parse'):
+                keywords, age_group, language, eager_pages = read_story_request()
+        except ValueError as e:
+            return jsonify({'success': False, 'error': str(e)}), 400
+        stack_profiler.tag_request(keywords)
+        
+        cache_key = story_request_key(keywords, age_group, language, eager_pages)
+        body = response_cache.get(cache_key)
+        if body is not None:
+            events = cached_story_events(body)
+        else:
+            print(f"🎯 Streaming: {keywords}, {age_group}, lang={language}")
+            story_data = generate_story_data(keywords, age_group)
+            template_key = find_template_key(keywords[0]) if keywords else None
+            events = stream_story_events(story_data, language, template_key, cache_key, eager_pages)
         
-        keywords = data.get('keywords', [])
-        age_group = data.get('age_group', 'all')
-        language = data.get('language', 'en')
+        return ndjson_response(events)
         
-        if not keywords:
-            return jsonify({'success': False, 'error': 'No keywords provided'}), 400
+    except Exception as e:
+        print(f"❌ Error: {e}")
+        import traceback
+        traceback.print_exc()
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
+@app.route('/api/generate-stories', methods=['POST'])
+def generate_stories():
+    """Generate many stories in one request, streamed back as NDJSON.
+
+    Body: {"stories": [{"keywords": [...], "age_group": "kids", "language": "ta"}, ...]}
+    Each line answers one spec by its index, with a story or an error, in
+    the order the stories complete; a final done line closes the batch.
+    """
+    try:
+        data = request.get_json()
+        specs = data.get('stories') if isinstance(data, dict) else None
+        if not isinstance(specs, list) or not specs:
+            return jsonify({'success': False, 'error': 'No stories provided'}), 400
+        if len(specs) > BATCH_MAX_STORIES:
+            return jsonify({'success': False, 'error': f'At most {BATCH_MAX_STORIES} stories per batch'}), 400
         
-        keywords = [k.strip() for k in keywords if k.strip()]
+        print(f"🎯 Generating batch of {len(specs)} stories")
+        return ndjson_response(batch_story_events(specs))
+        
+    except Exception as e:
+        print(f"❌ Error: {e}")
+        import traceback
+        traceback.print_exc()
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
+@app.route('/api/stories/<story_id>/translation', methods=['GET'])
+def translate_story_text(story_id):
+    """Translated text of a generated story (?lang=ta), for switching language in place.
+
+    Pass the story's keywords and age_group too, so a worker that no longer
+    holds the story can regenerate it, and eager_pages to translate only the
+    first pages.
+    """
+    try:
+        language = request.args.get('lang', 'en')
+        try:
+            eager_pages = parse_eager_pages(request.args.get('eager_pages'))
+        except ValueError as e:
+            return jsonify({'success': False, 'error': str(e)}), 400
+        cache_key = translation_request_key(story_id, language, eager_pages)
+        etag = response_cache.etag(cache_key)
+        if request.if_none_match.contains(etag):
+            response_cache.record_not_modified()
+            return story_response(b'', etag, status=304)
         
-        print(f"🎯 Generating: {keywords}, {age_group}, lang={language}")
+        body = response_cache.get(cache_key)
+        if body is None:
+            entry = story_registry.get(story_id) or recover_story(story_id)
+            if entry is None:
+                return jsonify({'success': False, 'error': 'Unknown story_id, generate the story again'}), 404
+            
+            def render():
+                groups = eager_groups(entry.story, language, eager_pages)
+                results = translate_story(entry.story, language, entry.template_key, groups)
+                translation = story_translation_dict(entry.story, story_id, language, results)
+                body = encode_json({'success': True, 'translation': translation})
+                if translation['complete']:
+                    response_cache.put(cache_key, body)
+                return body, translation['complete']
+            
+            body, complete = render_once(cache_key, render)
+            if not complete:
+                etag = None
         
-        story_data = story_generator.generate_tamil_story(keywords, age_group)
+        return story_response(body, etag)
         
-        # Translate if not English
-        title = translate_text(story_data.title, language) if language != 'en' else story_data.title
-        moral = translate_text(story_data.moral, language) if language != 'en' else story_data.moral
+    except Exception as e:
+        print(f"❌ Error: {e}")
+        import traceback
+        traceback.print_exc()
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
+@app.route('/api/stories/<story_id>/pages/<int:page_number>', methods=['GET'])
+def story_page(story_id, page_number):
+    """One page of a generated story, translated on demand (?lang=ta)"""
+    try:
+        language = request.args.get('lang', 'en')
+        cache_key = page_request_key(story_id, page_number, language)
+        etag = response_cache.etag(cache_key)
+        if request.if_none_match.contains(etag):
+            response_cache.record_not_modified()
+            return story_response(b'', etag, status=304)
         
-        # Build pages
-        pages = []
-        for p in story_data.pages:
-            page_title = translate_text(p.title, language) if language != 'en' else p.title
-            page_content = translate_text(p.content, language) if language != 'en' else p.content
+        body = response_cache.get(cache_key)
+        if body is None:
+            entry = story_registry.get(story_id) or recover_story(story_id)
+            if entry is None:
+                return jsonify({'success': False, 'error': 'Unknown story_id, generate the story again'}), 404
+            if not 1 <= page_number <= len(entry.story.pages):
+                return jsonify({'success': False, 'error': f'No page {page_number}'}), 404
+            
+            def render():
+                page = entry.story.pages[page_number - 1]
+                result, = translate_story(entry.story, language, entry.template_key, [[page.title, page.content]])
+                body = encode_json({'success': True, 'language': language, 'page': page_dict(page, result.texts)})
+                if result.complete:
+                    response_cache.put(cache_key, body)
+                return body, result.complete
             
-            pages.append({
-                'page_number': p.page_number,
-                'title': page_title,
-                'content': page_content,
-                'characters': p.characters,
-                'location': p.location,
-                'action': p.action
-            })
-        
-        # Translate educational facts
-        edu_facts = story_data.educational_facts
-        if language != 'en' and edu_facts:
-            edu_facts = [translate_text(f, language) for f in edu_facts]
-        
-        story_dict = {
-            'title': title,
-            'keywords': story_data.keywords,
-            'pages': pages,
-            'moral': moral,
-            'age_group': story_data.age_group,
-            'festival_connection': story_data.festival_connection,
-            'region': story_data.region,
-            'era': story_data.era,
-            'story_type': story_data.story_type,
-            'historical_context': story_data.historical_context,
-            'cultural_elements': story_data.cultural_elements,
-            'educational_facts': edu_facts,
-            'total_pages': story_data.total_pages,
-            'language': language
-        }
-        
-        print(f"✅ Generated: {story_dict['title']} with {len(pages)} pages")
-        return jsonify({'success': True, 'story': story_dict})
+            body, complete = render_once(cache_key, render)
+            if not complete:
+                etag = None
+        
+        return story_response(body, etag)
         
     except Exception as e:
         print(f"❌ Error: {e}")
@@ -120,12 +706,141 @@ def generate_story():
         return jsonify({'success': False, 'error': str(e)}), 500
 
 
+@app.route('/metrics', methods=['GET'])
+def metrics():
+    """Prometheus metrics of this worker"""
+    response = app.response_class(metrics_registry.render(), mimetype='text/plain')
+    response.headers['Content-Type'] = METRICS_CONTENT_TYPE
+    response.headers['Cache-Control'] = 'no-store'
+    return response
+
+
+def is_admin():
+    supplied = request.headers.get('X-Admin-Token', '')
+    return bool(ADMIN_TOKEN) and hmac.compare_digest(supplied.encode('utf-8'), ADMIN_TOKEN.encode('utf-8'))
+
+
+@app.route('/api/admin/profile', methods=['POST'])
+def profile_worker():
+    """Sample this worker's stacks (?seconds=10&interval_ms=5&keyword=Murugan) as collapsed stacks.
+
+    Needs the X-Admin-Token header. With keyword, only requests whose
+    keywords contain it are sampled.
+    """
+    if not ADMIN_TOKEN:
+        return jsonify({'success': False, 'error': 'Not found'}), 404
+    if not is_admin():
+        return jsonify({'success': False, 'error': 'Admin token required'}), 403
+    try:
+        seconds = float(request.args.get('seconds', '10'))
+        interval = float(request.args.get('interval_ms', '5')) / 1000
+    except ValueError:
+        return jsonify({'success': False, 'error': 'seconds and interval_ms must be numbers'}), 400
+    
+    print(f"🔥 Profiling worker {os.getpid()} for {seconds}s")
+    try:
+        profile = stack_profiler.profile(seconds, interval, request.args.get('keyword'))
+    except ProfilerBusy as e:
+        return jsonify({'success': False, 'error': str(e)}), 409
+    
+    response = app.response_class(profile.collapsed(), mimetype='text/plain')
+    response.headers['Cache-Control'] = 'no-store'
+    response.headers['X-Profile-Samples'] = str(profile.samples)
+    response.headers['X-Profile-Seconds'] = str(profile.seconds)
+    response.headers['X-Worker-Pid'] = str(os.getpid())
+    return response
+
+
+@warmup.step('knowledge_base')
+def warm_knowledge_base():
+    """Map the catalogue tables (building any that are stale), load every record and build the keyword indexes"""
+    from catalogue import LazyCatalogue
+    from knowledge_base import TAMIL_HISTORICAL_ENTITIES, TAMIL_PLACES, keyword_matcher
+    from story_generator import STORY_TEMPLATES
+    get_story_generator()
+    keyword_matcher()
+    return {catalogue.name: sum(1 for _ in catalogue.values())
+            for catalogue in (TAMIL_HISTORICAL_ENTITIES, TAMIL_PLACES, STORY_TEMPLATES)
+            if isinstance(catalogue, LazyCatalogue)}
+
+
+@warmup.step('artifacts')
+def check_artifacts():
+    """Report pre-translated stories whose template changed since they were built"""
+    stale = artifact_store.stale_entries()
+    for template_key, reason in stale.items():
+        print(f"⚠️ Stale story artifact for '{template_key}' ({reason}), rebuild with build_artifacts.py")
+    return len(stale)
+
+
+@warmup.step('response_version')
+def warm_response_version():
+    return response_cache.version[:12]
+
+
+@warmup.step('synthesized_stories')
+def warm_synthesized_stories():
+    from story_synthesis import prerender_all
+    return len(prerender_all())
+
+
+@warmup.step('translation_cache')
+def warm_translation_cache():
+    """Most recently used translations into the shared snapshot (or, without one, into memory)"""
+    translation_cache = get_translation_cache()
+    if translation_cache.snapshot_path:
+        return translation_cache.write_snapshot()
+    return translation_cache.preload()
+
+
+@warmup.step('routes')
+def warm_routes():
+    """Compile the URL matcher, which Flask otherwise builds on the first request"""
+    app.url_map.bind('localhost').match('/api/generate-story', 'POST')
+    return len(list(app.url_map.iter_rules()))
+
+
+@warmup.step('popular_stories')
+def warm_popular_stories():
+    """Render the most requested stories into the response cache"""
+    rendered = 0
+    for item in popular_requests():
+        cache_key = story_request_key(item.keywords, item.age_group, item.language, item.eager_pages)
+        if response_cache.get(cache_key) is None:
+            if not render_story(cache_key, *item)[2]:
+                continue
+        rendered += 1
+    return rendered
+
+
+@app.route('/api/ready', methods=['GET'])
+def ready():
+    """Readiness for load balancers: 503 until warm-up has finished"""
+    status = warmup.status()
+    return jsonify(status), 200 if status['ready'] else 503
+
+
 @app.route('/api/health', methods=['GET'])
 def health():
-    return jsonify({'status': 'healthy', 'message': 'Tamil Story Generator API running'})
+    return jsonify({
+        'status': 'healthy',
+        'message': 'Tamil Story Generator API running',
+        'translation_cache': get_translation_cache().stats(),
+        'translation_client': get_translation_client().stats(),
+        'translation_providers': get_provider_chain().stats(),
+        'artifacts': {'hits': artifact_store.hits, 'misses': artifact_store.misses},
+        'response_cache': response_cache.stats(),
+        'story_registry': story_registry.stats(),
+        'single_flight': single_flight.stats()
+    })
 
 
 if __name__ == '__main__':
+    # Development server only; use serve.py in production. Debug is opt-in via FLASK_DEBUG=1.
+    port = int(os.environ.get('PORT', '5000'))
+    debug = os.environ.get('FLASK_DEBUG') == '1'
     print("🚀 Starting Tamil Story Generator...")
-    print("📍 http://localhost:5000")
-    app.run(debug=True, host='0.0.0.0', port=5000)
+    print(f"📍 http://localhost:{port}")
+    install_signal_handler(stack_profiler)
+    warmup.run_in_background()
+    app.run(debug=debug, host='0.0.0.0', port=port)
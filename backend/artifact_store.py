@@ -0,0 +1,101 @@
+"""
+Artifact Store - Pre-translated template stories built offline
+
+Template stories are deterministic, so their translations can be rendered
+once by build_artifacts.py and served with zero outbound calls. Artifacts
+live under artifacts/v<format>/ as gzip-compressed JSON, one file per
+(template content hash, language); editing a template changes its hash,
+which makes the old artifacts stale instead of silently serving them.
+"""
+
+import os
+import json
+import gzip
+import hashlib
+import threading
+from typing import Dict, Optional
+
+from story_generator import STORY_TEMPLATES
+
+# Bump when the rendered story layout changes so old artifacts are ignored
+ARTIFACT_FORMAT_VERSION = 1
+
+ARTIFACT_DIR = os.environ.get(
+    'STORY_ARTIFACT_DIR',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'artifacts')
+)
+
+# Languages offered by the frontend; English is served straight from the templates
+SUPPORTED_LANGUAGES = ['en', 'ta', 'hi', 'te', 'ml', 'kn', 'ur']
+
+
+def template_content_hash(template_key: str) -> str:
+    """Hash of a template's content plus the artifact format version"""
+    payload = json.dumps(
+        {'format_version': ARTIFACT_FORMAT_VERSION, 'template': STORY_TEMPLATES[template_key]},
+        sort_keys=True, ensure_ascii=False
+    )
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class ArtifactStore:
+    """Read-side of the pre-translated artifact store"""
+
+    def __init__(self, root: str = ARTIFACT_DIR):
+        self.directory = os.path.join(root, f"v{ARTIFACT_FORMAT_VERSION}")
+        self._hashes: Dict[str, str] = {}
+        self._loaded: Dict[tuple, Optional[Dict[str, Dict[str, str]]]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def artifact_path(self, content_hash: str, language: str) -> str:
+        return os.path.join(self.directory, f"{content_hash}.{language}.json.gz")
+
+    def _content_hash(self, template_key: str) -> str:
+        content_hash = self._hashes.get(template_key)
+        if content_hash is None:
+            content_hash = self._hashes[template_key] = template_content_hash(template_key)
+        return content_hash
+
+    def _load(self, template_key: str, language: str) -> Optional[Dict[str, Dict[str, str]]]:
+        key = (template_key, language)
+        with self._lock:
+            if key not in self._loaded:
+                path = self.artifact_path(self._content_hash(template_key), language)
+                try:
+                    with gzip.open(path, 'rt', encoding='utf-8') as f:
+                        self._loaded[key] = json.load(f)['variants']
+                except FileNotFoundError:
+                    self._loaded[key] = None
+                except (OSError, ValueError, KeyError) as e:
+                    print(f"⚠️ Unreadable story artifact {path}: {e}")
+                    self._loaded[key] = None
+            return self._loaded[key]
+
+    def lookup(self, template_key: Optional[str], variant: str, language: str) -> Optional[Dict[str, str]]:
+        """Map of English segment -> translation for a template story, if built"""
+        if not template_key or language == 'en' or template_key not in STORY_TEMPLATES:
+            return None
+        variants = self._load(template_key, language)
+        translations = variants.get(variant) if variants else None
+        if translations is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return translations
+
+    def stale_entries(self) -> Dict[str, str]:
+        """Manifest entries whose template has changed since the last build"""
+        try:
+            with open(os.path.join(self.directory, 'manifest.json'), encoding='utf-8') as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        stale = {}
+        for template_key, content_hash in manifest.get('templates', {}).items():
+            if template_key not in STORY_TEMPLATES:
+                stale[template_key] = 'template removed'
+            elif content_hash != self._content_hash(template_key):
+                stale[template_key] = 'template changed'
+        return stale
@@ -0,0 +1,75 @@
+"""
+Build Artifacts - Render and translate every template story offline
+
+    python build_artifacts.py                 # all templates, all languages
+    python build_artifacts.py --languages ta hi
+"""
+
+import os
+import json
+import gzip
+import argparse
+import time
+from typing import List
+
+from story_generator import STORY_TEMPLATES, TamilStoryGenerator, story_text_segments
+from artifact_store import (
+    ARTIFACT_DIR, ARTIFACT_FORMAT_VERSION, SUPPORTED_LANGUAGES,
+    ArtifactStore, template_content_hash
+)
+from translator import translate_many
+
+VARIANTS = ["kids", "adults"]
+
+
+def build_artifacts(languages: List[str], root: str = ARTIFACT_DIR) -> bool:
+    """Write one artifact per (template, language); returns False if any failed"""
+    store = ArtifactStore(root)
+    os.makedirs(store.directory, exist_ok=True)
+    generator = TamilStoryGenerator()
+    manifest = {'format_version': ARTIFACT_FORMAT_VERSION, 'built_at': int(time.time()), 'templates': {}}
+    ok = True
+
+    for template_key in STORY_TEMPLATES:
+        content_hash = template_content_hash(template_key)
+        for language in languages:
+            if language == 'en':
+                continue
+            variants = {}
+            for variant in VARIANTS:
+                story = generator.generate_tamil_story([template_key], variant)
+                segments = story_text_segments(story)
+                result = translate_many(segments, language, deadline=None)
+                if not result.complete:
+                    break
+                variants[variant] = dict(zip(segments, result.texts))
+            if len(variants) != len(VARIANTS):
+                print(f"❌ {template_key} [{language}]: translation incomplete, artifact not written")
+                ok = False
+                continue
+
+            path = store.artifact_path(content_hash, language)
+            tmp_path = path + '.tmp'
+            with gzip.open(tmp_path, 'wt', encoding='utf-8') as f:
+                json.dump({
+                    'format_version': ARTIFACT_FORMAT_VERSION,
+                    'template': template_key,
+                    'template_hash': content_hash,
+                    'language': language,
+                    'variants': variants
+                }, f, ensure_ascii=False)
+            os.replace(tmp_path, path)
+            print(f"✅ {template_key} [{language}] -> {os.path.basename(path)}")
+        manifest['templates'][template_key] = content_hash
+
+    with open(os.path.join(store.directory, 'manifest.json'), 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2)
+    return ok
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build the pre-translated story artifact store")
+    parser.add_argument('--languages', nargs='+', default=SUPPORTED_LANGUAGES, choices=SUPPORTED_LANGUAGES)
+    parser.add_argument('--out', default=ARTIFACT_DIR, help="artifact root directory")
+    args = parser.parse_args()
+    raise SystemExit(0 if build_artifacts(args.languages, args.out) else 1)
@@ -0,0 +1,208 @@
+"""
+Catalogue - Lazily loaded knowledge base records stored as JSON lines
+
+Entities, places and story templates live in data/knowledge/*.jsonl, one
+record per line with its lookup key in "key". Each file is compiled into a
+string table (<name>.table, see string_table.py) mapping every key to its
+record, which workers map read-only: the catalogue is shared through the
+page cache by every process instead of being copied into each one. A
+record is only parsed the first time it is used, and then kept in a
+bounded LRU cache, so a worker's memory doesn't grow with the catalogue.
+
+Tables are generated, not checked in: a missing table, or one built from
+different .jsonl contents, is rebuilt when the catalogue is first used
+(during warm-up, before workers fork). A table records its file's size,
+mtime and digest; the file is only hashed again when its size or mtime
+changed. To build them ahead of time, e.g.
+for a read-only deployment:
+
+    python catalogue.py
+"""
+
+import os
+import sys
+import json
+import time
+import hashlib
+import threading
+from collections import OrderedDict
+from collections.abc import Mapping
+from typing import Any, Callable, Dict, Iterator, Optional
+
+from string_table import StringTable, TableFormatError, write_table
+
+DATA_DIR = os.environ.get(
+    'KNOWLEDGE_DATA_DIR',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'knowledge')
+)
+TABLE_SUFFIX = '.table'
+CATALOGUE_CACHE_SIZE = int(os.environ.get('CATALOGUE_CACHE_SIZE', '1024'))
+# A file modified this close to its table's build may have changed without its
+# size or mtime showing it (coarse timestamps), so it is hashed instead
+RACY_WINDOW_NS = 2 * 10**9
+
+CATALOGUE_FILES = {
+    'entities': 'entities.jsonl',
+    'places': 'places.jsonl',
+    'templates': 'templates.jsonl',
+}
+
+
+def scan_records(path: str) -> Dict[str, bytes]:
+    """Every record line of a .jsonl file by key"""
+    records = {}
+    with open(path, 'rb') as f:
+        for line in f:
+            if line.strip():
+                records[json.loads(line)['key']] = line
+    return records
+
+
+def file_digest(path: str) -> str:
+    """sha256 of a file's bytes: a table is only used for the exact file it was built from"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def table_path(name: str, data_dir: str = DATA_DIR) -> str:
+    return os.path.join(data_dir, name + TABLE_SUFFIX)
+
+
+def build_table(name: str, data_dir: str = DATA_DIR) -> int:
+    """Compile one catalogue file into its string table; returns the record count"""
+    filename = CATALOGUE_FILES[name]
+    path = os.path.join(data_dir, filename)
+    # stat before reading: a write during the build then shows up as a changed mtime
+    stat = os.stat(path)
+    return write_table(table_path(name, data_dir), scan_records(path).items(),
+                       meta={'file': filename, 'sha256': file_digest(path), 'size': stat.st_size,
+                             'mtime_ns': stat.st_mtime_ns, 'built_ns': time.time_ns()})
+
+
+def build_tables(data_dir: str = DATA_DIR) -> Dict[str, int]:
+    """Compile every catalogue file into its string table; returns record counts"""
+    return {name: build_table(name, data_dir) for name in CATALOGUE_FILES}
+
+
+def write_catalogue(name: str, records: Dict[str, dict], data_dir: str = DATA_DIR):
+    """Write records (key -> fields) to a catalogue file; run build_tables() afterwards"""
+    with open(os.path.join(data_dir, CATALOGUE_FILES[name]), 'w', encoding='utf-8') as f:
+        for key, fields in records.items():
+            f.write(json.dumps({'key': key, **fields}, ensure_ascii=False) + '\n')
+
+
+def freeze_record(value: Any) -> Any:
+    """Make a parsed record compact and read-only: interned strings, tuples for lists"""
+    if isinstance(value, str):
+        return sys.intern(value)
+    if isinstance(value, list):
+        return tuple(freeze_record(item) for item in value)
+    if isinstance(value, dict):
+        return {sys.intern(k): freeze_record(v) for k, v in value.items()}
+    return value
+
+
+def table_is_current(meta: Dict[str, Any], path: str) -> bool:
+    """Whether a table built with this meta still matches its file: by size and mtime, hashing only if those changed"""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return False
+    if (meta.get('size') == stat.st_size and meta.get('mtime_ns') == stat.st_mtime_ns
+            and stat.st_mtime_ns < meta.get('built_ns', 0) - RACY_WINDOW_NS):
+        return True
+    return meta.get('sha256') == file_digest(path)
+
+
+def open_table(name: str, data_dir: str = DATA_DIR) -> Optional[StringTable]:
+    """The mapped table of a catalogue, or None if it is missing or out of date"""
+    try:
+        table = StringTable(table_path(name, data_dir))
+    except (OSError, TableFormatError, ValueError):
+        return None
+    if not table_is_current(table.meta, os.path.join(data_dir, CATALOGUE_FILES[name])):
+        table.close()
+        return None
+    return table
+
+
+class LazyCatalogue(Mapping):
+    """Read-only mapping of key -> record, materialized on first access"""
+
+    def __init__(self, name: str, factory: Callable[[Dict[str, Any]], Any] = freeze_record,
+                 data_dir: str = DATA_DIR, cache_size: int = CATALOGUE_CACHE_SIZE):
+        self.name = name
+        self.factory = factory
+        self.data_dir = data_dir
+        self.cache_size = max(1, cache_size)
+        self._records: Optional[Mapping] = None
+        self._digest: Optional[str] = None
+        self._path = os.path.join(data_dir, CATALOGUE_FILES[name])
+        self._cache: "OrderedDict[str, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _raw(self) -> Mapping:
+        """Key -> record line: the mapped table (rebuilt if stale), or the parsed file if it can't be written"""
+        if self._records is None:
+            with self._lock:
+                if self._records is None:
+                    records = open_table(self.name, self.data_dir)
+                    if records is None:
+                        try:
+                            build_table(self.name, self.data_dir)
+                            records = open_table(self.name, self.data_dir)
+                        except OSError as e:
+                            print(f"⚠️ Could not build {self.name}{TABLE_SUFFIX}: {e}")
+                    if records is None:
+                        # e.g. a read-only data directory: each process reads this file into memory
+                        print(f"⚠️ Reading {CATALOGUE_FILES[self.name]} into memory, run catalogue.py to share it")
+                        records = scan_records(self._path)
+                        self._digest = file_digest(self._path)
+                    else:
+                        self._digest = records.meta['sha256']
+                    self._records = records
+        return self._records
+
+    @property
+    def digest(self) -> str:
+        """sha256 of the .jsonl file the records come from"""
+        self._raw()
+        return self._digest
+
+    def __getitem__(self, key: str) -> Any:
+        with self._lock:
+            record = self._cache.get(key)
+            if record is not None:
+                self._cache.move_to_end(key)
+                return record
+        line = self._raw().get(key)
+        if line is None:
+            raise KeyError(key)
+        fields = json.loads(line)
+        del fields['key']
+        record = self.factory(fields)
+        with self._lock:
+            self._cache[key] = record
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return record
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._raw()
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._raw())
+
+    def __len__(self) -> int:
+        return len(self._raw())
+
+    def __repr__(self) -> str:
+        return f"LazyCatalogue({self.name!r}, cached={len(self._cache)})"
+
+
+if __name__ == "__main__":
+    for name, count in build_tables().items():
+        print(f"✅ {name}: {count} records in {name}{TABLE_SUFFIX}")
@@ -0,0 +1,245 @@
+"""
+Keyword Resolver - Fuzzy, ranked lookup of story keywords
+
+Resolves free-text keywords such as "rajaraja cholan" or "katabomman" to
+story templates, knowledge-base entities and image sets. Aliases are
+indexed by character trigrams, so a lookup only scores the few aliases that
+share trigrams with the query, and the best candidates are ranked by edit
+distance. A name typed without its title ("Velu Nachiyar" for "Rani Velu
+Nachiyar") also matches, as long as exactly one target has a name with
+those words.
+"""
+
+import re
+from collections import namedtuple
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional
+
+# Hand-maintained spellings and titles that don't appear in the catalogue itself
+KEYWORD_ALIASES = {
+    "raja raja chola": ["rajaraja", "rajaraja chola", "arulmozhi varman", "raja raja cholan"],
+    "kattabomman": ["veerapandiya kattabomman", "kattabomman nayakkar", "veera pandiya kattabomman"],
+    "murugan": ["muruga", "kartikeya", "karthikeya", "skanda", "subramanya", "subrahmanya", "arumugam"],
+}
+
+# Minimum confidence for a fuzzy match to replace the generic default story
+TEMPLATE_MATCH_THRESHOLD = 0.8
+
+# Entity keywords ("Temple", "Chola") are shared by many entities, so they rank below names
+ENTITY_KEYWORD_WEIGHT = 0.6
+
+# Only the aliases sharing the most trigrams with the query are edit-distance scored
+CANDIDATE_LIMIT = 8
+
+# A query whose words all appear in one target's alias, and that spells out at
+# least this share of it, matches that target with TOKEN_SUBSET_SIMILARITY
+TOKEN_SUBSET_COVERAGE = 0.4
+TOKEN_SUBSET_SIMILARITY = 0.9
+
+_Alias = namedtuple('_Alias', 'text compact kind key weight grams')
+
+
+@dataclass(frozen=True)
+class KeywordMatch:
+    key: str      # template key, entity key or image set key
+    kind: str     # "template", "entity" or "images"
+    alias: str    # the indexed spelling that matched
+    score: float  # confidence in [0, 1]
+
+
+def normalize_keyword(text: str) -> str:
+    """Lower-case, drop punctuation and collapse whitespace"""
+    return " ".join(re.sub(r"[^\w\s]", " ", text.lower()).split())
+
+
+def _trigrams(compact: str) -> set:
+    padded = f"${compact}$"
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def _edit_distance(a: str, b: str, limit: int) -> int:
+    """Levenshtein distance, giving up once it must exceed limit"""
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i]
+        for j, cb in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (ca != cb)))
+        if min(current) > limit:
+            return limit + 1
+        previous = current
+    return previous[-1]
+
+
+class KeywordResolver:
+    """Trigram-indexed alias table with edit-distance ranking"""
+
+    def __init__(self):
+        self._aliases: List[_Alias] = []
+        self._exact: Dict[str, List[int]] = {}
+        self._postings: Dict[str, List[int]] = {}
+
+    def add(self, text: str, kind: str, key: str, weight: float = 1.0):
+        normalized = normalize_keyword(text)
+        if not normalized:
+            return
+        compact = normalized.replace(" ", "")
+        for alias_id in self._exact.get(compact, ()):
+            alias = self._aliases[alias_id]
+            if alias.kind == kind and alias.key == key:
+                return
+        alias_id = len(self._aliases)
+        grams = _trigrams(compact)
+        self._aliases.append(_Alias(normalized, compact, kind, key, weight, len(grams)))
+        self._exact.setdefault(compact, []).append(alias_id)
+        for gram in grams:
+            self._postings.setdefault(gram, []).append(alias_id)
+
+    def add_all(self, texts: Iterable[str], kind: str, key: str, weight: float = 1.0):
+        for text in texts:
+            self.add(text, kind, key, weight)
+
+    def rank(self, query: str, kind: Optional[str] = None, limit: int = 5,
+             partial: bool = False) -> List[KeywordMatch]:
+        """Best matches for a query, highest confidence first.
+
+        With partial=True an alias contained in the query (or containing it)
+        also counts as a strong match, like the old substring image lookup.
+        """
+        normalized = normalize_keyword(query)
+        compact = normalized.replace(" ", "")
+        if not compact:
+            return []
+        grams = _trigrams(compact)
+
+        overlap: Dict[int, int] = {}
+        for gram in grams:
+            for alias_id in self._postings.get(gram, ()):
+                overlap[alias_id] = overlap.get(alias_id, 0) + 1
+        for alias_id in self._exact.get(compact, ()):
+            overlap[alias_id] = len(grams)
+
+        def dice(alias_id):
+            return 2 * overlap[alias_id] / (len(grams) + self._aliases[alias_id].grams)
+
+        candidates = [a for a in overlap if kind is None or self._aliases[a].kind == kind]
+        shortlist = set(sorted(candidates, key=dice, reverse=True)[:CANDIDATE_LIMIT])
+        named = self._token_subset_matches(normalized, compact, candidates)
+
+        best: Dict[tuple, KeywordMatch] = {}
+        for alias_id in candidates:
+            alias = self._aliases[alias_id]
+            if alias.compact == compact:
+                similarity = 1.0
+            elif partial and (alias.compact in compact or compact in alias.compact):
+                similarity = 0.9
+            elif alias_id in named:
+                similarity = TOKEN_SUBSET_SIMILARITY
+            elif alias_id in shortlist:
+                longest = max(len(alias.compact), len(compact))
+                limit = longest // 2
+                distance = _edit_distance(compact, alias.compact, limit)
+                similarity = 1 - distance / longest if distance <= limit else 0.0
+            else:
+                continue
+            score = round(similarity * alias.weight, 4)
+            if score <= 0:
+                continue
+            target = (alias.kind, alias.key)
+            if target not in best or score > best[target].score:
+                best[target] = KeywordMatch(alias.key, alias.kind, alias.text, score)
+
+        return sorted(best.values(), key=lambda m: m.score, reverse=True)[:limit]
+
+    def _token_subset_matches(self, normalized: str, compact: str, candidates: List[int]) -> set:
+        """Aliases containing every word of the query, where only one target of that kind has such an alias"""
+        words = set(normalized.split())
+        matches: Dict[str, Dict[str, List[int]]] = {}  # kind -> key -> alias ids
+        for alias_id in candidates:
+            alias = self._aliases[alias_id]
+            if (alias.compact != compact and len(compact) >= TOKEN_SUBSET_COVERAGE * len(alias.compact)
+                    and words <= set(alias.text.split())):
+                matches.setdefault(alias.kind, {}).setdefault(alias.key, []).append(alias_id)
+        return {alias_id for keys in matches.values() if len(keys) == 1
+                for alias_ids in keys.values() for alias_id in alias_ids}
+
+    def resolve(self, query: str, kind: Optional[str] = None, threshold: float = TEMPLATE_MATCH_THRESHOLD,
+                partial: bool = False) -> Optional[KeywordMatch]:
+        """Top match if its confidence reaches threshold"""
+        ranked = self.rank(query, kind, limit=1, partial=partial)
+        return ranked[0] if ranked and ranked[0].score >= threshold else None
+
+    def __len__(self):
+        return len(self._aliases)
+
+
+def build_resolver(story_templates: Dict[str, dict], entities: Dict[str, object],
+                   page_images: Dict[str, dict]) -> KeywordResolver:
+    """Index template names, entity names and keywords, image sets and aliases"""
+    resolver = KeywordResolver()
+
+    for template_key, template in story_templates.items():
+        resolver.add(template_key, "template", template_key)
+        resolver.add(template["title"].split(" - ")[0], "template", template_key)
+        resolver.add_all(KEYWORD_ALIASES.get(template_key, []), "template", template_key)
+
+    for entity_key, entity in entities.items():
+        names = [entity.name, entity_key.replace("_", " ")]
+        resolver.add_all(names, "entity", entity_key)
+        resolver.add_all(entity.keywords, "entity", entity_key, ENTITY_KEYWORD_WEIGHT)
+        # An entity with a hand-written story resolves to that story too
+        spaced_key = entity_key.replace("_", " ")
+        for template_key in story_templates:
+            if spaced_key == template_key or spaced_key.endswith(" " + template_key):
+                resolver.add_all(names, "template", template_key)
+
+    for image_key in page_images:
+        resolver.add(image_key, "images", image_key)
+
+    return resolver
+
+
+@lru_cache(maxsize=None)
+def get_keyword_resolver() -> KeywordResolver:
+    """Process-wide resolver over the story catalogue, built on first use"""
+    from story_generator import STORY_TEMPLATES, STORY_PAGE_IMAGES
+    from knowledge_base import TAMIL_HISTORICAL_ENTITIES
+    return build_resolver(STORY_TEMPLATES, TAMIL_HISTORICAL_ENTITIES, STORY_PAGE_IMAGES)
+
+
+@lru_cache(maxsize=4096)
+def resolve_keyword(query: str, kind: Optional[str] = None,
+                    partial: bool = False) -> Optional[KeywordMatch]:
+    """Memoized resolve() against the process-wide resolver"""
+    return get_keyword_resolver().resolve(query, kind, partial=partial)
+
+
+if __name__ == "__main__":
+    # Resolver cases: (query, kind, expected key or None when it should fall through to the default story)
+    cases = [
+        ("Raja Raja Chola", "template", "raja raja chola"),
+        ("rajaraja cholan", "template", "raja raja chola"),
+        ("katabomman", "template", "kattabomman"),
+        ("muruga", "template", "murugan"),
+        ("Velu Nachiyar", "entity", "rani_velu_nachiyar"),
+        ("velu nachiyar", "entity", "rani_velu_nachiyar"),
+        ("Rani Velu Nachiyar", "entity", "rani_velu_nachiyar"),
+        ("Chinnamalai", "entity", "dheeran_chinnamalai"),
+        ("Puli Thevar", "entity", "puli_thevar"),
+        ("Marudhu", "entity", "marudhu_brothers"),
+        ("Karikala", "entity", "karikala_chola"),
+        ("Rajendra Chola", "entity", "rajendra_chola"),
+        ("Thiruvalluvar", "entity", "thiruvalluvar"),
+        ("Chola", "entity", None),  # three Chola kings: ambiguous
+        ("Velu", "entity", None),   # too little of the name
+        ("Madurai", "template", None),
+        ("zzz", "entity", None),
+    ]
+    resolver = get_keyword_resolver()
+    for query, kind, expected in cases:
+        match = resolver.resolve(query, kind)
+        actual = match.key if match else None
+        assert actual == expected, (query, kind, resolver.rank(query, kind))
+    print(f"✅ Keyword resolver passes {len(cases)} cases")
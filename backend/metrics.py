@@ -0,0 +1,290 @@
+"""
+Metrics - Request timing spans, histograms and counters in Prometheus format
+
+Code times its phases with spans:
+
+    with span('generate'):
+        story = story_generator.generate_tamil_story(keywords, age_group)
+
+Every span feeds the story_span_duration_seconds histogram. A request can
+also be sampled (SERVER_TIMING_SAMPLE_RATE, 0 to 1): its spans are then
+collected and returned in a Server-Timing header, which browser dev tools
+show next to the request. Unsampled requests pay only for the histogram
+update, and METRICS_ENABLED=0 turns spans into no-ops.
+
+Values are per process; with pre-forked workers each scrape of /metrics
+reports the worker that answered it.
+"""
+
+import os
+import time
+import random
+import threading
+from bisect import bisect_left
+from contextvars import ContextVar
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+METRICS_ENABLED = os.environ.get('METRICS_ENABLED', '1') != '0'
+SERVER_TIMING_SAMPLE_RATE = float(os.environ.get('SERVER_TIMING_SAMPLE_RATE', '0'))
+
+# Seconds; spans range from microseconds (parse) to whole translation deadlines
+LATENCY_BUCKETS = (0.0001, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+                   0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+def _label_text(names: Sequence[str], values: Sequence[str], extra: str = '') -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+def _escape(value) -> str:
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _number(value: float) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    """Monotonic count per label combination"""
+
+    kind = 'counter'
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *labels: str, amount: float = 1):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def value(self, *labels: str) -> float:
+        with self._lock:
+            return self._values.get(labels, 0)
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            values = sorted(self._values.items())
+        return [f"{self.name}{_label_text(self.labelnames, labels)} {_number(value)}" for labels, value in values]
+
+
+class Histogram:
+    """Cumulative bucket counts, sum and count per label combination"""
+
+    kind = 'histogram'
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = LATENCY_BUCKETS):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._series: Dict[Tuple[str, ...], list] = {}  # labels -> [bucket counts..., +Inf count, sum]
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *labels: str):
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [0] * (len(self.buckets) + 1) + [0.0]
+            series[index] += 1
+            series[-1] += value
+
+    def count(self, *labels: str) -> int:
+        with self._lock:
+            series = self._series.get(labels)
+            return sum(series[:-1]) if series else 0
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            all_series = sorted((labels, list(series)) for labels, series in self._series.items())
+        lines = []
+        for labels, series in all_series:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float('inf'),), series):
+                cumulative += count
+                le = 'le="+Inf"' if bound == float('inf') else f'le="{bound!r}"'
+                lines.append(f"{self.name}_bucket{_label_text(self.labelnames, labels, le)} {cumulative}")
+            label_text = _label_text(self.labelnames, labels)
+            lines.append(f"{self.name}_sum{label_text} {_number(series[-1])}")
+            lines.append(f"{self.name}_count{label_text} {cumulative}")
+        return lines
+
+
+class CallbackMetric:
+    """Values read from a callback at scrape time, e.g. from a component's existing stats()"""
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str],
+                 read: Callable[[], Dict[Tuple[str, ...], float]], kind: str = 'gauge'):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self.read = read
+        self.kind = kind
+
+    def samples(self) -> List[str]:
+        try:
+            values = sorted(self.read().items())
+        except Exception as e:
+            print(f"⚠️ Metric {self.name} unavailable: {e}")
+            return []
+        return [f"{self.name}{_label_text(self.labelnames, labels)} {_number(value)}" for labels, value in values]
+
+
+class MetricsRegistry:
+    """Named metrics rendered together in the Prometheus text format"""
+
+    def __init__(self):
+        self._metrics: Dict[str, object] = {}
+
+    def _add(self, metric):
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, help: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._add(Counter(name, help, labelnames))
+
+    def histogram(self, name: str, help: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = LATENCY_BUCKETS) -> Histogram:
+        return self._add(Histogram(name, help, labelnames, buckets))
+
+    def gauge(self, name: str, help: str, labelnames: Sequence[str],
+              read: Callable[[], Dict[Tuple[str, ...], float]]) -> CallbackMetric:
+        return self._add(CallbackMetric(name, help, labelnames, read))
+
+    def counter_callback(self, name: str, help: str, labelnames: Sequence[str],
+                         read: Callable[[], Dict[Tuple[str, ...], float]]) -> CallbackMetric:
+        """A counter kept elsewhere (e.g. cache hit counts), read when scraped"""
+        return self._add(CallbackMetric(name, help, labelnames, read, kind='counter'))
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics.values():
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.samples())
+        return '\n'.join(lines) + '\n'
+
+
+registry = MetricsRegistry()
+
+request_duration = registry.histogram(
+    'story_request_duration_seconds', 'Time to produce a response, by endpoint and status', ('endpoint', 'status'))
+span_duration = registry.histogram(
+    'story_span_duration_seconds', 'Time spent in each request phase', ('span',))
+translation_call_duration = registry.histogram(
+    'story_translation_call_duration_seconds', 'Translation provider call latency', ('provider',))
+translation_errors = registry.counter(
+    'story_translation_errors_total', 'Failed translation calls by provider and kind', ('provider', 'kind'))
+translation_fallbacks = registry.counter(
+    'story_translation_fallbacks_total', 'Segments served in English instead of translated', ('reason',))
+
+
+class RequestTiming:
+    """Spans and counts collected for one sampled request"""
+
+    __slots__ = ('started', 'spans', 'counts')
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.spans: List[Tuple[str, float]] = []  # appends are atomic, translation threads add to it too
+        self.counts: Dict[str, int] = {}
+
+    def add(self, name: str, seconds: float):
+        self.spans.append((name, seconds))
+
+    def count(self, name: str, amount: int = 1):
+        self.counts[name] = self.counts.get(name, 0) + amount
+
+    def header(self, elapsed: str = 'total') -> str:
+        """Server-Timing value: one entry per span name with its total duration, then the time so far"""
+        totals: Dict[str, List[float]] = {}
+        for name, seconds in list(self.spans):
+            total = totals.setdefault(name, [0.0, 0])
+            total[0] += seconds
+            total[1] += 1
+        entries = []
+        for name, (seconds, calls) in totals.items():
+            entry = f"{name};dur={seconds * 1000:.2f}"
+            entries.append(entry + (f';desc="x{calls}"' if calls > 1 else ''))
+        entries.extend(f'{name};desc="{count}"' for name, count in self.counts.items())
+        entries.append(f"{elapsed};dur={(time.perf_counter() - self.started) * 1000:.2f}")
+        return ', '.join(entries)
+
+
+_current_timing = ContextVar('request_timing', default=None)  # Optional[RequestTiming]
+
+
+def start_request(sample_rate: float = SERVER_TIMING_SAMPLE_RATE):
+    """Begin timing a request; it collects a Server-Timing breakdown if sampled"""
+    timing = RequestTiming() if sample_rate > 0 and random.random() < sample_rate else None
+    return _current_timing.set(timing)
+
+
+def finish_request(token) -> Optional[RequestTiming]:
+    """End the request started with start_request, returning its timing if sampled"""
+    timing = _current_timing.get()
+    _current_timing.reset(token)
+    return timing
+
+
+def current_timing() -> Optional[RequestTiming]:
+    """The sampled request timing of this context, for work handed to other threads"""
+    return _current_timing.get()
+
+
+def record_span(name: str, seconds: float, timing: Optional[RequestTiming] = None):
+    if not METRICS_ENABLED:
+        return
+    span_duration.observe(seconds, name)
+    timing = timing or _current_timing.get()
+    if timing is not None:
+        timing.add(name, seconds)
+
+
+def count_cache_lookups(hits: int, misses: int, timing: Optional[RequestTiming] = None):
+    """Translation cache hits and misses of a sampled request (totals come from the cache's own stats)"""
+    timing = timing or _current_timing.get()
+    if timing is not None:
+        timing.count('cache_hit', hits)
+        timing.count('cache_miss', misses)
+
+
+class _Span:
+    __slots__ = ('name', 'started')
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        record_span(self.name, time.perf_counter() - self.started)
+
+
+class _NoSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        pass
+
+
+_NO_SPAN = _NoSpan()
+
+
+def span(name: str):
+    """Context manager timing one request phase"""
+    return _Span(name) if METRICS_ENABLED else _NO_SPAN
@@ -0,0 +1,99 @@
+"""
+Mock Translator - Local stand-in for the Google Translate endpoint
+
+Answers GET and POST requests in the same JSON shape as translate_a/single.
+Every line is "translated" by tagging it with the target language, and the
+batch delimiter line is passed through untouched, like the real service.
+
+    python mock_translator.py --port 5050 --latency 0.2
+    TRANSLATE_API_URL=http://127.0.0.1:5050/translate_a/single python app.py
+"""
+
+import argparse
+import json
+import threading
+import time
+import urllib.parse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Tuple
+
+from translation_providers import BATCH_DELIMITER_TOKEN
+
+
+def mock_translate(text: str, target_lang: str) -> str:
+    lines = text.split('\n')
+    return '\n'.join(
+        line if line.strip() in ('', BATCH_DELIMITER_TOKEN) else f"[{target_lang}] {line}"
+        for line in lines
+    )
+
+
+class MockTranslatorHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True  # headers and body go out as separate writes on keep-alive sockets
+    latency = 0.0
+    fail_status = 0  # respond with this status instead of translating, when set
+    request_count = 0
+    _count_lock = threading.Lock()
+
+    def do_GET(self):
+        self._translate(urllib.parse.urlparse(self.path).query)
+
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length', 0))
+        body = self.rfile.read(length).decode('utf-8')
+        query = urllib.parse.urlparse(self.path).query
+        self._translate('&'.join(part for part in (query, body) if part))
+
+    def _translate(self, query: str):
+        with MockTranslatorHandler._count_lock:
+            MockTranslatorHandler.request_count += 1
+        if self.latency:
+            time.sleep(self.latency)
+        if self.fail_status:
+            self._send(self.fail_status, b'{}')
+            return
+        params = urllib.parse.parse_qs(query)
+        text = params.get('q', [''])[0]
+        target_lang = params.get('tl', ['en'])[0]
+        translated = mock_translate(text, target_lang)
+        self._send(200, json.dumps([[[translated, text, None, None]], None, 'en']).encode('utf-8'))
+
+    def _send(self, status: int, body: bytes):
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class MockTranslatorServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 128  # the default of 5 drops SYNs under concurrent clients
+
+
+def start_mock_translator(port: int = 0, latency: float = 0.0,
+                          fail_status: int = 0) -> Tuple[MockTranslatorServer, str]:
+    """Start the mock server on a background thread and return it with its URL"""
+    handler = type('ConfiguredMockTranslator', (MockTranslatorHandler,),
+                   {'latency': latency, 'fail_status': fail_status})
+    server = MockTranslatorServer(('127.0.0.1', port), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/translate_a/single"
+    return server, url
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Local stand-in translation server")
+    parser.add_argument('--port', type=int, default=5050)
+    parser.add_argument('--latency', type=float, default=0.0, help="seconds added to every response")
+    args = parser.parse_args()
+    server, url = start_mock_translator(args.port, args.latency)
+    print(f"🧪 Mock translator on {url} (latency {args.latency}s)")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
@@ -0,0 +1,187 @@
+"""
+Sampling Profiler - On-demand stack sampling of a live worker
+
+While a profile runs, the stacks of every thread are sampled from
+sys._current_frames() at a fixed interval and counted in the collapsed
+format flamegraph.pl, speedscope and inferno read:
+
+    request thread;generate_story (app.py:480);translate_story (app.py:164);wait (threading.py:288) 41
+
+Waiting on translation I/O shows up as the request thread blocked in
+wait(), next to the translate pool threads doing the HTTP calls. With a
+keyword filter only threads currently serving a request for that keyword
+are sampled, including translate pool threads while they work on a batch
+for such a request. Nothing is recorded while no profile is running.
+
+Start one on a worker with the admin endpoint (set ADMIN_TOKEN):
+
+    curl -X POST -H "X-Admin-Token: $ADMIN_TOKEN" \\
+        "localhost:5000/api/admin/profile?seconds=10&keyword=Murugan" > profile.folded
+
+or with `kill -USR2 <worker pid>`, which writes PROFILE_DIR/profile-<pid>-<time>.folded.
+(Signal the worker, not the gunicorn master: the master treats USR2 as an upgrade.)
+Under gevent workers only real threads are visible, not individual greenlets.
+"""
+
+import os
+import re
+import sys
+import time
+import signal
+import threading
+from collections import Counter
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, NamedTuple, Optional
+
+PROFILE_MAX_SECONDS = float(os.environ.get('PROFILE_MAX_SECONDS', '20'))  # keep under the worker timeout
+PROFILE_INTERVAL = float(os.environ.get('PROFILE_INTERVAL', '0.005'))
+PROFILE_SIGNAL_SECONDS = float(os.environ.get('PROFILE_SIGNAL_SECONDS', '10'))
+PROFILE_DIR = os.environ.get(
+    'PROFILE_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'cache', 'profiles')
+)
+
+_THREAD_NUMBER_RE = re.compile(r'[-_]\d+')
+
+
+class ProfilerBusy(Exception):
+    """Raised when a profile is requested while another one is running"""
+
+
+class Profile(NamedTuple):
+    stacks: Counter  # collapsed stack -> samples
+    samples: int
+    seconds: float
+    keyword: Optional[str]
+
+    def collapsed(self) -> str:
+        """Stacks in the folded format, heaviest first"""
+        return ''.join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+
+class SamplingProfiler:
+    """Samples thread stacks for a fixed time; one profile at a time per process"""
+
+    def __init__(self, max_seconds: float = PROFILE_MAX_SECONDS):
+        self.max_seconds = max_seconds
+        self.active = False
+        self.keyword: Optional[str] = None
+        self._request_keywords: Dict[int, str] = {}  # thread ident -> keywords, only while filtering
+        self._lock = threading.Lock()
+        self._labels: Dict[object, str] = {}
+
+    def tag_request(self, keywords: List[str]):
+        """Note which keywords this thread is serving, if a keyword-filtered profile is running"""
+        if self.keyword is not None:
+            self._request_keywords[threading.get_ident()] = ' '.join(keywords).lower()
+
+    def end_request(self):
+        if self.keyword is not None:
+            self._request_keywords.pop(threading.get_ident(), None)
+
+    def request_tag(self) -> Optional[str]:
+        """This thread's request tag, for work it hands to other threads (None unless filtering)"""
+        if self.keyword is None:
+            return None
+        return self._request_keywords.get(threading.get_ident())
+
+    @contextmanager
+    def tagged(self, tag: Optional[str]) -> Iterator[None]:
+        """Tag this (pool) thread like the request it is working for, for the duration"""
+        if tag is None or self.keyword is None:
+            yield
+            return
+        ident = threading.get_ident()
+        self._request_keywords[ident] = tag
+        try:
+            yield
+        finally:
+            self._request_keywords.pop(ident, None)
+
+    def profile(self, seconds: float, interval: float = PROFILE_INTERVAL,
+                keyword: Optional[str] = None) -> Profile:
+        """Sample for `seconds` (capped at max_seconds), blocking the calling thread"""
+        seconds = max(0.0, min(seconds, self.max_seconds))
+        interval = max(0.001, interval)
+        if not self._lock.acquire(blocking=False):
+            raise ProfilerBusy('A profile is already running in this worker')
+        try:
+            self.keyword = keyword.lower() if keyword else None
+            self.active = True
+            return self._sample(seconds, interval)
+        finally:
+            self.active = False
+            self.keyword = None
+            self._request_keywords.clear()
+            self._lock.release()
+
+    def _sample(self, seconds: float, interval: float) -> Profile:
+        me = threading.get_ident()
+        stacks: Counter = Counter()
+        samples = 0
+        started = time.monotonic()
+        next_at = started
+        while True:
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == me:
+                    continue
+                if self.keyword is not None and self.keyword not in self._request_keywords.get(ident, ''):
+                    continue
+                thread = _THREAD_NUMBER_RE.sub('', names.get(ident, 'thread'))
+                stacks[thread + ';' + self._collapse(frame)] += 1
+            samples += 1
+            next_at += interval
+            delay = next_at - time.monotonic()
+            if next_at - started >= seconds:
+                break
+            if delay > 0:
+                time.sleep(delay)
+        return Profile(stacks, samples, round(time.monotonic() - started, 3), self.keyword)
+
+    def _collapse(self, frame) -> str:
+        labels = []
+        while frame is not None:
+            code = frame.f_code
+            label = self._labels.get(code)
+            if label is None:
+                label = self._labels[code] = (
+                    f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+                )
+            labels.append(label)
+            frame = frame.f_back
+        return ';'.join(reversed(labels))
+
+
+def write_profile(profile: Profile, directory: str = PROFILE_DIR) -> str:
+    """Save a profile as a .folded file, returning its path"""
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, f"profile-{os.getpid()}-{time.strftime('%Y%m%d-%H%M%S')}.folded")
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(profile.collapsed())
+    return path
+
+
+# The process-wide profiler: requests tag themselves on it and pool threads inherit their tags
+stack_profiler = SamplingProfiler()
+
+
+def install_signal_handler(profiler: SamplingProfiler, seconds: float = PROFILE_SIGNAL_SECONDS,
+                           directory: str = PROFILE_DIR) -> bool:
+    """Profile for `seconds` in the background on SIGUSR2; call from the worker's main thread"""
+    if not hasattr(signal, 'SIGUSR2'):
+        return False
+
+    def run():
+        try:
+            profile = profiler.profile(seconds)
+        except ProfilerBusy:
+            print("⚠️ Profile already running, ignoring SIGUSR2")
+            return
+        print(f"🔥 Profile of {profile.samples} samples written to {write_profile(profile, directory)}")
+
+    def handle(signum, frame):
+        threading.Thread(target=run, name='profiler', daemon=True).start()
+
+    signal.signal(signal.SIGUSR2, handle)
+    signal.siginterrupt(signal.SIGUSR2, False)  # don't break in-flight socket calls
+    return True
@@ -0,0 +1,115 @@
+"""
+Response Cache - Render-once storage of serialized story and translation bodies
+"""
+
+import os
+import json
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional
+
+from story_generator import STORY_TEMPLATES
+from artifact_store import template_content_hash
+from story_synthesis import synthesis_content_hash
+
+# Bump when the response layout changes so clients and CDNs revalidate
+RESPONSE_FORMAT_VERSION = 2
+
+RESPONSE_CACHE_BYTES = int(os.environ.get('STORY_RESPONSE_CACHE_BYTES', str(64 * 1024 * 1024)))
+RESPONSE_MAX_AGE = int(os.environ.get('STORY_RESPONSE_MAX_AGE', '3600'))
+
+
+def content_version() -> str:
+    """Version of everything a story response is rendered from"""
+    digest = hashlib.sha256(f"response-v{RESPONSE_FORMAT_VERSION}".encode('utf-8'))
+    for template_key in sorted(STORY_TEMPLATES):
+        digest.update(template_content_hash(template_key).encode('utf-8'))
+    digest.update(synthesis_content_hash().encode('utf-8'))
+    return digest.hexdigest()
+
+
+def story_request_key(keywords: List[str], age_group: str, language: str,
+                      eager_pages: Optional[int] = None) -> str:
+    """Normalized cache key for a story request"""
+    key = [[k.strip() for k in keywords if k.strip()], age_group, language]
+    if eager_pages is not None:
+        key.append(eager_pages)
+    return json.dumps(key, ensure_ascii=False)
+
+
+def translation_request_key(story_id: str, language: str, eager_pages: Optional[int] = None) -> str:
+    """Cache key for a translate-only request"""
+    return json.dumps(['translation', story_id, language, eager_pages])
+
+
+def page_request_key(story_id: str, page_number: int, language: str) -> str:
+    """Cache key for a single translated page"""
+    return json.dumps(['page', story_id, page_number, language])
+
+
+class ResponseCache:
+    """Byte-bounded LRU of serialized story responses with strong ETags.
+
+    A response is only stored once every segment was translated, so the
+    bytes for a key never change while the content version stays the same.
+    That lets the ETag be computed from (content version, request key)
+    without rendering anything.
+    """
+
+    def __init__(self, max_bytes: int = RESPONSE_CACHE_BYTES, version: Optional[str] = None):
+        self.max_bytes = max_bytes
+        self._version = version
+        self._entries: "OrderedDict[str, bytes]" = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.not_modified = 0
+
+    @property
+    def version(self) -> str:
+        """content_version(), computed on first use so importing the app doesn't load the templates"""
+        if self._version is None:
+            self._version = content_version()
+        return self._version
+
+    def etag(self, key: str) -> str:
+        return hashlib.sha256(f"{self.version}\n{key}".encode('utf-8')).hexdigest()[:32]
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            body = self._entries.get(key)
+            if body is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return body
+
+    def record_not_modified(self):
+        with self._lock:
+            self.not_modified += 1
+
+    def put(self, key: str, body: bytes):
+        if len(body) > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._size -= len(previous)
+            self._entries[key] = body
+            self._size += len(body)
+            while self._size > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= len(evicted)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'not_modified': self.not_modified,
+                'entries': len(self._entries),
+                'bytes': self._size,
+            }
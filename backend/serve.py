@@ -0,0 +1,125 @@
+"""
+Production server for the Tamil Story Generator API
+
+    python serve.py --workers 4 --threads 8
+    python serve.py --async --workers 2          # gevent workers for translation I/O
+
+Runs gunicorn with the app preloaded and warmed up (warmup.py) in the master
+process, so the knowledge base, story templates and popular stories are built
+once and shared copy-on-write by every worker. The catalogue and the
+translation snapshot are mapped string tables, shared through the page
+cache rather than copied into each worker. Falls back to a threaded
+(non-debug) server where gunicorn is not available, e.g. on Windows.
+"""
+
+import os
+import sys
+import argparse
+
+
+def parse_args(argv=None):
+    cpus = os.cpu_count() or 1
+    parser = argparse.ArgumentParser(description="Serve the Tamil Story Generator API")
+    parser.add_argument('--bind', default=os.environ.get('BIND', f"0.0.0.0:{os.environ.get('PORT', '5000')}"))
+    parser.add_argument('--workers', type=int, default=int(os.environ.get('WEB_CONCURRENCY', str(cpus * 2 + 1))))
+    parser.add_argument('--threads', type=int, default=int(os.environ.get('WEB_THREADS', '4')),
+                        help="threads per worker (ignored by --async)")
+    parser.add_argument('--async', dest='use_async', action='store_true',
+                        default=os.environ.get('WEB_ASYNC') == '1',
+                        help="use gevent workers, suited to waiting on outbound translation I/O")
+    parser.add_argument('--connections', type=int, default=int(os.environ.get('WEB_CONNECTIONS', '1000')),
+                        help="concurrent connections per async worker")
+    parser.add_argument('--timeout', type=int, default=int(os.environ.get('WEB_TIMEOUT', '30')))
+    parser.add_argument('--graceful-timeout', type=int, default=int(os.environ.get('WEB_GRACEFUL_TIMEOUT', '20')))
+    return parser.parse_args(argv)
+
+
+def preload():
+    """Import and warm up the app in the master so every forked worker shares it copy-on-write"""
+    import gc
+    from app import app, warmup
+    # Before any worker exists, so none answers /api/ready (or takes traffic) cold
+    warmup.run()
+    # Move everything built so far out of the GC's reach; collections in the
+    # workers would otherwise touch (and copy) every shared page.
+    gc.collect()
+    gc.freeze()
+    return app
+
+
+def run_gunicorn(args):
+    from gunicorn.app.base import BaseApplication
+
+    def post_worker_init(worker):
+        # gunicorn resets worker signal handlers, so the profiler's SIGUSR2 goes in after that
+        from app import stack_profiler
+        from profiler import install_signal_handler
+        install_signal_handler(stack_profiler)
+
+    def worker_exit(server, worker):
+        import translator
+        translator.shutdown()
+
+    class StoryServer(BaseApplication):
+        def __init__(self, application, options):
+            self.application = application
+            self.options = options
+            super().__init__()
+
+        def load_config(self):
+            for key, value in self.options.items():
+                self.cfg.set(key, value)
+
+        def load(self):
+            return self.application
+
+    options = {
+        'bind': args.bind,
+        'workers': args.workers,
+        'preload_app': True,
+        'timeout': args.timeout,
+        'graceful_timeout': args.graceful_timeout,
+        'post_worker_init': post_worker_init,
+        'worker_exit': worker_exit,
+        'accesslog': '-',
+    }
+    if args.use_async:
+        options.update({'worker_class': 'gevent', 'worker_connections': args.connections})
+    else:
+        options.update({'worker_class': 'gthread', 'threads': args.threads})
+
+    print(f"🚀 Serving on {args.bind} with {args.workers} {options['worker_class']} workers")
+    StoryServer(preload(), options).run()
+
+
+def run_fallback(args):
+    from werkzeug.serving import run_simple
+    host, _, port = args.bind.rpartition(':')
+    print("⚠️ gunicorn not available, using the threaded single-process server")
+    application = preload()
+    from app import stack_profiler
+    from profiler import install_signal_handler
+    install_signal_handler(stack_profiler)
+    run_simple(host or '0.0.0.0', int(port), application, threaded=True, use_reloader=False, use_debugger=False)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.use_async:
+        # Must patch before the app (and its threading/socket users) is imported
+        try:
+            from gevent import monkey
+        except ImportError:
+            sys.exit("❌ --async needs gevent: pip install gevent")
+        monkey.patch_all()
+    try:
+        import gunicorn  # noqa: F401
+    except ImportError:
+        run_fallback(args)
+        return
+    run_gunicorn(args)
+
+
+if __name__ == "__main__":
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    main()
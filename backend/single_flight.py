@@ -0,0 +1,122 @@
+"""
+Single Flight - Collapse identical concurrent work into one computation
+
+When many requests for the same story arrive together, the first becomes
+the leader and computes it; the others wait for the leader's result instead
+of running their own translation fan-out.
+
+Within a worker this is an in-memory table of in-flight keys. Across
+pre-forked workers it can optionally also take an advisory lock file per key
+(set SINGLE_FLIGHT_LOCK_DIR): a leader in another process then waits for the
+first one to finish and finds its translations in the shared SQLite cache.
+"""
+
+import os
+import time
+import hashlib
+import threading
+from typing import Callable, Dict, Optional, Tuple, TypeVar
+
+try:
+    import fcntl
+except ImportError:  # Windows: in-process coalescing only
+    fcntl = None
+
+SINGLE_FLIGHT_LOCK_DIR = os.environ.get('SINGLE_FLIGHT_LOCK_DIR', '')
+SINGLE_FLIGHT_LOCK_STRIPES = int(os.environ.get('SINGLE_FLIGHT_LOCK_STRIPES', '256'))
+SINGLE_FLIGHT_LOCK_TIMEOUT = float(os.environ.get('SINGLE_FLIGHT_LOCK_TIMEOUT', '10'))
+
+T = TypeVar('T')
+
+
+class _Call:
+    __slots__ = ('done', 'result', 'error')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """Per-key deduplication of concurrent calls, optionally across processes"""
+
+    def __init__(self, lock_dir: Optional[str] = SINGLE_FLIGHT_LOCK_DIR,
+                 stripes: int = SINGLE_FLIGHT_LOCK_STRIPES,
+                 lock_timeout: float = SINGLE_FLIGHT_LOCK_TIMEOUT):
+        self.lock_dir = lock_dir if lock_dir and fcntl is not None else None
+        self.stripes = max(1, stripes)
+        self.lock_timeout = lock_timeout
+        self._calls: Dict[str, _Call] = {}
+        self._lock = threading.Lock()
+        self.leaders = 0
+        self.coalesced = 0
+        self.process_waits = 0
+        if self.lock_dir:
+            os.makedirs(self.lock_dir, exist_ok=True)
+
+    def do(self, key: str, fn: Callable[[], T]) -> Tuple[T, bool]:
+        """Run fn once for all concurrent callers with this key; returns (result, shared)"""
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self.leaders += 1
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result, True
+
+        try:
+            call.result = self._run_locked(key, fn) if self.lock_dir else fn()
+            return call.result, False
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    def _run_locked(self, key: str, fn: Callable[[], T]) -> T:
+        # Keys share a bounded set of lock files; a collision only serializes two keys briefly
+        stripe = int(hashlib.sha256(key.encode('utf-8')).hexdigest()[:8], 16) % self.stripes
+        with open(os.path.join(self.lock_dir, f"{stripe:04d}.lock"), 'a+') as lock_file:
+            locked = self._acquire(lock_file)
+            try:
+                return fn()
+            finally:
+                if locked:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _acquire(self, lock_file) -> bool:
+        """Take the lock file, waiting up to lock_timeout; past that, compute anyway"""
+        deadline = time.monotonic() + self.lock_timeout
+        waited = False
+        while True:
+            try:
+                fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                return True
+            except BlockingIOError:
+                if not waited:
+                    waited = True
+                    with self._lock:
+                        self.process_waits += 1
+                if time.monotonic() >= deadline:
+                    return False
+                time.sleep(0.01)
+
+    def stats(self) -> Dict[str, object]:
+        with self._lock:
+            return {
+                'leaders': self.leaders,
+                'coalesced': self.coalesced,
+                'process_waits': self.process_waits,
+                'in_flight': len(self._calls),
+                'cross_process': self.lock_dir is not None,
+            }
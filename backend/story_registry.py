@@ -0,0 +1,65 @@
+"""
+Story Registry - Recently generated stories, addressable by content ID
+
+Every story response carries a story_id, a hash of the story's English text.
+The registry keeps the English source for recent IDs so a language switch
+can translate the story again without regenerating it. It is bounded and
+per-process; a worker that no longer has an ID can regenerate the story
+from its keywords and check it against the hash.
+"""
+
+import os
+import json
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Dict, NamedTuple, Optional
+
+from story_generator import TamilStoryData, story_segment_groups
+
+STORY_REGISTRY_SIZE = int(os.environ.get('STORY_REGISTRY_SIZE', '10000'))
+
+
+def story_content_id(story: TamilStoryData) -> str:
+    """Stable ID of a story's translatable English content"""
+    payload = json.dumps([story.age_group, story_segment_groups(story)], ensure_ascii=False)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()[:24]
+
+
+class RegisteredStory(NamedTuple):
+    story: TamilStoryData
+    template_key: Optional[str]
+
+
+class StoryRegistry:
+    """LRU of story_id -> English story source"""
+
+    def __init__(self, max_entries: int = STORY_REGISTRY_SIZE):
+        self.max_entries = max(1, max_entries)
+        self._entries: "OrderedDict[str, RegisteredStory]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def register(self, story: TamilStoryData, template_key: Optional[str] = None) -> str:
+        story_id = story_content_id(story)
+        with self._lock:
+            self._entries[story_id] = RegisteredStory(story, template_key)
+            self._entries.move_to_end(story_id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return story_id
+
+    def get(self, story_id: str) -> Optional[RegisteredStory]:
+        with self._lock:
+            entry = self._entries.get(story_id)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(story_id)
+            self.hits += 1
+            return entry
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses, 'entries': len(self._entries)}
@@ -0,0 +1,389 @@
+"""
+Story Synthesis - Multi-page stories composed from knowledge base entities
+
+Only a few keywords have hand-written stories. Every other entity in
+TAMIL_HISTORICAL_ENTITIES gets a story assembled from its own record: an
+outline skeleton chosen by entity type and age group (the
+TAMIL_STORY_TEMPLATES plus two for deities, saints and epic characters) is
+filled from the entity's fields, then pages are added for one of its story
+seeds, the places it is linked to and what it is known for. Places are
+cross-linked both ways: a TAMIL_PLACES record naming the entity in
+associated_entities, or named in the entity's associated_places.
+
+Wording choices come from a random.Random seeded with (entity, variant,
+seed), so a given seed always produces the same story and responses stay
+cacheable. Stories are pure data built once per (entity, variant, seed);
+the whole entity x age group matrix renders in milliseconds:
+
+    python story_synthesis.py
+"""
+
+import os
+import time
+import random
+import hashlib
+from functools import lru_cache
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from knowledge_base import TAMIL_HISTORICAL_ENTITIES, TAMIL_PLACES, TAMIL_STORY_TEMPLATES, TamilEntity, TamilPlace
+from template_engine import CompiledTemplate, compile_templates
+
+# Bump when the synthesized text changes so cached responses are revalidated
+SYNTHESIS_VERSION = 1
+STORY_SYNTHESIS_SEED = int(os.environ.get('STORY_SYNTHESIS_SEED', '0'))
+
+VARIANTS = ("kids", "adults")
+MAX_PLACE_PAGES = 2
+
+# Skeletons for the entity types the knowledge base outlines don't fit
+SYNTHESIS_TEMPLATES = {
+    "kids_tamil_devotion": """
+    Long ago in Tamil Nadu, people told wonderful stories about {name}.
+    {intro}
+
+    {name} was known all over the land, and most of all in {place}.
+    Children and grown-ups alike came to listen and to learn.
+
+    {story_seed}
+
+    Everyone who heard the story learned that {moral_lesson}.
+
+    Even today, during {festival}, families remember {name} and share these stories again!
+    """,
+
+    "adult_tamil_devotion": """
+    Few figures hold as deep a place in Tamil tradition as {name}, remembered from the {era}.
+    {historical_context}
+
+    The tradition is rooted in {place}, where {main_conflict}.
+
+    {detailed_resolution}
+
+    Generations of poets, devotees and scholars have returned to this story,
+    finding in it a lasting truth: {philosophical_moral}.
+
+    The festival of {festival} keeps this memory alive, and with it the values of {core_values}.
+    """,
+}
+
+# One page title per skeleton paragraph
+SKELETON_PAGE_TITLES = {
+    "kids_tamil_king": "The Wise King of {place}|A Worry in the Kingdom|The King's Plan|A Happy Kingdom|Remembering {name}",
+    "kids_tamil_hero": "A Brave Hero|Trouble Arrives|Standing Up|{name}'s Courage|Peace Returns|Remembering {name}",
+    "adult_tamil_history": ("The Golden Age|Historical Context|The Challenge|Strategy and Counsel|"
+                            "The Resolution|A Lasting Achievement|Legacy of {name}"),
+    "kids_tamil_devotion": "Stories of {name}|Known in {place}|A Story People Tell|The Lesson|Remembering {name}",
+    "adult_tamil_devotion": "{name} in Tamil Tradition|Roots in {place}|The Tradition|A Lasting Truth|Living Memory",
+}
+
+# Skeleton per (entity type, variant)
+TYPE_SKELETONS = {
+    ("king", "kids"): "kids_tamil_king",
+    ("queen", "kids"): "kids_tamil_hero",
+    ("freedom_fighter", "kids"): "kids_tamil_hero",
+    ("epic_character", "kids"): "kids_tamil_hero",
+    ("deity", "kids"): "kids_tamil_devotion",
+    ("saint_poet", "kids"): "kids_tamil_devotion",
+    ("king", "adults"): "adult_tamil_history",
+    ("queen", "adults"): "adult_tamil_history",
+    ("freedom_fighter", "adults"): "adult_tamil_history",
+    ("epic_character", "adults"): "adult_tamil_devotion",
+    ("deity", "adults"): "adult_tamil_devotion",
+    ("saint_poet", "adults"): "adult_tamil_devotion",
+}
+DEFAULT_SKELETONS = {"kids": "kids_tamil_hero", "adults": "adult_tamil_devotion"}
+
+STORY_TYPES = {
+    "king": "historical", "queen": "historical", "freedom_fighter": "historical",
+    "epic_character": "epic", "deity": "mythology", "saint_poet": "literary",
+}
+
+# Wording per entity type; lists are alternatives picked by the seeded generator
+TYPE_PHRASES = {
+    "king": {
+        "problem": ["the rivers were running low and the fields were getting dry",
+                    "the people had no grand place to gather and pray together",
+                    "travellers and traders found the roads long and unsafe"],
+        "moral_lesson": ["cared for every one of his people", "used his wisdom to help everyone"],
+        "main_conflict": ["holding together a vast realm while rivals waited at its borders",
+                          "turning military power into lasting prosperity for ordinary people"],
+        "solution_approach": ["unite the realm through justice, trade and patronage of the arts",
+                              "secure the kingdom while investing in temples, irrigation and learning"],
+        "philosophical_moral": ["true power is measured by the welfare of the people",
+                                "a ruler is remembered for what he builds, not what he destroys"],
+        "core_values": ["justice, generosity and learning", "good governance and cultural patronage"],
+    },
+    "queen": {
+        "main_conflict": ["reclaiming a kingdom lost to powerful outside forces",
+                          "leading armies at a time when few believed a queen could"],
+        "solution_approach": ["build alliances, train loyal warriors and strike at the right moment",
+                              "rally the people and their neighbours behind a single cause"],
+        "philosophical_moral": ["courage and determination know no boundaries",
+                                "leadership belongs to those who refuse to give up"],
+        "core_values": ["courage, loyalty and self-respect", "resolve, strategy and devotion to one's people"],
+    },
+    "freedom_fighter": {
+        "main_conflict": ["resisting the growing power of a foreign company that demanded taxes and obedience",
+                          "defending the land's freedom against a far better armed enemy"],
+        "solution_approach": ["refuse to bow, gather loyal allies and defend every fort",
+                              "use knowledge of the land and the loyalty of the people to resist"],
+        "philosophical_moral": ["freedom is worth every sacrifice",
+                                "self-respect cannot be taken away by force"],
+        "core_values": ["courage, sacrifice and patriotism", "freedom, unity and self-respect"],
+    },
+    "epic_character": {
+        "intro": ["Their story has been sung by poets for almost two thousand years."],
+        "main_conflict": ["the great epics of Tamil literature unfold their story of love, loss and justice",
+                          "poets first set down a story of truth tested by injustice"],
+        "philosophical_moral": ["justice will find its way, however long it takes",
+                                "truth and virtue outlast every injustice"],
+        "core_values": ["justice, truth and virtue", "dharma, love and integrity"],
+    },
+    "deity": {
+        "intro": ["Devotees sing songs of praise and light lamps in temples across the land.",
+                  "Temple bells ring out every morning for the festivals held in their honour."],
+        "main_conflict": ["devotees have gathered in worship and festival for many centuries",
+                          "temple traditions, songs and pilgrimages have grown around the legend"],
+        "philosophical_moral": ["devotion and goodness protect those who hold on to them",
+                                "divine grace meets those who seek it with a sincere heart"],
+        "core_values": ["devotion, compassion and courage", "faith, protection and community"],
+    },
+    "saint_poet": {
+        "intro": ["Their songs and verses are still recited by people of every age.",
+                  "Their words are still read in homes, schools and temples."],
+        "main_conflict": ["verses composed centuries ago are still recited in homes and temples",
+                          "a body of poetry took shape that still guides Tamil devotion and ethics"],
+        "philosophical_moral": ["words spoken with truth and love outlive empires",
+                                "wisdom belongs to everyone who seeks it"],
+        "core_values": ["wisdom, devotion and humility", "learning, ethics and compassion"],
+    },
+}
+COMMON_PHRASES = {
+    "moral_lesson": ["being brave and kind makes the world better",
+                     "standing up for what is right always matters",
+                     "goodness and courage always win in the end"],
+    "intro": ["Their story has been told for hundreds of years."],
+    "legend_kids": ["Grandparents still tell this story to children, and every time the children ask to hear it again.",
+                    "It is one of the stories Tamil children grow up with, full of wonder and courage."],
+    "legend_adults": ["The tale survives in inscriptions, songs and retellings, each generation adding its own colour.",
+                      "Scholars and storytellers alike return to it, reading in it the values of its time."],
+}
+
+
+class SynthesizedPage(NamedTuple):
+    title: str
+    content: str
+    location: str
+
+
+class SynthesizedStory(NamedTuple):
+    entity_key: str
+    title: str
+    pages: Tuple[SynthesizedPage, ...]
+    moral: str
+    festival: str
+    region: str
+    era: str
+    story_type: str
+    historical_context: str
+    facts: Tuple[str, ...]
+    place: Optional[TamilPlace]
+
+
+@lru_cache(maxsize=None)
+def story_skeletons() -> Dict[str, CompiledTemplate]:
+    """Outline templates from the knowledge base plus the ones above, compiled on first use"""
+    return compile_templates({**TAMIL_STORY_TEMPLATES, **SYNTHESIS_TEMPLATES}, dedent=True)
+
+
+@lru_cache(maxsize=None)
+def _page_titles() -> Dict[str, CompiledTemplate]:
+    return compile_templates(SKELETON_PAGE_TITLES)
+
+
+def _normalize(name: str) -> str:
+    return " ".join(name.lower().replace("_", " ").split())
+
+
+def _join(items: List[str]) -> str:
+    """'', 'a', 'a and b', 'a, b and c'"""
+    items = list(items)
+    if len(items) < 2:
+        return "".join(items)
+    return ", ".join(items[:-1]) + " and " + items[-1]
+
+
+def _sentence(text: str) -> str:
+    text = text.strip()
+    return text if not text or text.endswith((".", "!", "?")) else text + "."
+
+
+def _names_entity(name: str, entity_key: str, entity: TamilEntity) -> bool:
+    """Whether a place's associated_entities name refers to this entity ("Raja Raja Chola" -> Raja Raja Chola I)"""
+    name = _normalize(name)
+    full = _normalize(entity.name)
+    return name in (_normalize(entity_key), full) or full.startswith(name + " ")
+
+
+@lru_cache(maxsize=None)
+def place_links() -> Dict[str, Tuple[str, ...]]:
+    """Place keys linked to each entity key, in catalogue order"""
+    links: Dict[str, List[str]] = {key: [] for key in TAMIL_HISTORICAL_ENTITIES}
+    places = list(TAMIL_PLACES.items())
+    for entity_key, entity in TAMIL_HISTORICAL_ENTITIES.items():
+        visited = {_normalize(name) for name in entity.associated_places}
+        for place_key, place in places:
+            if (_normalize(place.name) in visited
+                    or any(_names_entity(name, entity_key, entity) for name in place.associated_entities)):
+                links[entity_key].append(place_key)
+    return {key: tuple(place_keys) for key, place_keys in links.items()}
+
+
+def linked_places(entity_key: str) -> Tuple[TamilPlace, ...]:
+    return tuple(TAMIL_PLACES[key] for key in place_links().get(entity_key, ()))
+
+
+def _pick(rng: random.Random, entity_type: str, phrase: str) -> str:
+    options = TYPE_PHRASES.get(entity_type, {}).get(phrase) or COMMON_PHRASES[phrase]
+    return rng.choice(options)
+
+
+def _seed_sentence(seed_text: str, lead: str = "People still tell of") -> str:
+    """'The king who dreamed...' -> 'People still tell of the king who dreamed...' ('' for no seed)"""
+    seed_text = seed_text.strip()
+    if not seed_text:
+        return ""
+    return _sentence(f"{lead} {seed_text[0].lower()}{seed_text[1:]}")
+
+
+def _skeleton_values(entity: TamilEntity, variant: str, rng: random.Random, place_name: str,
+                     festival: str, story_seed: str) -> Dict[str, str]:
+    kind = entity.type
+    known_for = _join(list(entity.known_for))
+    achievements = f": {known_for}" if known_for else ""
+    values = {
+        "name": entity.name, "king_name": entity.name, "hero_name": entity.name, "ruler_name": entity.name,
+        "place": place_name, "capital": place_name, "era": entity.era, "festival": festival,
+        "story_seed": _seed_sentence(story_seed),
+        "moral_lesson": _pick(rng, kind, "moral_lesson"),
+        "intro": _pick(rng, kind, "intro"),
+        "historical_context": _sentence(entity.short_bio),
+        "heroic_action": f"{_seed_sentence(story_seed)} Everyone remembered how {entity.name} never gave up.",
+        "solution_description": _sentence(
+            f"So {entity.name} set to work, and in time the whole land knew of it{achievements}"
+        ),
+        "detailed_resolution": _sentence(
+            f"What endures is the record of {entity.name}'s achievements{achievements}"
+        ),
+    }
+    if variant == "kids" and kind == "king":
+        values["problem"] = _pick(rng, kind, "problem")
+    if variant == "adults":
+        for phrase in ("main_conflict", "solution_approach", "philosophical_moral", "core_values"):
+            options = TYPE_PHRASES.get(kind, TYPE_PHRASES["epic_character"]).get(phrase)
+            values[phrase] = rng.choice(options) if options else ""
+    return values
+
+
+def _paragraphs(text: str) -> List[str]:
+    return [" ".join(block.split()) for block in text.split("\n\n") if block.strip()]
+
+
+def _render(template: CompiledTemplate, values: Dict[str, str]) -> str:
+    return template.render({name: values.get(name, "") for name in template.names})
+
+
+@lru_cache(maxsize=1024)
+def synthesize_story(entity_key: str, variant: str, seed: int = STORY_SYNTHESIS_SEED) -> SynthesizedStory:
+    """The story of a knowledge base entity for an age group variant ("kids" or "adults")"""
+    entity = TAMIL_HISTORICAL_ENTITIES[entity_key]
+    rng = random.Random(f"{entity_key}:{variant}:{seed}")
+    places = linked_places(entity_key)
+    place_name = places[0].name if places else entity.region
+    festival = rng.choice(entity.festivals) if entity.festivals else "Pongal"
+    story_seeds = list(entity.story_seeds) or [entity.short_bio]
+    rng.shuffle(story_seeds)
+
+    skeleton_key = TYPE_SKELETONS.get((entity.type, variant), DEFAULT_SKELETONS[variant])
+    values = _skeleton_values(entity, variant, rng, place_name, festival, story_seeds[0])
+    paragraphs = _paragraphs(_render(story_skeletons()[skeleton_key], values))
+    titles = _render(_page_titles()[skeleton_key], values).split("|")
+    spine = [SynthesizedPage(title, content, place_name) for title, content in zip(titles, paragraphs)]
+
+    legend_seed = story_seeds[1] if len(story_seeds) > 1 else story_seeds[0]
+    legend = SynthesizedPage(
+        "A Favourite Tale" if variant == "kids" else "The Legend",
+        " ".join(filter(None, (_seed_sentence(legend_seed, 'Another story remembers'),
+                                rng.choice(COMMON_PHRASES['legend_' + variant])))),
+        place_name,
+    )
+
+    place_pages = []
+    for place in places[:MAX_PLACE_PAGES]:
+        others = [name for name in place.associated_entities if not _names_entity(name, entity_key, entity)]
+        content = f"{_sentence(place.description)} {_sentence(place.main_legend)}"
+        if variant == "adults":
+            content += f" {_sentence(place.historical_significance)}"
+        if others:
+            content += f" Here the memory of {entity.name} lives alongside {_join(others)}."
+        place_pages.append(SynthesizedPage(place.name, content, place.name))
+    if not places and entity.associated_places:
+        place_pages.append(SynthesizedPage(
+            "Places of the Story",
+            f"The story of {entity.name} is remembered in {_join(list(entity.associated_places))}.",
+            entity.region,
+        ))
+
+    known_for_pages = []
+    if entity.known_for:
+        known_for_pages.append(SynthesizedPage(
+            f"What {entity.name} Is Remembered For",
+            f"{entity.name} is remembered for {_join(list(entity.known_for))}. {_sentence(entity.short_bio)}",
+            place_name,
+        ))
+
+    # Opening, the legend, the rest of the outline with places and achievements before its close
+    pages = [spine[0], legend] + spine[1:-1] + place_pages + known_for_pages + [spine[-1]]
+    moral = values.get("philosophical_moral") or values["moral_lesson"]
+    title_seed = rng.choice(story_seeds).strip()
+    return SynthesizedStory(
+        entity_key=entity_key,
+        title=f"{entity.name} - {title_seed}" if title_seed else entity.name,
+        pages=tuple(pages),
+        moral=_sentence(moral[0].upper() + moral[1:]),
+        festival=festival,
+        region=entity.region,
+        era=entity.era,
+        story_type=STORY_TYPES.get(entity.type, "cultural"),
+        historical_context=_sentence(entity.short_bio),
+        facts=tuple(_sentence(f"{entity.name} is known for {item}") for item in entity.known_for[:3]),
+        place=places[0] if places else None,
+    )
+
+
+def prerender_all(seed: int = STORY_SYNTHESIS_SEED) -> Dict[Tuple[str, str], SynthesizedStory]:
+    """Synthesize every entity in every variant (fills the cache, e.g. at worker boot)"""
+    return {(key, variant): synthesize_story(key, variant, seed)
+            for key in TAMIL_HISTORICAL_ENTITIES for variant in VARIANTS}
+
+
+def synthesis_content_hash(seed: int = STORY_SYNTHESIS_SEED) -> str:
+    """Hash of what synthesized stories are rendered from: code version, seed and the entity and place records"""
+    digest = hashlib.sha256(f"synthesis-v{SYNTHESIS_VERSION}:{seed}".encode('utf-8'))
+    for records in (TAMIL_HISTORICAL_ENTITIES, TAMIL_PLACES):
+        digest.update(records.digest.encode('utf-8'))
+    return digest.hexdigest()
+
+
+if __name__ == "__main__":
+    started = time.perf_counter()
+    stories = prerender_all()
+    elapsed = time.perf_counter() - started
+    linked = sum(1 for key in TAMIL_HISTORICAL_ENTITIES if place_links()[key])
+    pages = sum(len(story.pages) for story in stories.values())
+    print(f"✅ Synthesized {len(stories)} stories ({pages} pages) in {elapsed * 1000:.1f} ms; "
+          f"{linked}/{len(TAMIL_HISTORICAL_ENTITIES)} entities linked to places")
+    assert all(synthesize_story.__wrapped__(key, variant) == story for (key, variant), story in stories.items())
+    print("✅ Deterministic per seed")
+    assert _join([]) == "" and _seed_sentence("") == "" and _join(["a"]) == "a"
+    print("✅ Empty known_for and story seeds render without them")
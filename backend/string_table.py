@@ -0,0 +1,135 @@
+"""
+String Table - Immutable key -> bytes tables shared through mmap
+
+A table is written once and afterwards only mapped read-only. Every
+process that opens the same file shares its page-cache pages, so a
+pre-forked worker holds no private copy however large the table is, and a
+lookup only touches the pages it reads. Opening a table parses nothing.
+
+    write_table(path, [("madurai", b'{"name": "Madurai", ...}')], meta={"sha256": "9f2c..."})
+    table = StringTable(path)
+    table.get("madurai")      # bytes, or None
+    list(table)               # keys in the order they were written
+
+Layout (little-endian):
+
+    header   b"STBL", version u32, count u32, meta length u32
+    meta     JSON object describing the source (e.g. its digest)
+    entries  count x (key offset u64, key length u32, value offset u64, value length u32), in write order
+    sorted   count x u32 entry numbers ordered by key bytes, for binary search
+    data     keys and values back to back
+
+Tables are replaced atomically (os.replace), so a process still mapping
+the old file keeps reading it until it reopens.
+"""
+
+import os
+import json
+import mmap
+import struct
+from collections.abc import Mapping
+from typing import Any, Dict, Iterable, Iterator, Optional, Tuple
+
+MAGIC = b'STBL'
+TABLE_VERSION = 1
+
+_HEADER = struct.Struct('<4sIII')
+_ENTRY = struct.Struct('<QIQI')
+_NUMBER = struct.Struct('<I')
+
+
+class TableFormatError(ValueError):
+    """The file is not a string table this version can read"""
+
+
+def write_table(path: str, items: Iterable[Tuple[str, bytes]], meta: Optional[Dict[str, Any]] = None) -> int:
+    """Write (key, value) pairs to a new table at path; later duplicates of a key win. Returns the count."""
+    values: Dict[bytes, bytes] = {}
+    for key, value in items:
+        values[key.encode('utf-8')] = bytes(value)
+    meta_bytes = json.dumps(meta or {}, sort_keys=True).encode('utf-8')
+
+    data_start = _HEADER.size + len(meta_bytes) + len(values) * (_ENTRY.size + _NUMBER.size)
+    entries = []
+    offset = data_start
+    for key, value in values.items():
+        entries.append((offset, len(key), offset + len(key), len(value)))
+        offset += len(key) + len(value)
+    keys = list(values)
+    order = sorted(range(len(keys)), key=keys.__getitem__)
+
+    tmp_path = f"{path}.tmp{os.getpid()}"
+    with open(tmp_path, 'wb') as f:
+        f.write(_HEADER.pack(MAGIC, TABLE_VERSION, len(values), len(meta_bytes)))
+        f.write(meta_bytes)
+        f.write(b''.join(_ENTRY.pack(*entry) for entry in entries))
+        f.write(b''.join(_NUMBER.pack(number) for number in order))
+        for key, value in values.items():
+            f.write(key)
+            f.write(value)
+    os.replace(tmp_path, path)
+    return len(values)
+
+
+class StringTable(Mapping):
+    """Read-only str -> bytes mapping over a mapped table file"""
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, 'rb') as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            magic, version, self._count, meta_length = _HEADER.unpack_from(self._map, 0)
+        except struct.error:
+            magic, version = b'', 0
+        if magic != MAGIC or version != TABLE_VERSION:
+            self._map.close()
+            raise TableFormatError(f"{path} is not a version {TABLE_VERSION} string table")
+        self.meta: Dict[str, Any] = json.loads(self._map[_HEADER.size:_HEADER.size + meta_length])
+        self._entries = _HEADER.size + meta_length
+        self._sorted = self._entries + self._count * _ENTRY.size
+
+    def _entry(self, number: int) -> Tuple[int, int, int, int]:
+        return _ENTRY.unpack_from(self._map, self._entries + number * _ENTRY.size)
+
+    def _find(self, key: str) -> Optional[Tuple[int, int, int, int]]:
+        target = key.encode('utf-8')
+        low, high = 0, self._count
+        while low < high:
+            middle = (low + high) // 2
+            entry = self._entry(_NUMBER.unpack_from(self._map, self._sorted + middle * _NUMBER.size)[0])
+            candidate = self._map[entry[0]:entry[0] + entry[1]]
+            if candidate == target:
+                return entry
+            if candidate < target:
+                low = middle + 1
+            else:
+                high = middle
+        return None
+
+    def get(self, key: str, default: Optional[bytes] = None) -> Optional[bytes]:
+        entry = self._find(key)
+        return default if entry is None else self._map[entry[2]:entry[2] + entry[3]]
+
+    def __getitem__(self, key: str) -> bytes:
+        entry = self._find(key)
+        if entry is None:
+            raise KeyError(key)
+        return self._map[entry[2]:entry[2] + entry[3]]
+
+    def __contains__(self, key: object) -> bool:
+        return isinstance(key, str) and self._find(key) is not None
+
+    def __iter__(self) -> Iterator[str]:
+        for number in range(self._count):
+            key_offset, key_length = self._entry(number)[:2]
+            yield self._map[key_offset:key_offset + key_length].decode('utf-8')
+
+    def __len__(self) -> int:
+        return self._count
+
+    def close(self):
+        self._map.close()
+
+    def __repr__(self) -> str:
+        return f"StringTable({os.path.basename(self.path)!r}, entries={self._count})"
@@ -0,0 +1,89 @@
+"""
+Template Engine - Story templates compiled once into fragments and slots
+
+A template such as "The Story of {keyword}" is parsed a single time into
+the literal text around its placeholders and the value slot each
+placeholder fills. Rendering then only joins the precomputed fragments
+with the request's values; nothing is parsed or formatted per call.
+
+    title = compile_template("The Story of {keyword}")
+    title.render(keyword="Pongal")        # by name
+    title.render_values(("Pongal",))      # by slot order (title.names), no lookups
+
+Only plain named placeholders are supported; "{{" and "}}" are literal braces.
+"""
+
+import textwrap
+from string import Formatter
+from typing import Dict, Mapping, Optional, Sequence, Tuple
+
+
+class TemplateError(ValueError):
+    """A template that can't be compiled, or a render missing a value"""
+
+
+class CompiledTemplate:
+    """Literal fragments interleaved with value slots.
+
+    fragments has one more entry than slots; slots[i] is the index in names
+    of the value that goes between fragments[i] and fragments[i + 1].
+    """
+
+    __slots__ = ('source', 'fragments', 'slots', 'names')
+
+    def __init__(self, source: str, fragments: Tuple[str, ...], slots: Tuple[int, ...], names: Tuple[str, ...]):
+        self.source = source
+        self.fragments = fragments
+        self.slots = slots
+        self.names = names
+
+    def render(self, values: Optional[Mapping[str, object]] = None, **kwargs) -> str:
+        """Fill the placeholders by name"""
+        if kwargs:
+            values = {**(values or {}), **kwargs}
+        values = values or {}
+        missing = [name for name in self.names if name not in values]
+        if missing:
+            raise TemplateError(f"No value for {', '.join('{' + name + '}' for name in missing)}")
+        return self.render_values([str(values[name]) for name in self.names])
+
+    def render_values(self, values: Sequence[str]) -> str:
+        """Fill the placeholders from strings given in the order of names"""
+        if len(self.names) == 1:
+            return values[0].join(self.fragments)
+        if not self.slots:
+            return self.fragments[0]
+        parts = [''] * (2 * len(self.slots) + 1)
+        parts[0::2] = self.fragments
+        parts[1::2] = [values[slot] for slot in self.slots]
+        return ''.join(parts)
+
+    def __repr__(self):
+        return f"CompiledTemplate(names={self.names!r}, slots={len(self.slots)})"
+
+
+def compile_template(text: str, dedent: bool = False) -> CompiledTemplate:
+    """Parse a template into fragments and slots; dedent strips block-string indentation"""
+    if dedent:
+        text = textwrap.dedent(text).strip()
+    fragments = ['']
+    slots = []
+    names: Dict[str, int] = {}
+    try:
+        parsed = list(Formatter().parse(text))
+    except ValueError as e:
+        raise TemplateError(f"Invalid template: {e}") from None
+    for literal, name, format_spec, conversion in parsed:
+        fragments[-1] += literal
+        if name is None:
+            continue
+        if not name.isidentifier() or format_spec or conversion:
+            raise TemplateError(f"Unsupported placeholder {{{name}}}: only plain names are allowed")
+        slots.append(names.setdefault(name, len(names)))
+        fragments.append('')
+    return CompiledTemplate(text, tuple(fragments), tuple(slots), tuple(names))
+
+
+def compile_templates(templates: Mapping[str, str], dedent: bool = False) -> Dict[str, CompiledTemplate]:
+    """Compile a named set of templates"""
+    return {key: compile_template(text, dedent) for key, text in templates.items()}
@@ -0,0 +1,328 @@
+"""
+Translation Cache - In-memory LRU backed by a persistent SQLite store
+
+Between the two sits an optional read-only snapshot: the most recently
+used SQLite rows written to a string table (string_table.py) that every
+worker maps, so translations known at boot are shared through the page
+cache rather than copied into each worker's LRU.
+"""
+
+import os
+import sqlite3
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional
+
+from string_table import StringTable, TableFormatError, write_table
+
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'cache')
+
+# Set TRANSLATION_CACHE_PATH to an empty string to keep the cache in memory only
+DEFAULT_CACHE_PATH = os.environ.get('TRANSLATION_CACHE_PATH', os.path.join(CACHE_DIR, 'translations.sqlite3'))
+DEFAULT_MEMORY_ENTRIES = int(os.environ.get('TRANSLATION_CACHE_MEMORY_ENTRIES', '4096'))
+DEFAULT_DISK_ENTRIES = int(os.environ.get('TRANSLATION_CACHE_DISK_ENTRIES', '200000'))
+# Cache hits refresh last_used in batches rather than with a write per read
+TOUCH_FLUSH_ENTRIES = int(os.environ.get('TRANSLATION_CACHE_TOUCH_FLUSH_ENTRIES', '256'))
+TOUCH_FLUSH_SECONDS = float(os.environ.get('TRANSLATION_CACHE_TOUCH_FLUSH_SECONDS', '5'))
+# Set TRANSLATION_SNAPSHOT_PATH to an empty string to disable the shared snapshot
+DEFAULT_SNAPSHOT_PATH = os.environ.get('TRANSLATION_SNAPSHOT_PATH', os.path.join(CACHE_DIR, 'translations.table'))
+DEFAULT_SNAPSHOT_ENTRIES = int(os.environ.get('TRANSLATION_SNAPSHOT_ENTRIES', str(DEFAULT_DISK_ENTRIES)))
+
+
+def text_hash(text: str) -> str:
+    """Stable hash of the source text used as the cache key"""
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+class TranslationCache:
+    """Two-tier translation cache keyed by (source text hash, target language).
+
+    Lookups go to the in-memory LRU first, then to the mapped snapshot (if
+    one has been written), then to the on-disk tier, which survives restarts
+    and is shared by every worker pointing at the same file. The LRU and
+    disk tiers are size bounded and evict least recently used entries; the
+    snapshot is immutable until write_snapshot() replaces it, and its hits
+    neither enter the LRU nor refresh last_used on disk.
+    """
+
+    def __init__(self, path: Optional[str] = DEFAULT_CACHE_PATH,
+                 memory_entries: int = DEFAULT_MEMORY_ENTRIES,
+                 disk_entries: int = DEFAULT_DISK_ENTRIES,
+                 snapshot_path: Optional[str] = DEFAULT_SNAPSHOT_PATH):
+        self.path = path
+        self.snapshot_path = snapshot_path
+        self.memory_entries = max(1, memory_entries)
+        self.disk_entries = max(1, disk_entries)
+        self._memory: "OrderedDict[tuple, str]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+        self._snapshot: Optional[StringTable] = None
+        self._disk_count = 0
+        self._touched: Dict[tuple, float] = {}  # key -> last use not yet written to disk
+        self._touches_flushed_at = time.monotonic()
+        self.memory_hits = 0
+        self.snapshot_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        if path:
+            self._open_disk(path)
+        if snapshot_path:
+            self._open_snapshot(snapshot_path)
+
+    def _open_disk(self, path: str):
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            db = sqlite3.connect(path, check_same_thread=False, timeout=5)
+            db.execute('PRAGMA journal_mode=WAL')
+            db.execute('PRAGMA synchronous=NORMAL')
+            db.execute(
+                'CREATE TABLE IF NOT EXISTS translations ('
+                ' text_hash TEXT NOT NULL,'
+                ' lang TEXT NOT NULL,'
+                ' translated TEXT NOT NULL,'
+                ' last_used REAL NOT NULL,'
+                ' PRIMARY KEY (text_hash, lang))'
+            )
+            db.execute('CREATE INDEX IF NOT EXISTS idx_translations_last_used ON translations (last_used)')
+            db.commit()
+            self._disk_count = db.execute('SELECT COUNT(*) FROM translations').fetchone()[0]
+            self._db = db
+        except sqlite3.Error as e:
+            print(f"⚠️ Translation cache disk tier disabled: {e}")
+            self._db = None
+
+    def _open_snapshot(self, path: str):
+        try:
+            self._snapshot = StringTable(path)
+        except FileNotFoundError:
+            self._snapshot = None
+        except (OSError, TableFormatError, ValueError) as e:
+            print(f"⚠️ Translation snapshot {path} unreadable, ignoring it: {e}")
+            self._snapshot = None
+
+    def get(self, text: str, target_lang: str) -> Optional[str]:
+        """Return the cached translation, or None on a miss"""
+        key = (text_hash(text), target_lang)
+        with self._lock:
+            translated = self._memory.get(key)
+            if translated is not None:
+                self._memory.move_to_end(key)
+                self.memory_hits += 1
+                self._record_use(key)
+                return translated
+
+        snapshot = self._snapshot  # immutable and lock-free; a replacement only swaps the reference
+        if snapshot is not None:
+            found = snapshot.get(f"{target_lang}:{key[0]}")
+            if found is not None:
+                with self._lock:
+                    self.snapshot_hits += 1
+                    self._record_use(key)
+                return found.decode('utf-8')
+
+        with self._lock:
+            translated = self._disk_get(key)
+            if translated is not None:
+                self.disk_hits += 1
+                self._memory_put(key, translated)
+                return translated
+
+            self.misses += 1
+            return None
+
+    def put(self, text: str, target_lang: str, translated: str):
+        """Store a successful translation in both tiers"""
+        key = (text_hash(text), target_lang)
+        with self._lock:
+            self._memory_put(key, translated)
+            self._disk_put(key, translated)
+
+    def write_snapshot(self, limit: int = DEFAULT_SNAPSHOT_ENTRIES) -> int:
+        """Write the most recently used disk entries to the snapshot and map it; returns how many.
+
+        Call before forking workers (e.g. in warm-up) so they all share the mapping.
+        """
+        if not self.snapshot_path:
+            return 0
+        with self._lock:
+            if self._db is None:
+                return 0
+            try:
+                self._flush_touches()
+                self._db.commit()
+                rows = self._db.execute(
+                    'SELECT text_hash, lang, translated FROM translations ORDER BY last_used DESC LIMIT ?',
+                    (max(0, limit),)
+                ).fetchall()
+            except sqlite3.Error as e:
+                print(f"⚠️ Translation snapshot not written: {e}")
+                return 0
+        os.makedirs(os.path.dirname(os.path.abspath(self.snapshot_path)), exist_ok=True)
+        count = write_table(
+            self.snapshot_path,
+            ((f"{lang}:{text_key}", translated.encode('utf-8')) for text_key, lang, translated in rows),
+            meta={'written': time.time()},
+        )
+        self._open_snapshot(self.snapshot_path)
+        return count
+
+    def preload(self, limit: Optional[int] = None) -> int:
+        """Fill the in-memory tier with the most recently used disk entries; returns how many"""
+        limit = self.memory_entries if limit is None else min(limit, self.memory_entries)
+        with self._lock:
+            if self._db is None or limit <= 0:
+                return 0
+            try:
+                self._flush_touches()
+                self._db.commit()
+                rows = self._db.execute(
+                    'SELECT text_hash, lang, translated FROM translations ORDER BY last_used DESC LIMIT ?',
+                    (limit,)
+                ).fetchall()
+            except sqlite3.Error as e:
+                print(f"⚠️ Translation cache preload error: {e}")
+                return 0
+            # Oldest first, so the most recently used end up last in the LRU
+            for text_key, lang, translated in reversed(rows):
+                self._memory_put((text_key, lang), translated)
+            return len(rows)
+
+    def _memory_put(self, key: tuple, translated: str):
+        self._memory[key] = translated
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+            self.evictions += 1
+
+    def _disk_get(self, key: tuple) -> Optional[str]:
+        if self._db is None:
+            return None
+        try:
+            row = self._db.execute(
+                'SELECT translated FROM translations WHERE text_hash = ? AND lang = ?', key
+            ).fetchone()
+            if row is None:
+                return None
+            self._touch(key)
+            return row[0]
+        except sqlite3.Error as e:
+            print(f"⚠️ Translation cache read error: {e}")
+            return None
+
+    def _touch(self, key: tuple):
+        """Note a use of key; last_used is written with the next flush"""
+        self._touched[key] = time.time()
+        if (len(self._touched) >= TOUCH_FLUSH_ENTRIES
+                or time.monotonic() - self._touches_flushed_at >= TOUCH_FLUSH_SECONDS):
+            self._flush_touches()
+            self._db.commit()
+
+    def _record_use(self, key: tuple):
+        """Refresh last_used for a hit served above the disk, so snapshots and eviction see it"""
+        if self._db is None:
+            return
+        try:
+            self._touch(key)
+        except sqlite3.Error as e:
+            print(f"⚠️ Translation cache write error: {e}")
+
+    def _flush_touches(self):
+        """Write buffered last_used times (the caller commits)"""
+        self._touches_flushed_at = time.monotonic()
+        if not self._touched or self._db is None:
+            return
+        touched, self._touched = self._touched, {}
+        self._db.executemany(
+            'UPDATE translations SET last_used = ? WHERE text_hash = ? AND lang = ?',
+            [(last_used,) + key for key, last_used in touched.items()]
+        )
+
+    def _disk_put(self, key: tuple, translated: str):
+        if self._db is None:
+            return
+        try:
+            cursor = self._db.execute(
+                'INSERT OR IGNORE INTO translations (text_hash, lang, translated, last_used) VALUES (?, ?, ?, ?)',
+                key + (translated, time.time())
+            )
+            if cursor.rowcount:
+                self._disk_count += 1
+            else:
+                self._db.execute(
+                    'UPDATE translations SET translated = ?, last_used = ? WHERE text_hash = ? AND lang = ?',
+                    (translated, time.time()) + key
+                )
+            self._touched.pop(key, None)
+            if self._disk_count > self.disk_entries:
+                self._disk_evict()
+            self._db.commit()
+        except sqlite3.Error as e:
+            print(f"⚠️ Translation cache write error: {e}")
+
+    def _disk_evict(self):
+        # Trim to 90% of the bound so eviction is not paid on every insert;
+        # recent reads are written first so they don't count as old
+        self._flush_touches()
+        excess = self._disk_count - int(self.disk_entries * 0.9)
+        self._db.execute(
+            'DELETE FROM translations WHERE rowid IN '
+            '(SELECT rowid FROM translations ORDER BY last_used LIMIT ?)',
+            (excess,)
+        )
+        self._disk_count = self._db.execute('SELECT COUNT(*) FROM translations').fetchone()[0]
+        self.evictions += excess
+
+    def stats(self) -> Dict[str, float]:
+        """Hit/miss counters and tier sizes"""
+        with self._lock:
+            hits = self.memory_hits + self.snapshot_hits + self.disk_hits
+            lookups = hits + self.misses
+            return {
+                'memory_hits': self.memory_hits,
+                'snapshot_hits': self.snapshot_hits,
+                'disk_hits': self.disk_hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_ratio': round(hits / lookups, 4) if lookups else 0.0,
+                'memory_entries': len(self._memory),
+                'snapshot_entries': len(self._snapshot) if self._snapshot is not None else 0,
+                'disk_entries': self._disk_count if self._db is not None else 0,
+            }
+
+    def clear(self):
+        """Drop every cached translation from every tier"""
+        with self._lock:
+            self._memory.clear()
+            self._touched.clear()
+            if self._snapshot is not None:
+                self._snapshot = None
+                try:
+                    os.remove(self.snapshot_path)
+                except OSError:
+                    pass
+            if self._db is not None:
+                self._db.execute('DELETE FROM translations')
+                self._db.commit()
+                self._disk_count = 0
+
+    def close(self):
+        with self._lock:
+            if self._db is not None:
+                try:
+                    self._flush_touches()
+                    self._db.commit()
+                except sqlite3.Error as e:
+                    print(f"⚠️ Translation cache write error: {e}")
+                self._db.close()
+                self._db = None
+
+    def reopen_after_fork(self):
+        """Give a forked worker its own lock and SQLite connection (the snapshot mapping is kept, shared)"""
+        self._lock = threading.Lock()
+        self._db = None
+        self._touched = {}  # the parent writes its own
+        if self.path:
+            self._open_disk(self.path)
@@ -0,0 +1,300 @@
+"""
+Translation Client - Pooled keep-alive HTTP client for the translation backend
+
+One client is shared by every translation thread in a worker. It keeps a
+bounded pool of persistent connections per host, uses separate connect and
+read timeouts, retries 429/5xx and connection failures with jittered
+exponential backoff, and trips a circuit breaker when the backend keeps
+failing so callers fall back to English immediately instead of waiting.
+"""
+
+import os
+import time
+import random
+import socket
+import threading
+import http.client
+import urllib.parse
+from typing import Dict, Optional, Tuple
+
+POOL_SIZE = int(os.environ.get('TRANSLATION_POOL_SIZE', os.environ.get('TRANSLATION_WORKERS', '8')))
+CONNECT_TIMEOUT = float(os.environ.get('TRANSLATION_CONNECT_TIMEOUT', '3'))
+READ_TIMEOUT = float(os.environ.get('TRANSLATION_READ_TIMEOUT', '10'))
+MAX_RETRIES = int(os.environ.get('TRANSLATION_MAX_RETRIES', '2'))
+BACKOFF_BASE = float(os.environ.get('TRANSLATION_BACKOFF_BASE', '0.2'))
+BACKOFF_MAX = float(os.environ.get('TRANSLATION_BACKOFF_MAX', '2'))
+BREAKER_THRESHOLD = int(os.environ.get('TRANSLATION_BREAKER_THRESHOLD', '5'))
+BREAKER_RESET = float(os.environ.get('TRANSLATION_BREAKER_RESET', '30'))
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class TranslationClientError(Exception):
+    """The translation backend could not be reached or kept failing"""
+
+
+class CircuitOpenError(TranslationClientError):
+    """The circuit breaker is open; the call was not attempted"""
+
+
+class CircuitBreaker:
+    """Consecutive-failure breaker: closed -> open -> half-open -> closed"""
+
+    def __init__(self, threshold: int = BREAKER_THRESHOLD, reset_timeout: float = BREAKER_RESET):
+        self.threshold = max(1, threshold)
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self.trial_in_flight = False
+        self.short_circuited = 0
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return 'closed'
+        if time.monotonic() - self.opened_at >= self.reset_timeout:
+            return 'half_open'
+        return 'open'
+
+    def allow(self) -> Optional[str]:
+        """Admit a call: returns its permit ('closed', or 'trial' for the half-open probe), None to short-circuit"""
+        with self._lock:
+            state = self.state
+            if state == 'closed':
+                return 'closed'
+            if state == 'half_open' and not self.trial_in_flight:
+                # Let a single trial request through to probe the backend
+                self.trial_in_flight = True
+                return 'trial'
+            self.short_circuited += 1
+            return None
+
+    def record_success(self, permit: str):
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            if permit == 'trial':
+                self.trial_in_flight = False
+
+    def record_failure(self, permit: str):
+        with self._lock:
+            self.failures += 1
+            # A call admitted before the breaker opened must not end the current trial
+            if permit == 'trial':
+                self.trial_in_flight = False
+            if self.failures >= self.threshold or self.opened_at is not None:
+                if self.opened_at is None:
+                    print(f"🔌 Translation circuit opened after {self.failures} failures")
+                self.opened_at = time.monotonic()
+
+    def release(self, permit: str):
+        """End a call that says nothing about the backend's health"""
+        if permit == 'trial':
+            with self._lock:
+                self.trial_in_flight = False
+
+
+class _HostPool:
+    """Idle keep-alive connections to one host, at most `size` open at once"""
+
+    def __init__(self, scheme: str, host: str, port: Optional[int], size: int):
+        self.scheme = scheme
+        self.host = host
+        self.port = port
+        self.idle = []
+        self.slots = threading.BoundedSemaphore(max(1, size))
+        self.lock = threading.Lock()
+
+    def new_connection(self, connect_timeout: float, read_timeout: float) -> http.client.HTTPConnection:
+        cls = http.client.HTTPSConnection if self.scheme == 'https' else http.client.HTTPConnection
+        conn = cls(self.host, self.port, timeout=connect_timeout)
+        conn.connect()
+        conn.sock.settimeout(read_timeout)
+        return conn
+
+
+class TranslationClient:
+    """Thread-safe HTTP client with per-host connection pooling, retries and a breaker"""
+
+    def __init__(self, pool_size: int = POOL_SIZE, connect_timeout: float = CONNECT_TIMEOUT,
+                 read_timeout: float = READ_TIMEOUT, max_retries: int = MAX_RETRIES,
+                 backoff_base: float = BACKOFF_BASE, backoff_max: float = BACKOFF_MAX,
+                 breaker: Optional[CircuitBreaker] = None):
+        self.pool_size = pool_size
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.breaker = breaker or CircuitBreaker()
+        self._pools: Dict[Tuple[str, str, Optional[int]], _HostPool] = {}
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.retries = 0
+        self.connections_opened = 0
+        self.connections_reused = 0
+
+    def _pool(self, scheme: str, host: str, port: Optional[int]) -> _HostPool:
+        key = (scheme, host, port)
+        with self._lock:
+            pool = self._pools.get(key)
+            if pool is None:
+                pool = self._pools[key] = _HostPool(scheme, host, port, self.pool_size)
+            return pool
+
+    def _send_once(self, pool: _HostPool, method: str, path: str, body: Optional[bytes],
+                   headers: Dict[str, str]) -> Tuple[int, Dict[str, str], bytes]:
+        if not pool.slots.acquire(timeout=self.connect_timeout + self.read_timeout):
+            raise TranslationClientError(f"no free connection to {pool.host}")
+        conn = None
+        try:
+            with pool.lock:
+                conn = pool.idle.pop() if pool.idle else None
+            reused = conn is not None
+            for attempt in range(2):
+                if conn is None:
+                    conn = pool.new_connection(self.connect_timeout, self.read_timeout)
+                    reused = False
+                    with self._lock:
+                        self.connections_opened += 1
+                try:
+                    conn.request(method, path, body=body, headers=headers)
+                    response = conn.getresponse()
+                    data = response.read()
+                    break
+                except (http.client.RemoteDisconnected, BrokenPipeError, ConnectionResetError):
+                    # The server closed an idle keep-alive connection; retry once on a fresh one
+                    conn.close()
+                    conn = None
+                    if not reused or attempt:
+                        raise
+            if reused:
+                with self._lock:
+                    self.connections_reused += 1
+
+            if response.will_close:
+                conn.close()
+            else:
+                with pool.lock:
+                    pool.idle.append(conn)
+            conn = None
+            return response.status, dict(response.getheaders()), data
+        finally:
+            if conn is not None:
+                conn.close()
+            pool.slots.release()
+
+    def _backoff(self, attempt: int, retry_after: Optional[str]) -> float:
+        delay = min(self.backoff_max, self.backoff_base * (2 ** attempt))
+        if retry_after:
+            try:
+                delay = min(self.backoff_max, max(delay, float(retry_after)))
+            except ValueError:
+                pass
+        return delay * random.uniform(0.5, 1.0)
+
+    def request(self, method: str, url: str, body: Optional[bytes] = None,
+                headers: Optional[Dict[str, str]] = None) -> Tuple[int, bytes]:
+        """Send a request, retrying transient failures; returns (status, body)"""
+        permit = self.breaker.allow()
+        if permit is None:
+            raise CircuitOpenError("translation backend circuit is open")
+        try:
+            status, data = self._request_with_retries(method, url, body, headers)
+        except TranslationClientError:
+            self.breaker.record_failure(permit)
+            raise
+        except BaseException:
+            # Not the backend's fault (e.g. a malformed URL), but a trial must not stay in flight
+            self.breaker.release(permit)
+            raise
+        # Retryable statuses and transport errors raised above; any other answer means the backend is up
+        self.breaker.record_success(permit)
+        return status, data
+
+    def _request_with_retries(self, method: str, url: str, body: Optional[bytes],
+                              headers: Optional[Dict[str, str]]) -> Tuple[int, bytes]:
+        parts = urllib.parse.urlsplit(url)
+        pool = self._pool(parts.scheme, parts.hostname, parts.port)
+        path = parts.path + ('?' + parts.query if parts.query else '')
+        headers = dict(headers or {})
+        headers.setdefault('Connection', 'keep-alive')
+        with self._lock:
+            self.requests += 1
+
+        last_error = "no attempt made"
+        for attempt in range(self.max_retries + 1):
+            retry_after = None
+            try:
+                status, response_headers, data = self._send_once(pool, method, path, body, headers)
+                if status not in RETRY_STATUSES:
+                    return status, data
+                last_error = f"HTTP {status}"
+                retry_after = response_headers.get('Retry-After')
+            except (OSError, socket.timeout, http.client.HTTPException, TranslationClientError) as e:
+                last_error = f"{type(e).__name__}: {e}"
+            if attempt < self.max_retries:
+                with self._lock:
+                    self.retries += 1
+                time.sleep(self._backoff(attempt, retry_after))
+
+        raise TranslationClientError(f"{url} failed after {self.max_retries + 1} attempts ({last_error})")
+
+    def post(self, url: str, body: bytes, headers: Optional[Dict[str, str]] = None) -> Tuple[int, bytes]:
+        return self.request('POST', url, body, headers)
+
+    def close(self):
+        """Close every idle pooled connection"""
+        with self._lock:
+            pools = list(self._pools.values())
+            self._pools = {}
+        for pool in pools:
+            with pool.lock:
+                for conn in pool.idle:
+                    conn.close()
+                pool.idle = []
+
+    def stats(self) -> Dict[str, object]:
+        with self._lock:
+            return {
+                'requests': self.requests,
+                'retries': self.retries,
+                'connections_opened': self.connections_opened,
+                'connections_reused': self.connections_reused,
+                'breaker_state': self.breaker.state,
+                'short_circuited': self.breaker.short_circuited,
+            }
+
+
+if __name__ == "__main__":
+    # Breaker regression checks against the local mock translator
+    from mock_translator import start_mock_translator
+
+    server, url = start_mock_translator(fail_status=404)
+    handler = server.RequestHandlerClass
+    client = TranslationClient(max_retries=0, breaker=CircuitBreaker(threshold=2, reset_timeout=0.2))
+    for _ in range(5):
+        assert client.post(url, b'q=hi')[0] == 404
+    assert client.breaker.state == 'closed', "a 4xx answer is not a backend failure"
+
+    handler.fail_status = 503
+    stale = client.breaker.allow()  # a call admitted while closed, still in flight when the breaker opens
+    for _ in range(2):
+        try:
+            client.post(url, b'q=hi')
+        except TranslationClientError:
+            pass
+    assert client.breaker.state == 'open'
+    time.sleep(0.25)
+    trial = client.breaker.allow()
+    assert trial == 'trial' and client.breaker.allow() is None
+    client.breaker.record_failure(stale)
+    assert client.breaker.trial_in_flight and client.breaker.allow() is None, "a stale failure ended the trial"
+    client.breaker.release(trial)
+
+    handler.fail_status = 0
+    time.sleep(0.25)
+    assert client.post(url, b'q=hi')[0] == 200 and client.breaker.state == 'closed'
+    server.shutdown()
+    print("✅ Circuit breaker: 4xx answers pass, only the trial call ends the trial, recovery closes it")
@@ -0,0 +1,321 @@
+"""
+Translation Providers - Pluggable translation engines behind translate_text
+
+A provider turns a list of English segments into one target language,
+returning None for anything it can't translate. Providers are tried as a
+chain: segments one provider leaves untranslated fall through to the next,
+so a local phrase table answers what it knows with no network and only the
+rest goes to the remote endpoint.
+
+    TRANSLATION_PROVIDERS=phrase_table,remote      # default chain
+    TRANSLATION_PROVIDERS_TA=phrase_table          # per-language override (offline Tamil)
+
+Phrase tables live in data/phrase_tables/<lang>.json. They are seeded from
+the pre-translated story artifacts, and hand-reviewed entries are kept when
+they are rebuilt with:
+
+    python translation_providers.py --languages ta hi
+"""
+
+import os
+import re
+import json
+import time
+import threading
+import urllib.parse
+from collections import deque
+from typing import Dict, List, Optional
+
+from metrics import translation_call_duration, translation_errors
+from translation_client import CircuitOpenError, TranslationClient
+
+TRANSLATE_API_URL = os.environ.get('TRANSLATE_API_URL', 'https://translate.googleapis.com/translate_a/single')
+DEFAULT_PROVIDERS = 'phrase_table,remote'
+PHRASE_TABLE_DIR = os.environ.get(
+    'PHRASE_TABLE_DIR',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'phrase_tables')
+)
+LATENCY_WINDOW = 1024  # recent calls kept per provider for percentiles
+
+# Segments are joined with a line holding only this token; translators leave
+# it untouched, so splitting the response on it recovers the segments.
+BATCH_DELIMITER_TOKEN = '|||'
+BATCH_DELIMITER = f"\n{BATCH_DELIMITER_TOKEN}\n"
+
+_SENTENCE_RE = re.compile(r'(?<=[.!?])\s+')
+
+
+class ProviderStats:
+    """Call counts and recent latencies for one provider"""
+
+    def __init__(self, window: int = LATENCY_WINDOW):
+        self.calls = 0
+        self.segments = 0
+        self.translated = 0
+        self.errors = 0
+        self._latencies = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float, segments: int, translated: int, error: bool = False):
+        with self._lock:
+            self.calls += 1
+            self.segments += segments
+            self.translated += translated
+            self.errors += int(error)
+            self._latencies.append(seconds)
+
+    def snapshot(self) -> Dict[str, float]:
+        with self._lock:
+            latencies = sorted(self._latencies)
+            stats = {
+                'calls': self.calls,
+                'segments': self.segments,
+                'translated': self.translated,
+                'errors': self.errors,
+            }
+        if latencies:
+            stats.update({
+                'p50_ms': round(latencies[len(latencies) // 2] * 1000, 2),
+                'p99_ms': round(latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1000, 2),
+                'max_ms': round(latencies[-1] * 1000, 2),
+            })
+        return stats
+
+
+class TranslationProvider:
+    """Base class for translation engines"""
+
+    name = 'provider'
+
+    def supports(self, target_lang: str) -> bool:
+        return True
+
+    def translate(self, segments: List[str], target_lang: str) -> List[Optional[str]]:
+        """Translations in input order, None where this provider has no answer"""
+        raise NotImplementedError
+
+
+class RemoteProvider(TranslationProvider):
+    """The Google Translate (gtx) endpoint, batching segments into one call"""
+
+    name = 'remote'
+
+    def __init__(self, client: Optional[TranslationClient] = None, url: str = TRANSLATE_API_URL):
+        self.client = client or TranslationClient()
+        self.url = url
+
+    def request(self, text: str, target_lang: str) -> Optional[str]:
+        """Make one translation call, returning None on failure"""
+        try:
+            data = urllib.parse.urlencode({'q': text}).encode('utf-8')
+            params = {'client': 'gtx', 'sl': 'en', 'tl': target_lang, 'dt': 't'}
+            url = self.url + '?' + urllib.parse.urlencode(params)
+            status, body = self.client.post(url, data, headers={
+                'User-Agent': 'Mozilla/5.0',
+                'Content-Type': 'application/x-www-form-urlencoded;charset=utf-8'
+            })
+            if status != 200:
+                raise ValueError(f"HTTP {status}")
+            result = json.loads(body.decode('utf-8'))
+            translated = ''.join([s[0] for s in result[0] if s[0]])
+            return translated if translated else None
+        except CircuitOpenError:
+            # Backend is known to be down; fall back to English without logging each segment
+            translation_errors.inc(self.name, 'circuit_open')
+            return None
+        except Exception as e:
+            print(f"Translation error: {e}")
+            translation_errors.inc(self.name, 'request')
+            return None
+
+    def translate(self, segments: List[str], target_lang: str) -> List[Optional[str]]:
+        if len(segments) == 1:
+            return [self.request(segments[0], target_lang)]
+
+        translated = self.request(BATCH_DELIMITER.join(segments), target_lang)
+        if translated is None:
+            return [None] * len(segments)
+        parts = [part.strip() for part in translated.split(BATCH_DELIMITER_TOKEN)]
+        if len(parts) != len(segments) or not all(parts):
+            print(f"⚠️ Batch of {len(segments)} segments could not be split, retrying one by one")
+            translation_errors.inc(self.name, 'unsplittable_batch')
+            return [self.request(segment, target_lang) for segment in segments]
+        return parts
+
+
+def _normalize_phrase(text: str) -> str:
+    return " ".join(text.split())
+
+
+class PhraseTableProvider(TranslationProvider):
+    """Offline lookup in reviewed English -> target phrase tables.
+
+    A segment is translated when it is in the table as a whole, or when
+    every one of its sentences is.
+    """
+
+    name = 'phrase_table'
+
+    def __init__(self, directory: str = PHRASE_TABLE_DIR):
+        self.directory = directory
+        self._tables: Dict[str, Optional[Dict[str, str]]] = {}
+        self._lock = threading.Lock()
+
+    def table_path(self, target_lang: str) -> str:
+        return os.path.join(self.directory, f"{target_lang}.json")
+
+    def table(self, target_lang: str) -> Optional[Dict[str, str]]:
+        with self._lock:
+            if target_lang not in self._tables:
+                try:
+                    with open(self.table_path(target_lang), encoding='utf-8') as f:
+                        entries = json.load(f)['entries']
+                    self._tables[target_lang] = {_normalize_phrase(k): v for k, v in entries.items()}
+                except FileNotFoundError:
+                    self._tables[target_lang] = None
+                except (OSError, ValueError, KeyError) as e:
+                    print(f"⚠️ Unreadable phrase table {self.table_path(target_lang)}: {e}")
+                    self._tables[target_lang] = None
+            return self._tables[target_lang]
+
+    def supports(self, target_lang: str) -> bool:
+        return self.table(target_lang) is not None
+
+    def _lookup(self, table: Dict[str, str], segment: str) -> Optional[str]:
+        phrase = _normalize_phrase(segment)
+        translated = table.get(phrase)
+        if translated is not None:
+            return translated
+        sentences = _SENTENCE_RE.split(phrase)
+        if len(sentences) > 1:
+            parts = [table.get(sentence) for sentence in sentences]
+            if all(part is not None for part in parts):
+                return " ".join(parts)
+        return None
+
+    def translate(self, segments: List[str], target_lang: str) -> List[Optional[str]]:
+        table = self.table(target_lang) or {}
+        return [self._lookup(table, segment) for segment in segments]
+
+
+class ProviderChain:
+    """Tries providers in order, passing untranslated segments down the chain"""
+
+    def __init__(self, providers: Dict[str, TranslationProvider], order: List[str],
+                 language_orders: Optional[Dict[str, List[str]]] = None):
+        self.providers = providers
+        self.order = order
+        self.language_orders = language_orders or {}
+        self._stats = {name: ProviderStats() for name in providers}
+
+    def providers_for(self, target_lang: str) -> List[TranslationProvider]:
+        order = self.language_orders.get(target_lang, self.order)
+        return [self.providers[name] for name in order]
+
+    def translate(self, segments: List[str], target_lang: str) -> List[Optional[str]]:
+        results: List[Optional[str]] = [None] * len(segments)
+        missing = list(range(len(segments)))
+        for provider in self.providers_for(target_lang):
+            if not missing:
+                break
+            if not provider.supports(target_lang):
+                continue
+            started = time.perf_counter()
+            error = False
+            try:
+                translated = provider.translate([segments[i] for i in missing], target_lang)
+            except Exception as e:
+                print(f"⚠️ {provider.name} translation failed: {e}")
+                translation_errors.inc(provider.name, 'exception')
+                translated, error = [None] * len(missing), True
+            remaining = []
+            for index, text in zip(missing, translated):
+                if text:
+                    results[index] = text
+                else:
+                    remaining.append(index)
+            seconds = time.perf_counter() - started
+            self._stats[provider.name].record(seconds, len(missing), len(missing) - len(remaining), error)
+            translation_call_duration.observe(seconds, provider.name)
+            missing = remaining
+        return results
+
+    def stats(self) -> Dict[str, object]:
+        return {
+            'order': self.order,
+            'language_orders': self.language_orders,
+            'providers': {name: stats.snapshot() for name, stats in self._stats.items()},
+        }
+
+
+def _parse_order(value: str, providers: Dict[str, TranslationProvider], setting: str) -> List[str]:
+    order = []
+    for name in (part.strip() for part in value.split(',')):
+        if not name:
+            continue
+        if name not in providers:
+            print(f"⚠️ Unknown translation provider '{name}' in {setting}, skipping")
+        elif name not in order:
+            order.append(name)
+    return order
+
+
+def build_provider_chain(providers: Dict[str, TranslationProvider],
+                         environ: Optional[Dict[str, str]] = None) -> ProviderChain:
+    """Chain the given providers in the order set by TRANSLATION_PROVIDERS[_<LANG>]"""
+    environ = os.environ if environ is None else environ
+    order = _parse_order(environ.get('TRANSLATION_PROVIDERS', DEFAULT_PROVIDERS), providers,
+                         'TRANSLATION_PROVIDERS')
+    language_orders = {}
+    for setting, value in environ.items():
+        if setting.startswith('TRANSLATION_PROVIDERS_'):
+            language = setting[len('TRANSLATION_PROVIDERS_'):].lower()
+            language_orders[language] = _parse_order(value, providers, setting)
+    return ProviderChain(providers, order, language_orders)
+
+
+def export_phrase_table(target_lang: str, directory: str = PHRASE_TABLE_DIR) -> int:
+    """Merge the story artifacts for a language into its phrase table.
+
+    Existing entries are kept as they are, so hand-reviewed corrections
+    survive a rebuild. Returns the number of entries added.
+    """
+    import glob
+    import gzip
+    from artifact_store import ArtifactStore
+
+    path = os.path.join(directory, f"{target_lang}.json")
+    try:
+        with open(path, encoding='utf-8') as f:
+            entries = json.load(f)['entries']
+    except FileNotFoundError:
+        entries = {}
+
+    added = 0
+    pattern = os.path.join(ArtifactStore().directory, f"*.{target_lang}.json.gz")
+    for artifact in sorted(glob.glob(pattern)):
+        with gzip.open(artifact, 'rt', encoding='utf-8') as f:
+            variants = json.load(f)['variants']
+        for translations in variants.values():
+            for english, translated in translations.items():
+                if english not in entries and translated != english:
+                    entries[english] = translated
+                    added += 1
+
+    os.makedirs(directory, exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({'language': target_lang, 'entries': dict(sorted(entries.items()))},
+                  f, ensure_ascii=False, indent=1)
+    return added
+
+
+if __name__ == "__main__":
+    import argparse
+    from artifact_store import SUPPORTED_LANGUAGES
+
+    parser = argparse.ArgumentParser(description="Build phrase tables from the story artifacts")
+    parser.add_argument('--languages', nargs='+', default=[lang for lang in SUPPORTED_LANGUAGES if lang != 'en'])
+    parser.add_argument('--out', default=PHRASE_TABLE_DIR)
+    args = parser.parse_args()
+    for language in args.languages:
+        print(f"✅ {language}: {export_phrase_table(language, args.out)} phrases added")
@@ -0,0 +1,317 @@
+"""
+Translator - Cached, batched translation with concurrent fan-out over pluggable providers
+"""
+
+import os
+import sys
+import time
+import queue
+import threading
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+from metrics import RequestTiming, count_cache_lookups, current_timing, record_span, translation_fallbacks
+from profiler import stack_profiler
+from translation_providers import BATCH_DELIMITER, BATCH_DELIMITER_TOKEN
+
+TRANSLATION_WORKERS = int(os.environ.get('TRANSLATION_WORKERS', '8'))
+TRANSLATION_DEADLINE = float(os.environ.get('TRANSLATION_DEADLINE', '8'))
+TRANSLATION_BATCH_CHARS = int(os.environ.get('TRANSLATION_BATCH_CHARS', '4500'))
+
+# Built on first use, so importing the app (health checks, tools) doesn't open
+# the SQLite cache or construct clients it may never need
+_translation_cache = None
+_translation_client = None
+_provider_chain = None
+_executor: Optional[ThreadPoolExecutor] = None
+_init_lock = threading.Lock()
+
+
+def get_translation_cache():
+    """The process-wide TranslationCache"""
+    global _translation_cache
+    if _translation_cache is None:
+        with _init_lock:
+            if _translation_cache is None:
+                from translation_cache import TranslationCache
+                _translation_cache = TranslationCache()
+    return _translation_cache
+
+
+def get_translation_client():
+    """The process-wide pooled TranslationClient"""
+    global _translation_client
+    if _translation_client is None:
+        with _init_lock:
+            if _translation_client is None:
+                from translation_client import TranslationClient
+                _translation_client = TranslationClient()
+    return _translation_client
+
+
+def get_provider_chain():
+    """The configured translation providers, in fallback order"""
+    global _provider_chain
+    if _provider_chain is None:
+        client = get_translation_client()
+        with _init_lock:
+            if _provider_chain is None:
+                from translation_providers import PhraseTableProvider, RemoteProvider, build_provider_chain
+                _provider_chain = build_provider_chain({
+                    'phrase_table': PhraseTableProvider(),
+                    'remote': RemoteProvider(client),
+                })
+    return _provider_chain
+
+
+def _pool() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        with _init_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(max_workers=TRANSLATION_WORKERS, thread_name_prefix='translate')
+    return _executor
+
+
+def _reset_after_fork():
+    # Threads and SQLite handles don't survive fork(); pre-forked workers get fresh ones
+    global _executor, _init_lock
+    _init_lock = threading.Lock()
+    _executor = None
+    if _translation_cache is not None:
+        _translation_cache.reopen_after_fork()
+    if _translation_client is not None:
+        _translation_client.close()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+def _cancel_queued(executor: ThreadPoolExecutor):
+    """What shutdown(cancel_futures=True) does on 3.9+: cancel work no thread has started"""
+    while True:
+        try:
+            work_item = executor._work_queue.get_nowait()
+        except queue.Empty:
+            return
+        if work_item is not None:
+            work_item.future.cancel()
+
+
+def shutdown():
+    """Stop queued translation work and close the cache (graceful worker exit)"""
+    if _executor is not None:
+        if sys.version_info >= (3, 9):
+            _executor.shutdown(wait=False, cancel_futures=True)
+        else:
+            _cancel_queued(_executor)
+            _executor.shutdown(wait=False)
+    if _translation_client is not None:
+        _translation_client.close()
+    if _translation_cache is not None:
+        _translation_cache.close()
+
+
+class TranslationResult(NamedTuple):
+    texts: List[str]
+    complete: bool  # False when any segment fell back to English
+
+
+def _fetch_batch(segments: List[str], target_lang: str, timing: Optional[RequestTiming] = None,
+                 profile_tag: Optional[str] = None) -> List[Optional[str]]:
+    """Translate segments through the provider chain and cache the results"""
+    started = time.perf_counter()
+    with stack_profiler.tagged(profile_tag):
+        results = get_provider_chain().translate(segments, target_lang)
+    record_span('translate_call', time.perf_counter() - started, timing)
+    cache = get_translation_cache()
+    for segment, result in zip(segments, results):
+        if result is not None:
+            cache.put(segment, target_lang, result)
+    return results
+
+
+def plan_batches(segments: List[str], max_chars: int = TRANSLATION_BATCH_CHARS) -> List[List[str]]:
+    """Pack segments into batches whose joined size stays under max_chars.
+
+    Segments that contain the delimiter token, or are too large to share a
+    call, are sent on their own.
+    """
+    batches: List[List[str]] = []
+    current: List[str] = []
+    size = 0
+    for segment in segments:
+        if BATCH_DELIMITER_TOKEN in segment or len(segment) >= max_chars:
+            batches.append([segment])
+            continue
+        added = len(segment) + (len(BATCH_DELIMITER) if current else 0)
+        if current and size + added > max_chars:
+            batches.append(current)
+            current, size = [], 0
+            added = len(segment)
+        current.append(segment)
+        size += added
+    if current:
+        batches.append(current)
+    return batches
+
+
+def translate_text(text, target_lang):
+    """Translate text through the configured providers"""
+    if target_lang == 'en' or not text:
+        return text
+    cached = get_translation_cache().get(text, target_lang)
+    count_cache_lookups(int(cached is not None), int(cached is None))
+    if cached is not None:
+        return cached
+    translated = _fetch_batch([text], target_lang)[0]
+    if translated is None:
+        translation_fallbacks.inc('untranslated')
+        return text
+    return translated
+
+
+def translate_batch(segments: List[str], target_lang: str) -> List[str]:
+    """Translate a list of segments with as few outbound calls as possible"""
+    return translate_many(segments, target_lang, deadline=None).texts
+
+
+class _TranslationRun:
+    """Cache lookups and in-flight batches for one request.
+
+    Texts can be submitted and collected in groups; a text shared by several
+    groups is only translated once, and every group shares one deadline.
+    """
+
+    def __init__(self, target_lang: str, deadline: Optional[float]):
+        self.target_lang = target_lang
+        self.ends_at = None if deadline is None else time.monotonic() + deadline
+        self.translated: Dict[str, str] = {}
+        self.inflight: Dict[str, Future] = {}
+        self.batches: Dict[Future, List[str]] = {}
+        self.late: set = set()  # segments whose batch missed the deadline, whichever group collects them
+        # Batches run on pool threads, outside the request's context and thread
+        self.timing = current_timing()
+        self.profile_tag = stack_profiler.request_tag()
+
+    def submit(self, texts: List[str]):
+        pending: Dict[str, None] = {}  # ordered set of cache misses
+        hits = 0
+        cache = get_translation_cache()
+        for text in texts:
+            if not text or text in self.translated or text in self.inflight or text in pending:
+                continue
+            cached = cache.get(text, self.target_lang)
+            if cached is not None:
+                self.translated[text] = cached
+                hits += 1
+            else:
+                pending[text] = None
+        count_cache_lookups(hits, len(pending), self.timing)
+        for batch in plan_batches(list(pending)):
+            future = _pool().submit(_fetch_batch, batch, self.target_lang, self.timing, self.profile_tag)
+            self.batches[future] = batch
+            for segment in batch:
+                self.inflight[segment] = future
+
+    def waiting_on(self, texts: List[str]) -> set:
+        """Unfinished futures the given texts still depend on"""
+        return {self.inflight[text] for text in texts if text in self.inflight and not self.inflight[text].done()}
+
+    def collect(self, texts: List[str]) -> TranslationResult:
+        futures = {self.inflight[text] for text in texts if text in self.inflight}
+        if futures:
+            timeout = None if self.ends_at is None else max(0.0, self.ends_at - time.monotonic())
+            done, not_done = wait(futures, timeout=timeout)
+            for future in not_done:
+                future.cancel()
+                self.late.update(self.batches[future])
+            for future in futures:
+                batch = self.batches.pop(future)
+                for segment in batch:
+                    del self.inflight[segment]
+                if future in done:
+                    for segment, result in zip(batch, future.result()):
+                        if result is not None:
+                            self.translated[segment] = result
+            if not_done:
+                print(f"⏱️ Translation deadline hit: {len(not_done)} batches left in English")
+        missing = [text for text in texts if text and text not in self.translated]
+        if missing:
+            deadline_missed = sum(1 for text in missing if text in self.late)
+            if deadline_missed:
+                translation_fallbacks.inc('deadline', amount=deadline_missed)
+            if len(missing) > deadline_missed:
+                translation_fallbacks.inc('untranslated', amount=len(missing) - deadline_missed)
+        complete = not missing
+        return TranslationResult([self.translated.get(text, text) for text in texts], complete)
+
+
+def translate_many(texts: List[str], target_lang: str,
+                   deadline: Optional[float] = TRANSLATION_DEADLINE) -> TranslationResult:
+    """Translate texts concurrently, returning them in input order.
+
+    Cache misses are packed into batches and fanned out over the shared
+    bounded pool. Anything not translated within `deadline` seconds is
+    returned in English so a slow backend never stalls the request.
+    """
+    if target_lang == 'en':
+        return TranslationResult(list(texts), True)
+    run = _TranslationRun(target_lang, deadline)
+    run.submit(texts)
+    return run.collect(texts)
+
+
+def translate_groups(groups: List[List[str]], target_lang: str,
+                     deadline: Optional[float] = TRANSLATION_DEADLINE) -> Iterator[TranslationResult]:
+    """Translate groups of texts, yielding each group's result in order as soon as it is ready.
+
+    Every group is submitted up front as its own batches, so the first group
+    comes back after roughly one call instead of waiting for the whole set.
+    """
+    if target_lang == 'en':
+        for group in groups:
+            yield TranslationResult(list(group), True)
+        return
+    run = _TranslationRun(target_lang, deadline)
+    for group in groups:
+        run.submit(group)
+    for group in groups:
+        yield run.collect(group)
+
+
+def translate_jobs(jobs: List[Tuple[List[str], str]],
+                   deadline: Optional[float] = TRANSLATION_DEADLINE) -> Iterator[Tuple[int, TranslationResult]]:
+    """Translate several (texts, language) jobs, yielding (job index, result) as each one completes.
+
+    Jobs in the same language share one run: their cache misses are
+    deduplicated and packed into common batches, so many small stories cost
+    about as many calls as one large one.
+    """
+    by_language: Dict[str, List[str]] = {}
+    for texts, target_lang in jobs:
+        if target_lang != 'en':
+            by_language.setdefault(target_lang, []).extend(texts)
+    runs: Dict[str, _TranslationRun] = {}
+    for target_lang, texts in by_language.items():
+        runs[target_lang] = _TranslationRun(target_lang, deadline)
+        runs[target_lang].submit(texts)
+
+    remaining = dict(enumerate(jobs))
+    while remaining:
+        ready = [i for i, (texts, target_lang) in remaining.items()
+                 if target_lang == 'en' or not runs[target_lang].waiting_on(texts)]
+        if not ready:
+            futures = set().union(*(runs[lang].waiting_on(texts) for texts, lang in remaining.values()))
+            ends_at = min((run.ends_at for run in runs.values() if run.ends_at is not None), default=None)
+            timeout = None if ends_at is None else max(0.0, ends_at - time.monotonic())
+            done, _ = wait(futures, timeout=timeout, return_when=FIRST_COMPLETED)
+            if not done:
+                ready = list(remaining)  # deadline hit: collect() falls back to English
+        for i in ready:
+            texts, target_lang = remaining.pop(i)
+            if target_lang == 'en':
+                yield i, TranslationResult(list(texts), True)
+            else:
+                yield i, runs[target_lang].collect(texts)
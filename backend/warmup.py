@@ -0,0 +1,145 @@
+"""
+Warm-up - Startup work done before a worker takes traffic
+
+The first request a cold worker serves pays for loading the knowledge
+base, building keyword indexes, reading translations back from disk and
+rendering the story. Warm-up steps do that work up front:
+
+    warmup = Warmup()
+
+    @warmup.step('translation_cache')
+    def load_translations():
+        return translation_cache.preload()
+
+serve.py runs them in the gunicorn master before the workers fork, so
+every worker starts warm and shares the result copy-on-write. /api/ready
+answers 503 until they have finished (and stays 503 if nothing ran them),
+unlike /api/health, which only says the process is up.
+
+Popular stories default to the keywords offered on the frontend page, in
+page order, requested the way the page does (kids, English, 2 eager pages).
+"""
+
+import os
+import re
+import time
+import threading
+from typing import Callable, Dict, List, NamedTuple, Optional
+
+WARMUP_ENABLED = os.environ.get('WARMUP_ENABLED', '1') != '0'
+WARMUP_STORIES = int(os.environ.get('WARMUP_STORIES', '40'))
+WARMUP_KEYWORDS = os.environ.get('WARMUP_KEYWORDS', '')  # comma separated, most popular first
+WARMUP_AGE_GROUPS = os.environ.get('WARMUP_AGE_GROUPS', 'kids')
+WARMUP_LANGUAGES = os.environ.get('WARMUP_LANGUAGES', 'en')
+WARMUP_EAGER_PAGES = int(os.environ.get('WARMUP_EAGER_PAGES', '2'))
+
+FRONTEND_PAGE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'frontend', 'index.html')
+
+_KEYWORD_CHIP_RE = re.compile(r'data-keyword="([^"]+)"')
+
+
+class WarmupRequest(NamedTuple):
+    keywords: List[str]
+    age_group: str
+    language: str
+    eager_pages: Optional[int]
+
+
+def _split(value: str) -> List[str]:
+    return [item.strip() for item in value.split(',') if item.strip()]
+
+
+def popular_keywords(limit: int = WARMUP_STORIES, page: str = FRONTEND_PAGE) -> List[str]:
+    """WARMUP_KEYWORDS, or else the keywords offered on the frontend page"""
+    keywords = _split(WARMUP_KEYWORDS)
+    if not keywords:
+        try:
+            with open(page, encoding='utf-8') as f:
+                keywords = _KEYWORD_CHIP_RE.findall(f.read())
+        except OSError:
+            keywords = []
+    return list(dict.fromkeys(keywords))[:max(0, limit)]
+
+
+def popular_requests(limit: int = WARMUP_STORIES) -> List[WarmupRequest]:
+    """Story requests to pre-render: each popular keyword in every warm-up age group and language"""
+    return [
+        WarmupRequest([keyword], age_group, language, WARMUP_EAGER_PAGES)
+        for keyword in popular_keywords(limit)
+        for age_group in _split(WARMUP_AGE_GROUPS)
+        for language in _split(WARMUP_LANGUAGES)
+    ]
+
+
+class Warmup:
+    """Named startup steps, run once in order; ready when all of them have finished.
+
+    A failing step is logged and skipped: it only leaves the first requests
+    slower, so it doesn't keep the worker out of rotation.
+    """
+
+    def __init__(self, enabled: bool = WARMUP_ENABLED):
+        self.enabled = enabled
+        self._steps: List[tuple] = []
+        self._done = threading.Event()
+        self._lock = threading.Lock()
+        self.running = False
+        self.results: Dict[str, object] = {}
+        self.timings: Dict[str, float] = {}
+        self.errors: Dict[str, str] = {}
+        self.seconds: Optional[float] = None
+
+    def step(self, name: str):
+        """Register fn as a warm-up step; its return value is reported in status()"""
+        def register(fn: Callable[[], object]):
+            self._steps.append((name, fn))
+            return fn
+        return register
+
+    @property
+    def ready(self) -> bool:
+        return self._done.is_set()
+
+    def run(self):
+        """Run every step (once per process; later calls return straight away)"""
+        with self._lock:
+            if self.running or self.ready:
+                return
+            self.running = True
+        started = time.perf_counter()
+        try:
+            for name, fn in self._steps if self.enabled else ():
+                step_started = time.perf_counter()
+                try:
+                    self.results[name] = fn()
+                except Exception as e:
+                    self.errors[name] = str(e)
+                    print(f"⚠️ Warm-up step {name} failed: {e}")
+                self.timings[name] = round(time.perf_counter() - step_started, 3)
+        finally:
+            self.seconds = round(time.perf_counter() - started, 3)
+            self.running = False
+            self._done.set()
+        if self.enabled:
+            print(f"🔥 Warm-up done in {self.seconds:.2f}s: "
+                  + ', '.join(f"{name} {seconds:.2f}s" for name, seconds in self.timings.items()))
+
+    def run_in_background(self) -> threading.Thread:
+        """Warm up without holding up the server start; /api/ready reports when done"""
+        thread = threading.Thread(target=self.run, name='warmup', daemon=True)
+        thread.start()
+        return thread
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        return self._done.wait(timeout)
+
+    def status(self) -> dict:
+        return {
+            'ready': self.ready,
+            'running': self.running,
+            'enabled': self.enabled,
+            'seconds': self.seconds,
+            'steps': {name: {'seconds': self.timings.get(name), 'result': self.results.get(name),
+                             'error': self.errors.get(name)}
+                      for name, _ in self._steps},
+        }
@@ -0,0 +1,112 @@
+"""
+End-to-end load test of /api/generate-story against the mock translator
+
+    python benchmarks/bench_e2e.py --concurrency 16 --latency 0.1
+
+Serves the app on a local threaded server and sends requests from
+`concurrency` client threads. The translator is the local mock with
+`latency` seconds injected per call, the translation cache is in memory and
+the artifact store is empty, so translations really go out.
+
+Two phases are reported: "cold" requests each distinct story once
+(generation plus translation fan-out), "warm" repeats them (response cache).
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import logging
+import tempfile
+import argparse
+import threading
+import urllib.parse
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+# Configure the app before it is imported
+os.environ['TRANSLATION_CACHE_PATH'] = ''
+os.environ['STORY_ARTIFACT_DIR'] = tempfile.mkdtemp(prefix='bench-artifacts-')
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'backend'))
+
+KEYWORDS = ["Raja Raja Chola", "Kattabomman", "Murugan", "Pongal", "Thiruvalluvar",
+            "Meenakshi Temple", "Silappatikaram", "Kabaddi", "Bharatanatyam", "Karikala Chola"]
+AGE_GROUPS = ["kids", "adults"]
+LANGUAGES = ["ta", "hi", "te"]
+
+
+def percentile(sorted_values, fraction):
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * fraction))]
+
+
+def load(base_url, queries, concurrency):
+    """Send every query, returning latency stats for the phase"""
+    latencies = []
+    errors = 0
+    lock = threading.Lock()
+
+    def send(query):
+        nonlocal errors
+        started = time.perf_counter()
+        try:
+            with urllib.request.urlopen(f"{base_url}/api/generate-story?{query}", timeout=60) as response:
+                response.read()
+        except Exception:
+            with lock:
+                errors += 1
+            return
+        with lock:
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(send, queries))
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    stats = {'requests': len(queries), 'errors': errors, 'seconds': round(elapsed, 3),
+             'requests_per_second': round(len(queries) / elapsed, 1)}
+    if latencies:
+        stats.update({
+            'p50_ms': round(percentile(latencies, 0.50) * 1000, 2),
+            'p95_ms': round(percentile(latencies, 0.95) * 1000, 2),
+            'p99_ms': round(percentile(latencies, 0.99) * 1000, 2),
+        })
+    return stats
+
+
+def run(concurrency: int = 16, latency: float = 0.05, warm_requests: int = 600, seed: int = 7):
+    from werkzeug.serving import make_server
+    from mock_translator import MockTranslatorHandler, start_mock_translator
+    import app as story_app
+
+    translator_server, translator_url = start_mock_translator(latency=latency)
+    story_app.get_provider_chain().providers['remote'].url = translator_url
+    logging.getLogger('werkzeug').setLevel(logging.ERROR)  # no access log line per request
+    server = make_server('127.0.0.1', 0, story_app.app, threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_port}"
+
+    distinct = [
+        urllib.parse.urlencode({'keywords': keyword, 'age_group': age_group, 'language': language})
+        for keyword in KEYWORDS for age_group in AGE_GROUPS for language in LANGUAGES
+    ]
+    try:
+        calls_before = MockTranslatorHandler.request_count
+        cold = load(base_url, distinct, concurrency)
+        cold['translation_calls'] = MockTranslatorHandler.request_count - calls_before
+        warm = load(base_url, random.Random(seed).choices(distinct, k=warm_requests), concurrency)
+    finally:
+        server.shutdown()
+        translator_server.shutdown()
+    return {'concurrency': concurrency, 'translator_latency_ms': latency * 1000, 'cold': cold, 'warm': warm}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load test /api/generate-story")
+    parser.add_argument('--concurrency', type=int, default=16)
+    parser.add_argument('--latency', type=float, default=0.05, help="seconds injected per translation call")
+    parser.add_argument('--requests', type=int, default=600, help="requests in the warm phase")
+    args = parser.parse_args()
+    print(json.dumps(run(args.concurrency, args.latency, args.requests), indent=2))
@@ -0,0 +1,167 @@
+"""
+Memory footprint of the knowledge base and of template story generation
+
+    python benchmarks/bench_memory.py
+
+Uses tracemalloc to report the memory retained by a fully materialized
+catalogue, and the memory allocated while serving a burst of template
+story requests.
+
+The worker figures fork pre-forked workers the way serve.py does over a
+synthetic catalogue and translation snapshot of each size in
+WORKER_CATALOGUE_SIZES. Every worker looks up every entity and every
+translation, then reports how much its private, dirty memory grew (from
+/proc/self/smaps_rollup, so Linux only): pages it owns rather than shares.
+The same is measured for the catalogue parsed into a dict in each worker,
+for comparison. With the tables, what a worker owns is its bounded cache
+of parsed records (CATALOGUE_CACHE_SIZE), whatever the catalogue size.
+"""
+
+import os
+import sys
+import json
+import gc
+import shutil
+import tempfile
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'backend'))
+
+REQUESTS = 1000
+WORKERS = 4
+WORKER_CATALOGUE_SIZES = (5000, 20000)
+SMAPS_ROLLUP = '/proc/self/smaps_rollup'
+
+
+def measure(fn):
+    """(retained bytes, peak bytes) allocated by fn, keeping its result alive"""
+    gc.collect()
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    before = tracemalloc.get_traced_memory()[0]
+    result = fn()
+    gc.collect()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, current - before, peak - before
+
+
+def materialize_catalogue():
+    from knowledge_base import TAMIL_HISTORICAL_ENTITIES, TAMIL_PLACES
+    from story_generator import STORY_TEMPLATES
+    return [list(TAMIL_HISTORICAL_ENTITIES.values()), list(TAMIL_PLACES.values()), list(STORY_TEMPLATES.values())]
+
+
+def serve_template_stories():
+    from story_generator import TamilStoryGenerator
+    generator = TamilStoryGenerator()
+    keywords = ["Raja Raja Chola", "Kattabomman", "Murugan"]
+    age_groups = ["kids", "adults", "all"]
+    return [
+        generator.generate_tamil_story([keywords[i % 3]], age_groups[(i // 3) % 3])
+        for i in range(REQUESTS)
+    ]
+
+
+def private_dirty_bytes() -> int:
+    with open(SMAPS_ROLLUP) as f:
+        for line in f:
+            if line.startswith('Private_Dirty:'):
+                return int(line.split()[1]) * 1024
+    return 0
+
+
+def synthetic_text(i: int) -> str:
+    return f"Sentence {i} of a story about the temples of Thanjavur."
+
+
+def write_synthetic_data(directory: str, size: int):
+    """size entities cloned from the real ones, their tables, and a translation snapshot of size texts"""
+    import catalogue
+    from string_table import write_table
+    from translation_cache import text_hash
+    entities = [json.loads(line) for line in catalogue.scan_records(
+        os.path.join(catalogue.DATA_DIR, catalogue.CATALOGUE_FILES['entities'])).values()]
+    with open(os.path.join(directory, catalogue.CATALOGUE_FILES['entities']), 'w', encoding='utf-8') as f:
+        for i in range(size):
+            record = dict(entities[i % len(entities)], key=f"entity_{i}")
+            f.write(json.dumps(record, ensure_ascii=False) + '\n')
+    for name in ('places', 'templates'):
+        shutil.copy(os.path.join(catalogue.DATA_DIR, catalogue.CATALOGUE_FILES[name]), directory)
+    catalogue.build_tables(directory)
+
+    write_table(os.path.join(directory, 'translations.table'),
+                ((f"ta:{text_hash(synthetic_text(i))}", f"கதை வாக்கியம் {i}".encode('utf-8')) for i in range(size)))
+
+
+def worker_private_bytes(touch) -> int:
+    """Median private dirty growth of WORKERS forked processes each running touch() (and keeping its result)"""
+    gc.collect()
+    gc.freeze()
+    children = []
+    for _ in range(WORKERS):
+        read_fd, write_fd = os.pipe()
+        pid = os.fork()
+        if pid == 0:
+            os.close(read_fd)
+            before = private_dirty_bytes()
+            kept = touch()  # noqa: F841  (held until measured)
+            os.write(write_fd, str(private_dirty_bytes() - before).encode())
+            os._exit(0)
+        os.close(write_fd)
+        children.append((pid, read_fd))
+    grown = []
+    for pid, read_fd in children:
+        with os.fdopen(read_fd) as f:
+            grown.append(int(f.read()))
+        os.waitpid(pid, 0)
+    gc.unfreeze()
+    return sorted(grown)[len(grown) // 2]
+
+
+def measure_workers(size: int) -> dict:
+    from catalogue import LazyCatalogue
+    from translation_cache import TranslationCache
+    directory = tempfile.mkdtemp(prefix='bench_memory_')
+    try:
+        write_synthetic_data(directory, size)
+        entities = LazyCatalogue('entities', data_dir=directory)
+        translations = TranslationCache(path=None, snapshot_path=os.path.join(directory, 'translations.table'))
+        len(entities)  # mapped in the "master", as warm-up does
+
+        def use_tables():
+            for key in entities:
+                entities[key]
+            for i in range(size):
+                translations.get(synthetic_text(i), 'ta')
+
+        def use_dict():
+            records = {key: json.loads(line) for key, line in entities._raw().items()}
+            return records
+
+        return {
+            f'worker_tables_x{size}_private_bytes': worker_private_bytes(use_tables),
+            f'worker_dict_x{size}_private_bytes': worker_private_bytes(use_dict),
+        }
+    finally:
+        shutil.rmtree(directory)
+
+
+def run():
+    import story_generator  # noqa: F401  (module import itself is not measured)
+    _, catalogue_retained, catalogue_peak = measure(materialize_catalogue)
+    _, stories_retained, stories_peak = measure(serve_template_stories)
+    results = {
+        'catalogue_retained_bytes': catalogue_retained,
+        'catalogue_peak_bytes': catalogue_peak,
+        f'template_stories_x{REQUESTS}_retained_bytes': stories_retained,
+        f'template_stories_x{REQUESTS}_peak_bytes': stories_peak,
+    }
+    if hasattr(os, 'fork') and os.path.exists(SMAPS_ROLLUP):
+        for size in WORKER_CATALOGUE_SIZES:
+            results.update(measure_workers(size))
+    return results
+
+
+if __name__ == "__main__":
+    print(json.dumps(run(), indent=2))
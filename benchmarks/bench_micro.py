@@ -0,0 +1,95 @@
+"""
+Micro benchmarks for the story generation hot paths
+
+    python benchmarks/bench_micro.py
+
+Times single calls of generate_tamil_story (template and default stories),
+detect_tamil_keywords, get_story_images, serializing a full story
+response and the cost of one metrics span. Memoized functions are timed both on repeated input ("cached")
+and on input they haven't seen ("uncached"). Results are median
+microseconds per call.
+"""
+
+import os
+import sys
+import json
+import time
+import itertools
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'backend'))
+
+REPEAT = 5
+MIN_SECONDS = 0.1  # each timed run lasts at least this long
+
+TEMPLATE_KEYWORDS = ["Raja Raja Chola", "Kattabomman", "Murugan"]
+# No template and no knowledge-base entity: these take the default story path, not a synthesized one
+DEFAULT_KEYWORDS = ["Pongal", "Jallikattu", "Meenakshi Temple", "Silappatikaram", "Kabaddi"]
+AGE_GROUPS = ["kids", "adults", "all"]
+
+
+def _timed(fn, number: int) -> float:
+    started = time.perf_counter()
+    for _ in range(number):
+        fn()
+    return time.perf_counter() - started
+
+
+def time_per_call(fn, repeat: int = REPEAT, min_seconds: float = MIN_SECONDS) -> float:
+    """Median microseconds per call of fn() over `repeat` runs of at least min_seconds"""
+    number = 1
+    while _timed(fn, number) < min_seconds:
+        number *= 2
+    timings = sorted(_timed(fn, number) / number for _ in range(repeat))
+    return round(timings[len(timings) // 2] * 1e6, 3)
+
+
+def cycling(fn, *choices):
+    """fn called with the next combination of choices on every call"""
+    combos = itertools.cycle(list(itertools.product(*choices)))
+    return lambda: fn(*next(combos))
+
+
+def fresh(fn, words, *rest):
+    """fn called with a keyword it has never seen, so memoization can't help"""
+    counter = itertools.count()
+    words = itertools.cycle(words)
+    return lambda: fn(f"{next(words)} {next(counter)}", *rest)
+
+
+def run():
+    from story_generator import TamilStoryGenerator, get_story_images
+    from knowledge_base import detect_tamil_keywords
+    generator = TamilStoryGenerator()
+
+    results = {
+        'generate_template_story_us': time_per_call(
+            cycling(lambda kw, age: generator.generate_tamil_story([kw], age), TEMPLATE_KEYWORDS, AGE_GROUPS)),
+        'generate_default_story_us': time_per_call(
+            cycling(lambda kw, age: generator.generate_tamil_story([kw], age), DEFAULT_KEYWORDS, AGE_GROUPS)),
+        'detect_tamil_keywords_cached_us': time_per_call(
+            cycling(lambda kw: detect_tamil_keywords([kw]), TEMPLATE_KEYWORDS + DEFAULT_KEYWORDS)),
+        'detect_tamil_keywords_uncached_us': time_per_call(
+            fresh(lambda kw: detect_tamil_keywords([kw]), TEMPLATE_KEYWORDS + DEFAULT_KEYWORDS)),
+        'get_story_images_cached_us': time_per_call(
+            cycling(get_story_images, TEMPLATE_KEYWORDS + DEFAULT_KEYWORDS, AGE_GROUPS)),
+        'get_story_images_uncached_us': time_per_call(
+            fresh(get_story_images, TEMPLATE_KEYWORDS + DEFAULT_KEYWORDS, "kids")),
+    }
+
+    from metrics import span
+
+    def timed_span():
+        with span('bench'):
+            pass
+    results['metrics_span_us'] = time_per_call(timed_span)
+
+    from flask import jsonify
+    from app import app, build_story_dict
+    story_dict, _ = build_story_dict(generator.generate_tamil_story(["Pongal"], "adults"), 'en')
+    with app.test_request_context():
+        results['jsonify_story_us'] = time_per_call(lambda: jsonify({'success': True, 'story': story_dict}))
+    return results
+
+
+if __name__ == "__main__":
+    print(json.dumps(run(), indent=2))
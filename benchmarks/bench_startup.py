@@ -0,0 +1,113 @@
+"""
+Cold-start time of the backend entry points, and an import-time report
+
+    python benchmarks/bench_startup.py                 # median cold-start times, as JSON
+    python benchmarks/bench_startup.py --report app    # where `import app` spends its time
+
+Each scenario runs in a fresh interpreter so nothing is cached between
+runs: importing the app (what a health-check or test worker pays), importing
+the story generator (CLI tools), answering /api/health, and generating the
+first story. python_ms is the bare interpreter start for reference.
+
+The report runs `python -X importtime -c "import <module>"` and lists the
+modules with the most self time, first-party ones (backend/) marked with *,
+followed by totals per top-level package.
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import subprocess
+from typing import Dict, List, NamedTuple
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+BACKEND_DIR = os.path.join(os.path.dirname(BENCH_DIR), 'backend')
+
+RUNS = int(os.environ.get('STARTUP_RUNS', '7'))
+
+SCENARIOS = {
+    'python_ms': "pass",
+    'import_story_generator_ms': "import story_generator",
+    'import_app_ms': "import app",
+    'health_check_ms': "from app import app; app.test_client().get('/api/health')",
+    'first_story_ms': "from app import app; app.test_client().post('/api/generate-story', "
+                      "json={'keywords': ['Kundavai'], 'age_group': 'kids', 'language': 'en'})",
+}
+
+
+class ImportTime(NamedTuple):
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+def _python(code: str, *flags: str) -> subprocess.CompletedProcess:
+    # Bytecode is written and reused, as on a deployed server, whatever the calling shell sets
+    env = {key: value for key, value in os.environ.items() if key != 'PYTHONDONTWRITEBYTECODE'}
+    return subprocess.run(
+        [sys.executable, *flags, '-c', code], cwd=BACKEND_DIR, env=env, check=True, capture_output=True, text=True,
+    )
+
+
+def cold_start_ms(code: str, runs: int = RUNS) -> float:
+    """Median wall time of running code in a new interpreter (after one run that writes any stale .pyc)"""
+    _python(code)
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        _python(code)
+        timings.append(time.perf_counter() - started)
+    return round(sorted(timings)[len(timings) // 2] * 1000, 1)
+
+
+def import_times(module: str) -> List[ImportTime]:
+    """Parsed `-X importtime` output for importing module"""
+    _python(f"import {module}")
+    entries = []
+    for line in _python(f"import {module}", '-X', 'importtime').stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        entries.append(ImportTime(name.strip(), int(self_us), int(cumulative_us),
+                                  (len(name) - len(name.lstrip())) // 2))
+    return entries
+
+
+def first_party(module: str) -> bool:
+    return os.path.exists(os.path.join(BACKEND_DIR, module.split('.')[0] + '.py'))
+
+
+def report(module: str, top: int = 25):
+    entries = import_times(module)
+    total = next((entry.cumulative_us for entry in entries if entry.module == module), 0)
+    print(f"import {module}: {total / 1000:.1f} ms ({len(entries)} modules; * = backend/)\n")
+    print(f"{'self ms':>8} {'cumul ms':>9}  module")
+    for entry in sorted(entries, key=lambda entry: entry.self_us, reverse=True)[:top]:
+        mark = '*' if first_party(entry.module) else ' '
+        print(f"{entry.self_us / 1000:8.2f} {entry.cumulative_us / 1000:9.2f} {mark}{entry.module}")
+
+    packages: Dict[str, int] = {}
+    for entry in entries:
+        package = entry.module.split('.')[0]
+        packages[package] = packages.get(package, 0) + entry.self_us
+    print(f"\n{'self ms':>8}  package")
+    for package, self_us in sorted(packages.items(), key=lambda item: item[1], reverse=True)[:top]:
+        print(f"{self_us / 1000:8.2f} {'*' if first_party(package) else ' '}{package}")
+
+
+def run() -> Dict[str, float]:
+    return {name: cold_start_ms(code) for name, code in SCENARIOS.items()}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Backend cold-start benchmark and import-time report")
+    parser.add_argument('--report', metavar='MODULE', help="print the import-time breakdown of a module instead")
+    parser.add_argument('--top', type=int, default=25)
+    args = parser.parse_args()
+    if args.report:
+        report(args.report, args.top)
+    else:
+        print(json.dumps(run(), indent=2))
@@ -0,0 +1,161 @@
+"""
+Compiled story templates vs the f-string story builder
+
+    python benchmarks/bench_templates.py
+
+Times a default story (no hand-written template) built the way
+story_generator used to, rebuilding every page from f-strings per call,
+against the compiled skeletons that only join fragments with the keyword
+(for a keyword seen for the first time, and repeated, when the rendered
+pages are reused), plus the page text alone via f-string, str.format and
+a compiled template. Both builders are checked to produce the same story first.
+Also times synthesizing a story from a knowledge base entity, one cold and
+from the cache, and the whole entity x age group matrix from cold.
+Results are median microseconds per call.
+"""
+
+import os
+import sys
+import json
+import itertools
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, BENCH_DIR)
+sys.path.insert(0, os.path.join(os.path.dirname(BENCH_DIR), 'backend'))
+
+from bench_micro import fresh, time_per_call
+from story_generator import (
+    CULTURAL_ELEMENTS, DEFAULT_STORY_IMAGES, DEFAULT_STORY_PAGES, StoryPage, TamilStoryData, TamilStoryGenerator
+)
+from template_engine import compile_template
+from story_synthesis import prerender_all, synthesize_story
+from knowledge_base import TAMIL_HISTORICAL_ENTITIES
+
+KEYWORDS = ["Pongal", "Jallikattu", "Meenakshi Temple", "Silappatikaram", "Kabaddi"]
+AGE_GROUPS = ["kids", "adults"]
+
+
+def fstring_default_story(keyword: str, age_group: str) -> TamilStoryData:
+    """The previous _generate_default_story, kept as the baseline"""
+    # Theme-based images for default stories
+    theme_images = [
+        DEFAULT_STORY_IMAGES["introduction"],  # Page 1
+        DEFAULT_STORY_IMAGES["learning"],      # Page 2
+        DEFAULT_STORY_IMAGES["challenge"],     # Page 3
+        DEFAULT_STORY_IMAGES["journey"],       # Page 4
+        DEFAULT_STORY_IMAGES["solution"],      # Page 5
+        DEFAULT_STORY_IMAGES["success"],       # Page 6
+        DEFAULT_STORY_IMAGES["celebration"],   # Page 7
+        DEFAULT_STORY_IMAGES["legacy"],        # Page 8
+    ]
+
+    if age_group == "kids":
+        pages_data = [
+            {"title": "The Beginning", "content": f"Long ago in the ancient land of Tamil Nadu, there lived a remarkable figure known as {keyword}. The land was blessed with fertile fields, magnificent temples, and wise people who valued knowledge and culture above all else. Our story begins in this golden age, when great deeds were done and legends were born. The people spoke of {keyword} with great respect and admiration."},
+            {"title": "Early Days", "content": f"From an early age, {keyword} showed signs of greatness. While other children played, {keyword} would sit and listen to the elders tell stories of ancient heroes and wise sages. There was a special light in {keyword}'s eyes - a determination to do something meaningful for the people. The teachers noticed this and gave special attention to nurturing these qualities."},
+            {"title": "The Challenge", "content": f"One day, a great challenge arose that threatened the peace and happiness of the people. Many were afraid and didn't know what to do. But {keyword} stepped forward with courage and said, 'Do not worry, I will find a way to help us all.' The people were amazed at such bravery and began to hope again."},
+            {"title": "The Journey", "content": f"{keyword} embarked on a difficult journey, facing many obstacles along the way. There were moments of doubt and difficulty, but {keyword} never gave up. With each challenge overcome, {keyword} grew stronger and wiser. The journey taught valuable lessons about perseverance, kindness, and the importance of helping others."},
+            {"title": "Finding the Solution", "content": f"After much effort and thought, {keyword} discovered the solution to the great challenge. It required bringing people together, combining their strengths, and working as one united community. {keyword} traveled from village to village, inspiring people to join the cause and contribute their unique talents."},
+            {"title": "Victory and Celebration", "content": f"Through the combined efforts of everyone, guided by {keyword}'s wisdom and leadership, the challenge was overcome! The people celebrated with great joy. There was music, dancing, and feasting that lasted for many days. Everyone thanked {keyword} for bringing them together and showing them what they could achieve."},
+            {"title": "The Teachings", "content": f"{keyword} gathered the people and shared important teachings: 'Remember, our strength lies in our unity. When we help each other, no challenge is too great. Always be kind, always be brave, and never forget the wisdom of our ancestors.' These words were remembered and passed down through generations."},
+            {"title": "The Legacy", "content": f"The story of {keyword} is still told today, inspiring children and adults alike. Temples and monuments stand as reminders of this great figure. Every year, people gather to celebrate and remember the lessons learned. {keyword}'s legacy teaches us that with courage, wisdom, and unity, we can overcome any obstacle and create a better world for everyone."}
+        ]
+    else:
+        pages_data = [
+            {"title": "Historical Context", "content": f"The story of {keyword} unfolds against the rich tapestry of Tamil civilization, one of the oldest continuous cultures in the world. Tamil Nadu, with its ancient temples, classical literature, and sophisticated administrative systems, provided the backdrop for remarkable achievements in art, architecture, science, and governance. It was in this environment of cultural excellence that {keyword} emerged as a significant figure, contributing to the legacy that continues to inspire millions today."},
+            {"title": "Origins and Background", "content": f"The origins of {keyword} are rooted in the complex social and political landscape of ancient Tamil Nadu. The region was characterized by powerful dynasties, flourishing trade networks extending to Rome and Southeast Asia, and a vibrant intellectual tradition preserved in the Sangam literature. Understanding {keyword} requires appreciating this context of cultural sophistication and political dynamism that shaped the Tamil world."},
+            {"title": "Rise to Prominence", "content": f"{keyword}'s rise to prominence was marked by a combination of exceptional abilities and favorable circumstances. The period demanded leaders who could navigate complex challenges while preserving and promoting Tamil cultural values. Through a combination of strategic thinking, cultural sensitivity, and unwavering commitment to principles, {keyword} gradually emerged as a figure of significant influence and respect."},
+            {"title": "Major Achievements", "content": f"The achievements associated with {keyword} span multiple domains - from administrative innovations to cultural patronage, from military strategy to diplomatic finesse. These accomplishments were not merely personal triumphs but contributed to the broader flourishing of Tamil civilization. The impact of these achievements can be traced in the archaeological record, literary sources, and living traditions that continue to this day."},
+            {"title": "Challenges and Adversity", "content": f"No significant historical figure achieves greatness without facing substantial challenges. {keyword} confronted obstacles that tested resolve, wisdom, and character. These challenges came from various quarters - political rivals, natural calamities, and the inherent difficulties of governance. The response to these challenges reveals the true measure of {keyword}'s character and capabilities."},
+            {"title": "Cultural and Social Impact", "content": f"Beyond immediate political or military achievements, {keyword}'s lasting impact lies in the cultural and social sphere. The patronage of arts, support for religious institutions, and promotion of learning created conditions for cultural flourishing that outlasted any individual reign. This cultural legacy, embedded in temples, literature, and traditions, represents perhaps the most enduring contribution."},
+            {"title": "Philosophy and Values", "content": f"The actions and decisions attributed to {keyword} reflect a coherent philosophy rooted in Tamil ethical traditions. Concepts like aram (righteousness), duty to subjects, respect for learning, and religious tolerance informed the approach to governance and life. These values, articulated in classical Tamil literature like the Thirukkural, found practical expression in {keyword}'s conduct."},
+            {"title": "Enduring Legacy", "content": f"The legacy of {keyword} extends far beyond the immediate historical period. In temples, inscriptions, literature, and living memory, this legacy continues to shape Tamil cultural identity. Modern scholars, artists, and leaders continue to draw inspiration from this heritage. The story of {keyword} reminds us that individual actions, guided by wisdom and virtue, can create ripples that extend across centuries, inspiring future generations to strive for excellence."}
+        ]
+
+    characters = (keyword,)
+    pages = tuple(
+        StoryPage(
+            page_number=i + 1,
+            title=page_data["title"],
+            content=page_data["content"],
+            image_prompt=f"{keyword} - {page_data['title']}",
+            image_url=theme_images[i] if i < len(theme_images) else theme_images[i % len(theme_images)],
+            characters=characters,
+            location="Tamil Nadu",
+            action=page_data["title"]
+        )
+        for i, page_data in enumerate(pages_data)
+    )
+
+    return TamilStoryData(
+        title=f"The Story of {keyword}",
+        keywords=(keyword,),
+        outline="Elaborate cultural story",
+        pages=pages,
+        moral="Wisdom, courage, and dedication to one's people create legacies that endure through the ages.",
+        age_group=age_group,
+        festival_connection="Pongal",
+        region="Tamil Nadu",
+        era="Ancient Times",
+        story_type="cultural",
+        historical_context="Set in the rich cultural landscape of Tamil Nadu",
+        cultural_elements=CULTURAL_ELEMENTS,
+        language_style="elaborate",
+        educational_facts=(f"{keyword} is an important figure in Tamil cultural heritage", "Tamil civilization is one of the oldest in the world"),
+        place_info={"name": "Tamil Nadu", "significance": "Cultural Heritage"},
+        total_pages=len(pages)
+    )
+
+
+def fstring_page_text(keyword: str) -> str:
+    return f"From an early age, {keyword} showed signs of greatness. While other children played, {keyword} would sit and listen to the elders tell stories of ancient heroes and wise sages. There was a special light in {keyword}'s eyes - a determination to do something meaningful for the people. The teachers noticed this and gave special attention to nurturing these qualities."
+
+
+def check_equivalent(generator):
+    for keyword, age_group in itertools.product(KEYWORDS + ["{keyword}"], AGE_GROUPS + ["all"]):
+        expected = fstring_default_story(keyword, age_group)
+        assert generator._generate_default_story(keyword, age_group) == expected, (keyword, age_group)
+    assert fstring_page_text("Pongal") == compile_template(DEFAULT_STORY_PAGES["kids"][1][1]).render(keyword="Pongal")
+
+
+def run():
+    generator = TamilStoryGenerator()
+    check_equivalent(generator)
+
+    def cycling(fn):
+        combos = itertools.cycle(list(itertools.product(KEYWORDS, AGE_GROUPS)))
+        return lambda: fn(*next(combos))
+
+    fstring_story = time_per_call(cycling(fstring_default_story))
+    compiled_story = time_per_call(fresh(generator._generate_default_story, KEYWORDS, "kids"))
+    repeat_story = time_per_call(cycling(generator._generate_default_story))
+
+    text = DEFAULT_STORY_PAGES["kids"][1][1]
+    page = compile_template(text)
+    keywords = itertools.cycle(KEYWORDS)
+    fstring_page = time_per_call(lambda: fstring_page_text(next(keywords)))
+    format_page = time_per_call(lambda: text.format(keyword=next(keywords)))
+    compiled_page = time_per_call(lambda: page.render_values((next(keywords),)))
+
+    entities = itertools.cycle(list(itertools.product(TAMIL_HISTORICAL_ENTITIES, AGE_GROUPS)))
+    seeds = itertools.count(1)
+    synthesized_story = time_per_call(lambda: synthesize_story(*next(entities), next(seeds)))
+    synthesized_repeat = time_per_call(lambda: synthesize_story(*next(entities)))
+    synthesized_matrix = time_per_call(lambda: prerender_all(next(seeds)), repeat=3)
+
+    return {
+        'fstring_story_us': fstring_story,
+        'compiled_story_us': compiled_story,
+        'compiled_story_repeat_us': repeat_story,
+        'story_speedup_repeat': round(fstring_story / repeat_story, 2),
+        'fstring_page_us': fstring_page,
+        'str_format_page_us': format_page,
+        'compiled_page_us': compiled_page,
+        'synthesized_story_us': synthesized_story,
+        'synthesized_story_repeat_us': synthesized_repeat,
+        'synthesized_matrix_ms': round(synthesized_matrix / 1000, 3),
+    }
+
+
+if __name__ == "__main__":
+    print(json.dumps(run(), indent=2))
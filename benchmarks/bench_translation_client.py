@@ -0,0 +1,97 @@
+"""
+Outbound translation calls: one-shot urllib requests vs the pooled client
+
+    python benchmarks/bench_translation_client.py
+
+Runs against the local mock translator. Reports throughput for sequential
+and concurrent calls, how many TCP connections each approach opened, and how
+quickly callers get an answer once the backend starts failing (retries,
+then the circuit breaker).
+"""
+
+import os
+import sys
+import json
+import time
+import urllib.parse
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'backend'))
+
+CALLS = 400
+THREADS = 8
+LATENCY = 0.002
+
+
+def _body(i):
+    return urllib.parse.urlencode({'q': f"Once upon a time {i}"}).encode('utf-8')
+
+
+def urllib_call(url, i):
+    req = urllib.request.Request(url, data=_body(i))
+    with urllib.request.urlopen(req, timeout=10) as response:
+        return response.read()
+
+
+def timed(call, url, threads):
+    started = time.perf_counter()
+    if threads == 1:
+        for i in range(CALLS):
+            call(url, i)
+    else:
+        with ThreadPoolExecutor(max_workers=threads) as pool:
+            list(pool.map(lambda i: call(url, i), range(CALLS)))
+    elapsed = time.perf_counter() - started
+    return {'seconds': round(elapsed, 3), 'calls_per_second': round(CALLS / elapsed, 1)}
+
+
+def bench_throughput(url):
+    from translation_client import TranslationClient
+    results = {}
+    for threads in (1, THREADS):
+        results[f'urllib_threads_{threads}'] = timed(urllib_call, url, threads)
+        client = TranslationClient(pool_size=THREADS)
+        results[f'pooled_threads_{threads}'] = timed(lambda u, i: client.post(u, _body(i)), url, threads)
+        results[f'pooled_threads_{threads}']['connections_opened'] = client.stats()['connections_opened']
+        client.close()
+    return results
+
+
+def bench_degraded():
+    from mock_translator import start_mock_translator
+    from translation_client import CircuitOpenError, TranslationClient, TranslationClientError
+    server, url = start_mock_translator(fail_status=503)
+    client = TranslationClient(max_retries=2, backoff_base=0.01, backoff_max=0.05)
+    timings = []
+    for i in range(20):
+        started = time.perf_counter()
+        try:
+            client.post(url, _body(i))
+        except (CircuitOpenError, TranslationClientError):
+            pass
+        timings.append(time.perf_counter() - started)
+    server.shutdown()
+    stats = client.stats()
+    return {
+        'first_call_ms': round(timings[0] * 1000, 2),
+        'after_breaker_opened_ms': round(timings[-1] * 1000, 3),
+        'backend_calls': stats['requests'] + stats['retries'],
+        'short_circuited': stats['short_circuited'],
+        'breaker_state': stats['breaker_state'],
+    }
+
+
+def run():
+    from mock_translator import start_mock_translator
+    server, url = start_mock_translator(latency=LATENCY)
+    try:
+        results = bench_throughput(url)
+    finally:
+        server.shutdown()
+    results['degraded_backend'] = bench_degraded()
+    return results
+
+
+if __name__ == "__main__":
+    print(json.dumps(run(), indent=2))
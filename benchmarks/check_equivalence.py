@@ -0,0 +1,112 @@
+"""
+Equivalence checks for the optimized lookups against their reference versions
+
+    python benchmarks/check_equivalence.py
+
+Exits non-zero on the first mismatch. benchmarks/run.py runs it before
+timing anything, so a faster path that answers differently is caught
+rather than measured. Checks:
+
+- the compiled keyword matcher categorizes exactly like the original
+  nested loop (_detect_tamil_keywords_reference), on every known word and
+  its variants plus random keyword combinations;
+- every catalogue served through its string table holds the same records,
+  in the same order, as parsing its .jsonl file directly;
+- a catalogue edit that keeps the file the same size is picked up, not
+  answered from the stale table.
+"""
+
+import os
+import sys
+import json
+import random
+import shutil
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'backend'))
+
+import catalogue
+from catalogue import CATALOGUE_FILES, DATA_DIR, LazyCatalogue, freeze_record
+from knowledge_base import (
+    TAMIL_HISTORICAL_ENTITIES, TAMIL_KEYWORDS, TAMIL_PLACES, _detect_tamil_keywords_reference,
+    detect_tamil_keywords, keyword_matcher
+)
+from story_generator import STORY_TEMPLATES
+
+RANDOM_CASES = 2000
+
+
+def check_keyword_matcher() -> int:
+    corpus = ["", " ", "a", "ch", "Raja Raja Chola", "rajaraja", "CHOLA temple", "Thai Pusam festival"]
+    for tamil_words in TAMIL_KEYWORDS.values():
+        for word in tamil_words:
+            corpus.extend([word, word.upper(), word[1:-1], word[:2], f"The story of {word}"])
+    for entity in TAMIL_HISTORICAL_ENTITIES.values():
+        corpus.extend([entity.name, entity.region, *entity.keywords, *entity.festivals])
+    for place in TAMIL_PLACES.values():
+        corpus.extend([place.name, place.district, *place.associated_entities])
+
+    rng = random.Random(7)
+    cases = [[keyword] for keyword in corpus]
+    cases += [rng.sample(corpus, rng.randint(2, 4)) for _ in range(RANDOM_CASES)]
+    for keywords in cases:
+        expected = _detect_tamil_keywords_reference(keywords)
+        actual = keyword_matcher().categorize(keywords)
+        assert actual == expected, (keywords, actual, expected)
+        assert detect_tamil_keywords(keywords) == expected, keywords
+    return len(cases)
+
+
+def parse_jsonl(name: str, data_dir: str = DATA_DIR) -> dict:
+    """The reference: a catalogue file parsed line by line"""
+    records = {}
+    with open(os.path.join(data_dir, CATALOGUE_FILES[name]), encoding='utf-8') as f:
+        for line in f:
+            if line.strip():
+                fields = json.loads(line)
+                records[fields.pop('key')] = fields
+    return records
+
+
+def check_catalogues() -> int:
+    checked = 0
+    for lazy in (TAMIL_HISTORICAL_ENTITIES, TAMIL_PLACES, STORY_TEMPLATES):
+        expected = parse_jsonl(lazy.name)
+        assert list(lazy) == list(expected), (lazy.name, 'key order')
+        for key, fields in expected.items():
+            assert lazy[key] == lazy.factory(fields), (lazy.name, key)
+            checked += 1
+    return checked
+
+
+def check_same_size_edit():
+    """Swap two characters in a record, keeping the file size, and expect the edited record back"""
+    directory = tempfile.mkdtemp(prefix='check_equivalence_')
+    try:
+        for filename in CATALOGUE_FILES.values():
+            shutil.copy(os.path.join(DATA_DIR, filename), directory)
+        catalogue.build_tables(directory)
+
+        path = os.path.join(directory, CATALOGUE_FILES['entities'])
+        with open(path, encoding='utf-8') as f:
+            text = f.read()
+        start = text.index('"era": "') + len('"era": "')
+        assert text[start] != text[start + 1]
+        edited = text[:start] + text[start + 1] + text[start] + text[start + 2:]
+        assert len(edited.encode('utf-8')) == len(text.encode('utf-8'))
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(edited)
+
+        records = LazyCatalogue('entities', data_dir=directory)
+        expected = parse_jsonl('entities', directory)
+        for key, fields in expected.items():
+            assert records[key] == freeze_record(fields), key
+    finally:
+        shutil.rmtree(directory)
+
+
+if __name__ == "__main__":
+    print(f"✅ Keyword matcher matches the reference on {check_keyword_matcher()} cases")
+    print(f"✅ String tables match the .jsonl files on {check_catalogues()} records")
+    check_same_size_edit()
+    print("✅ Same-size catalogue edits are picked up")
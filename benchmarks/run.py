@@ -0,0 +1,190 @@
+"""
+Benchmark suite runner with regression comparison
+
+    python benchmarks/run.py                     # run, save results, compare with baseline.json
+    python benchmarks/run.py --only micro e2e    # a subset
+    python benchmarks/run.py --save-baseline     # accept these results as the new baseline (median of 3 runs)
+    python benchmarks/run.py --fail-on-regression
+
+check_equivalence.py runs first: the optimized lookups must answer like
+their reference versions before they are timed. Each benchmark runs in
+its own process so their caches and imports don't affect one another.
+Results are written to benchmarks/results/ (latest.json plus a
+timestamped copy) and compared metric by metric with baseline.json.
+Timings (*_us, *_ms, seconds) and sizes (*_bytes) are better lower,
+throughput (*_per_second) is better higher; other numbers are shown but
+not judged. Timings that moved by less than NOISE_FLOOR_US are treated as
+unchanged whatever their relative change: a few hundred nanoseconds is
+the jitter of a sub-microsecond call, not a regression. With --runs N
+each benchmark runs N times and every metric is the median across runs.
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+import statistics
+import subprocess
+from typing import Dict, Optional
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+RESULTS_DIR = os.path.join(BENCH_DIR, 'results')
+BASELINE_PATH = os.path.join(BENCH_DIR, 'baseline.json')
+
+BENCHMARKS = {
+    'micro': 'bench_micro.py',
+    'startup': 'bench_startup.py',
+    'e2e': 'bench_e2e.py',
+    'memory': 'bench_memory.py',
+    'templates': 'bench_templates.py',
+    'translation_client': 'bench_translation_client.py',
+}
+
+CHECKS = 'check_equivalence.py'
+
+# Relative change beyond which a metric counts as a regression
+DEFAULT_THRESHOLD = 0.25
+
+LOWER_IS_BETTER = ('_us', '_ms', 'seconds', '_bytes')
+HIGHER_IS_BETTER = ('_per_second',)
+
+# Absolute change in a timing below which it counts as unchanged
+NOISE_FLOOR_US = 0.5
+MICROSECONDS = {'_us': 1, '_ms': 1e3, 'seconds': 1e6}
+BASELINE_RUNS = 3
+
+
+def run_benchmark(script: str) -> dict:
+    """Run one benchmark script and parse the JSON it prints last"""
+    output = subprocess.run(
+        [sys.executable, os.path.join(BENCH_DIR, script)],
+        check=True, capture_output=True, text=True, cwd=BENCH_DIR,
+    ).stdout
+    start = 0 if output.startswith('{') else output.rindex('\n{') + 1
+    return json.loads(output[start:])
+
+
+def median_results(runs: list) -> dict:
+    """Results of several runs of one benchmark, each number replaced by its median across the runs"""
+    first = runs[0]
+    if isinstance(first, dict):
+        return {key: median_results([run[key] for run in runs]) for key in first}
+    if isinstance(first, (int, float)) and not isinstance(first, bool):
+        return statistics.median(runs)
+    return first
+
+
+def flatten(results: dict, prefix: str = '') -> Dict[str, float]:
+    """Numeric leaves of nested results as dotted metric names"""
+    metrics = {}
+    for key, value in results.items():
+        name = f"{prefix}{key}"
+        if isinstance(value, dict):
+            metrics.update(flatten(value, name + '.'))
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            metrics[name] = value
+    return metrics
+
+
+def direction(metric: str) -> Optional[int]:
+    """+1 if higher is better, -1 if lower is better, None if not judged"""
+    if metric.endswith(HIGHER_IS_BETTER):
+        return 1
+    if metric.endswith(LOWER_IS_BETTER):
+        return -1
+    return None
+
+
+def within_noise(metric: str, old: float, value: float, noise_floor_us: float) -> bool:
+    """Whether a timing moved by less than the noise floor"""
+    for suffix, scale in MICROSECONDS.items():
+        if metric.endswith(suffix):
+            return abs(value - old) * scale < noise_floor_us
+    return False
+
+
+def compare(current: dict, baseline: dict, threshold: float = DEFAULT_THRESHOLD,
+            noise_floor_us: float = NOISE_FLOOR_US) -> Dict[str, list]:
+    """Regressions, improvements and unchanged metrics relative to the baseline"""
+    now, before = flatten(current), flatten(baseline)
+    report = {'regressions': [], 'improvements': [], 'unchanged': [], 'new': []}
+    for metric, value in sorted(now.items()):
+        if metric not in before:
+            report['new'].append((metric, None, value, None))
+            continue
+        old = before[metric]
+        change = (value - old) / old if old else 0.0
+        sign = direction(metric)
+        entry = (metric, old, value, change)
+        if sign is None or abs(change) <= threshold or within_noise(metric, old, value, noise_floor_us):
+            report['unchanged'].append(entry)
+        elif change * sign > 0:
+            report['improvements'].append(entry)
+        else:
+            report['regressions'].append(entry)
+    return report
+
+
+def print_report(report: Dict[str, list]):
+    symbols = {'regressions': '🔴', 'improvements': '🟢', 'new': '🆕'}
+    for section, symbol in symbols.items():
+        for metric, old, value, change in report[section]:
+            if change is None:
+                print(f"{symbol} {metric}: {value}")
+            else:
+                print(f"{symbol} {metric}: {old} -> {value} ({change:+.0%})")
+    print(f"📊 {len(report['regressions'])} regressions, {len(report['improvements'])} improvements, "
+          f"{len(report['unchanged'])} within threshold")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the benchmark suite")
+    parser.add_argument('--only', nargs='+', choices=sorted(BENCHMARKS), default=sorted(BENCHMARKS))
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD)
+    parser.add_argument('--noise-floor-us', type=float, default=NOISE_FLOOR_US)
+    parser.add_argument('--runs', type=int, default=None,
+                        help=f"runs per benchmark, medians kept (default 1, {BASELINE_RUNS} with --save-baseline)")
+    parser.add_argument('--save-baseline', action='store_true')
+    parser.add_argument('--fail-on-regression', action='store_true')
+    args = parser.parse_args(argv)
+    runs = max(1, args.runs or (BASELINE_RUNS if args.save_baseline else 1))
+
+    results = {
+        'meta': {'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'), 'python': platform.python_version(),
+                 'platform': platform.platform(), 'cpus': os.cpu_count(), 'runs': runs},
+    }
+    print("🔎 Equivalence checks...")
+    subprocess.run([sys.executable, os.path.join(BENCH_DIR, CHECKS)], check=True, cwd=BENCH_DIR)
+    for name in args.only:
+        print(f"⏱️ {name}...")
+        results[name] = median_results([run_benchmark(BENCHMARKS[name]) for _ in range(runs)])
+
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+    for path in (os.path.join(RESULTS_DIR, 'latest.json'),
+                 os.path.join(RESULTS_DIR, time.strftime('%Y%m%d-%H%M%S') + '.json')):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+
+    if args.save_baseline:
+        with open(BASELINE_PATH, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+        print(f"✅ Baseline saved to {BASELINE_PATH}")
+        return 0
+
+    try:
+        with open(BASELINE_PATH, encoding='utf-8') as f:
+            baseline = json.load(f)
+    except FileNotFoundError:
+        print("⚠️ No baseline.json yet, run with --save-baseline")
+        return 0
+
+    baseline = {name: baseline[name] for name in args.only if name in baseline}
+    report = compare({name: results[name] for name in args.only}, baseline, args.threshold, args.noise_floor_us)
+    print_report(report)
+    return 1 if args.fail_on_regression and report['regressions'] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -4,6 +4,12 @@ class StoryApp {
     constructor() {
         this.selectedKeyword = null;
         this.currentStory = null;
+        this.eagerPages = 2;          // pages translated with the story; the rest load on demand
+        this.pageRequests = new Map();
+        this.pageObserver = new IntersectionObserver(
+            entries => entries.forEach(e => e.isIntersecting && this.onPageVisible(+e.target.dataset.page)),
+            { rootMargin: '200px' }
+        );
         this.languages = {
             'en': 'English',
             'ta': 'தமிழ்',
@@ -74,23 +80,27 @@ class StoryApp {
         document.getElementById('loading').classList.add('active');
         document.getElementById('result').innerHTML = '';
 
-        try {
-            const res = await fetch('/api/generate-story', {
-                method: 'POST',
-                headers: { 'Content-Type': 'application/json' },
-                body: JSON.stringify({
-                    keywords: [this.selectedKeyword],
-                    age_group: this.getAge(),
-                    language: this.getLang()
-                })
-            });
+        const request = {
+            method: 'POST',
+            headers: { 'Content-Type': 'application/json' },
+            body: JSON.stringify({
+                keywords: [this.selectedKeyword],
+                age_group: this.getAge(),
+                language: this.getLang(),
+                eager_pages: this.eagerPages
+            })
+        };
 
-            const data = await res.json();
-            if (data.success) {
+        try {
+            const res = await fetch('/api/generate-story/stream', request);
+            if (res.ok && res.body && res.body.getReader) {
+                await this.readStream(res.body.getReader());
+            } else {
+                // No streaming support: fall back to the one-shot endpoint
+                const data = await (await fetch('/api/generate-story', request)).json();
+                if (!data.success) throw new Error(data.error);
                 this.currentStory = data.story;
                 this.showStory(data.story);
-            } else {
-                throw new Error(data.error);
             }
         } catch (err) {
             document.getElementById('result').innerHTML = `
@@ -103,13 +113,113 @@ class StoryApp {
         }
     }
 
+    async readStream(reader) {
+        // Newline-delimited JSON: metadata, then one event per page, then done
+        const decoder = new TextDecoder();
+        let buffer = '';
+        for (;;) {
+            const { value, done } = await reader.read();
+            buffer += decoder.decode(value || new Uint8Array(), { stream: !done });
+            const lines = buffer.split('\n');
+            buffer = lines.pop();
+            lines.filter(line => line.trim()).forEach(line => this.handleEvent(JSON.parse(line)));
+            if (done) break;
+        }
+    }
+
+    handleEvent(event) {
+        if (event.type === 'meta') {
+            this.currentStory = { ...event.story, pages: [] };
+            this.showStory(this.currentStory);
+            document.getElementById('loading').classList.remove('active');
+        } else if (event.type === 'page') {
+            this.currentStory.pages.push(event.page);
+            document.querySelector('#result .pages-container')
+                .insertAdjacentHTML('beforeend', this.pageHTML(event.page));
+            this.observePages();
+        } else if (event.type === 'error') {
+            throw new Error(event.error);
+        }
+    }
+
     async translateTo(lang) {
         // Update radio button
         const radio = document.querySelector(`input[name="lang"][value="${lang}"]`);
         if (radio) radio.checked = true;
-        
-        // Regenerate with new language
-        await this.generate();
+
+        const story = this.currentStory;
+        if (!story?.story_id) return this.generate();
+        if (story.language === lang) return;
+
+        // Swap the text in place; the browser caches each language's translation
+        try {
+            const params = new URLSearchParams({
+                lang,
+                keywords: story.keywords.join(','),
+                age_group: story.age_group,
+                eager_pages: this.eagerPages
+            });
+            const res = await fetch(`/api/stories/${story.story_id}/translation?${params}`);
+            const data = await res.json();
+            if (!data.success) throw new Error(data.error);
+            this.applyTranslation(data.translation);
+        } catch (err) {
+            await this.generate();
+        }
+    }
+
+    applyTranslation(t) {
+        const pages = new Map(t.pages.map(p => [p.page_number, p]));
+        this.currentStory = {
+            ...this.currentStory,
+            title: t.title,
+            moral: t.moral,
+            educational_facts: t.educational_facts,
+            language: t.language,
+            pages: this.currentStory.pages.map(p => pages.has(p.page_number)
+                ? { ...p, ...pages.get(p.page_number), pending: false }
+                : { ...p, title: null, content: null, pending: true })
+        };
+        this.showStory(this.currentStory);
+    }
+
+    onPageVisible(pageNumber) {
+        // Translate the page being read, and prefetch the next one
+        this.loadPage(pageNumber);
+        this.loadPage(pageNumber + 1);
+    }
+
+    async loadPage(pageNumber) {
+        const story = this.currentStory;
+        const page = story?.pages.find(p => p.page_number === pageNumber);
+        const key = `${story?.story_id}:${story?.language}:${pageNumber}`;
+        if (!page?.pending || this.pageRequests.has(key)) return;
+
+        const params = new URLSearchParams({
+            lang: story.language,
+            keywords: story.keywords.join(','),
+            age_group: story.age_group
+        });
+        const request = fetch(`/api/stories/${story.story_id}/pages/${pageNumber}?${params}`)
+            .then(res => res.json());
+        this.pageRequests.set(key, request);
+        try {
+            const data = await request;
+            // Ignore answers for a story or language the reader has since left
+            if (!data.success || this.currentStory !== story) return;
+            Object.assign(page, data.page, { pending: false });
+            const card = document.querySelector(`#result .page-card[data-page="${pageNumber}"]`);
+            if (card) card.outerHTML = this.pageHTML(page);
+        } catch (err) {
+            console.warn(`Page ${pageNumber} could not be translated`, err);
+        } finally {
+            this.pageRequests.delete(key);
+        }
+    }
+
+    observePages() {
+        this.pageObserver.disconnect();
+        document.querySelectorAll('#result .page-card').forEach(card => this.pageObserver.observe(card));
     }
 
     showStory(story) {
@@ -140,22 +250,7 @@ class StoryApp {
             </div>
             <div class="pages-container">`;
 
-        story.pages.forEach(p => {
-            html += `
-                <div class="page-card">
-                    <div class="page-head">
-                        <span>📖 Page ${p.page_number}</span>
-                        <span>${p.title}</span>
-                    </div>
-                    <div class="page-body">
-                        <p class="page-text">${p.content}</p>
-                        <div class="page-info">
-                            <span><strong>👥</strong> ${p.characters.join(', ')}</span>
-                            <span><strong>📍</strong> ${p.location}</span>
-                        </div>
-                    </div>
-                </div>`;
-        });
+        story.pages.forEach(p => { html += this.pageHTML(p); });
 
         html += '</div>';
 
@@ -170,6 +265,24 @@ class StoryApp {
 
         document.getElementById('result').innerHTML = html;
         document.getElementById('result').scrollIntoView({ behavior: 'smooth' });
+        this.observePages();
+    }
+
+    pageHTML(p) {
+        return `
+                <div class="page-card ${p.pending ? 'pending' : ''}" data-page="${p.page_number}">
+                    <div class="page-head">
+                        <span>📖 Page ${p.page_number}</span>
+                        <span>${p.pending ? '' : p.title}</span>
+                    </div>
+                    <div class="page-body">
+                        <p class="page-text">${p.pending ? '⏳ Translating…' : p.content}</p>
+                        <div class="page-info">
+                            <span><strong>👥</strong> ${p.characters.join(', ')}</span>
+                            <span><strong>📍</strong> ${p.location}</span>
+                        </div>
+                    </div>
+                </div>`;
     }
 }
 